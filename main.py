@@ -8,7 +8,7 @@ from src.ui import PokerUI
 def main():
     """Main function that loads the ui and game"""
 
-    db = DatabaseManager("poker_game.db")
+    db = DatabaseManager("poker_game.db", profile="durable")
     ui = PokerUI(db)
     ui.run()
 
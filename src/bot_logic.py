@@ -2,27 +2,37 @@
 Implementation of the logic and behaviour of the bot players
 """
 import random
-from typing import Tuple
+from typing import Optional, Tuple
 from .game_logic import HandEvaluator
+from .preflop import preflop_equity, MIN_PLAYERS, MAX_PLAYERS
 
-def get_bot_move(game_state, bot_player) -> Tuple[str, int]:
+# preflop thresholds, as multiples of a fair share of the pot (1 / players)
+STRONG_PREFLOP = 1.25
+PLAYABLE_PREFLOP = 1.0
+
+def get_bot_move(game_state, bot_player, rng: Optional[random.Random] = None) -> Tuple[str, int]:
     """
     Decides the bot's move based on the game state.
+    'rng' draws the bluffs and mixed raises (default: the random module).
     Returns: (Action_String, Amount)
     """
+    if rng is None:
+        rng = random
     current_bet = game_state.current_bet
     call_cost = current_bet - bot_player.current_bet
     all_cards = bot_player.hand + game_state.community_cards
 
     if len(all_cards) >= 5:
-        score, _ = HandEvaluator.evaluate(all_cards)
+        score = HandEvaluator.category(game_state.hand_score(bot_player))
     else:
         score = 0
-        ranks = [c.value for c in bot_player.hand]
-        if len(set(ranks)) < 2:
-            score = 1  # Pocket Pair
-        elif max(ranks) >= 12:
-            score = 0.5  # High Card (Q, K, A)
+        players = sum(1 for p in game_state.players if not p.is_folded)
+        players = max(MIN_PLAYERS, min(MAX_PLAYERS, players))
+        share = preflop_equity(bot_player.hand, players) * players
+        if share >= STRONG_PREFLOP:
+            score = 1
+        elif share >= PLAYABLE_PREFLOP:
+            score = 0.5
 
     action, amount = "fold", 0
 
@@ -30,7 +40,7 @@ def get_bot_move(game_state, bot_player) -> Tuple[str, int]:
     if score >= 1:
         if call_cost > 0:
             action, amount = "call", 0
-        elif random.random() > 0.5:
+        elif rng.random() > 0.5:
             action, amount = "raise", current_bet + game_state.big_blind
         else:
             action, amount = "check", 0
@@ -44,7 +54,7 @@ def get_bot_move(game_state, bot_player) -> Tuple[str, int]:
     else:
         if call_cost == 0:
             action, amount = "check", 0
-        elif random.random() < 0.1:
+        elif rng.random() < 0.1:
             action, amount = "raise", current_bet + game_state.big_blind
 
     return action, amount
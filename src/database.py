@@ -2,19 +2,100 @@
 Implementation of the SQLite database of the human player accounts
 """
 
+import queue
 import sqlite3
-from typing import List, Tuple, Any
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Protocol, Tuple, Any, Union
 
-class DatabaseManager:
-    def __init__(self, db_name: str = "poker_stats.db") -> None:
-        self.db_name = db_name
-        self._create_tables()
+from .leaderboard import Leaderboard, SORT_COLUMNS
+
+# per-connection cache of compiled statements
+STATEMENT_CACHE_SIZE = 256
+
+@dataclass(frozen=True)
+class SqliteProfile:
+    """
+    Connection settings applied as PRAGMAs to every pooled connection.
+    None leaves the SQLite default. cache_size follows SQLite: negative
+    values are KiB, positive values are pages.
+    """
+    journal_mode: Optional[str] = None  # DELETE, WAL, MEMORY, ...
+    synchronous: Optional[str] = None  # OFF, NORMAL, FULL, EXTRA
+    cache_size: Optional[int] = None
+    mmap_size: Optional[int] = None  # bytes
+    temp_store: Optional[str] = None  # DEFAULT, FILE, MEMORY
+    busy_timeout: float = 5.0  # seconds to wait on a locked database
+
+    def pragmas(self) -> List[str]:
+        settings = [
+            ("journal_mode", self.journal_mode),
+            ("synchronous", self.synchronous),
+            ("cache_size", self.cache_size),
+            ("mmap_size", self.mmap_size),
+            ("temp_store", self.temp_store),
+        ]
+        return [f"PRAGMA {name} = {value}" for name, value in settings if value is not None]
+
+PROFILES = {
+    # plain SQLite: rollback journal, full sync
+    "default": SqliteProfile(),
+    # WAL lets readers (leaderboard) run alongside a settling writer;
+    # FULL sync still makes every commit survive a power loss
+    "durable": SqliteProfile(journal_mode="WAL", synchronous="FULL", cache_size=-8000),
+    # NORMAL sync in WAL mode cannot corrupt the file, but the last
+    # commits may be lost on a power loss (not on an application crash)
+    "fast": SqliteProfile(
+        journal_mode="WAL", synchronous="NORMAL", cache_size=-64000,
+        mmap_size=256 * 1024 * 1024, temp_store="MEMORY",
+    ),
+}
+
+_SETTLE_STATS_QUERY = """
+UPDATE players SET
+    hands_played = hands_played + 1,
+    hands_won = hands_won + ?,
+    folds = folds + ?,
+    checks = checks + ?,
+    bets = bets + ?,
+    raises = raises + ?,
+    biggest_pot_won = MAX(biggest_pot_won, ?),
+    best_hand_score = MAX(best_hand_score, ?)
+WHERE id = ?
+"""
 
-    def _get_connection(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_name)
+@dataclass
+class SettlementEntry:
+    """
+    One player's part in a finished hand.
+    'actions' holds the action counts to add to the player's stats;
+    None only applies the balance change.
+    """
+    player_id: int
+    balance_delta: int
+    actions: Optional[dict] = None
+    won: bool = False
+    pot_won: int = 0
+    hand_score: int = -1
 
-    def _create_tables(self) -> None:
-        query_players = """
+@dataclass(frozen=True)
+class Migration:
+    """
+    One schema step. Statements must be idempotent (IF NOT EXISTS, ...)
+    so databases created before versioning upgrade cleanly.
+    """
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+def _index(table: str, column: str) -> str:
+    # SQLite builds an index in one write transaction; with a WAL profile
+    # readers keep working while it runs
+    return f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column} DESC)"
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(1, "players and game_history tables", (
+        """
         CREATE TABLE IF NOT EXISTS players (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             username TEXT UNIQUE NOT NULL,
@@ -28,8 +109,8 @@ class DatabaseManager:
             bets INTEGER DEFAULT 0,
             raises INTEGER DEFAULT 0
         );
+        """,
         """
-        query_history = """
         CREATE TABLE IF NOT EXISTS game_history (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             winner_id INTEGER,
@@ -37,10 +118,236 @@ class DatabaseManager:
             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY(winner_id) REFERENCES players(id)
         );
+        """,
+    )),
+    Migration(2, "leaderboard indexes", tuple(_index("players", column) for column in SORT_COLUMNS)),
+    Migration(3, "append-only hand history", (
+        """
+        CREATE TABLE IF NOT EXISTS hands (
+            id INTEGER PRIMARY KEY,
+            played_at REAL NOT NULL,
+            pot INTEGER NOT NULL,
+            seats BLOB NOT NULL,
+            board BLOB NOT NULL,
+            actions BLOB NOT NULL,
+            winners BLOB NOT NULL
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS hand_players (
+            player_id INTEGER NOT NULL,
+            hand_id INTEGER NOT NULL,
+            PRIMARY KEY (player_id, hand_id)
+        ) WITHOUT ROWID;
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_hands_played_at ON hands (played_at)",
+        "CREATE TRIGGER IF NOT EXISTS hands_no_update BEFORE UPDATE ON hands "
+        "BEGIN SELECT RAISE(ABORT, 'hand history is append-only'); END",
+        "CREATE TRIGGER IF NOT EXISTS hands_no_delete BEFORE DELETE ON hands "
+        "BEGIN SELECT RAISE(ABORT, 'hand history is append-only'); END",
+    )),
+    Migration(4, "player stat totals", (
+        """
+        CREATE TABLE IF NOT EXISTS player_stats (
+            player_id INTEGER PRIMARY KEY,
+            hands INTEGER NOT NULL DEFAULT 0,
+            vpip_hands INTEGER NOT NULL DEFAULT 0,
+            pfr_hands INTEGER NOT NULL DEFAULT 0,
+            postflop_aggressive INTEGER NOT NULL DEFAULT 0,
+            postflop_calls INTEGER NOT NULL DEFAULT 0,
+            showdowns INTEGER NOT NULL DEFAULT 0,
+            showdown_wins INTEGER NOT NULL DEFAULT 0,
+            net_big_blinds REAL NOT NULL DEFAULT 0
+        );
+        """,
+    )),
+)
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+class PlayerStorage(Protocol):
+    """
+    What the game engine needs from storage. DatabaseManager (file or
+    in-memory SQLite) and WriteBehindDatabase both provide it.
+    """
+    def get_player(self, player_id: int) -> Optional[Tuple[str, int]]: ...
+    def set_balance(self, player_id: int, balance: int) -> None: ...
+    def settle_hand(self, entries: List[SettlementEntry]) -> None: ...
+
+class _PooledConnection:
+    """
+    Context manager handed out by DatabaseManager._get_connection.
+    Behaves like 'with sqlite3.connect(...) as conn': commits on success,
+    rolls back on error, but borrows a long-lived connection from the pool.
+    """
+    def __init__(self, manager: 'DatabaseManager') -> None:
+        self.manager = manager
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self.manager._checkout()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.manager._checkin(failed=exc_type is not None)
+
+class DatabaseManager:
+    """
+    Player accounts and stats in SQLite.
+
+    Connections are opened lazily and kept in a small thread-safe pool, so
+    several tables (or threads) can share one manager without reconnecting
+    per query. Nested _get_connection() blocks in one thread share the same
+    connection and only the outermost one commits. ':memory:' databases use
+    a single shared connection so every caller sees the same data.
+
+    data_version goes up after every committed write, including writes
+    other processes commit to the same file, so caches (like the
+    leaderboard) know when to refresh. 'profile' is a SqliteProfile or the name of one in PROFILES.
+    """
+    def __init__(self, db_name: str = "poker_stats.db", pool_size: int = 4,
+                 profile: Union[str, SqliteProfile] = "default") -> None:
+        if isinstance(profile, str):
+            if profile not in PROFILES:
+                raise ValueError(f"Unknown database profile: {profile}")
+            profile = PROFILES[profile]
+        self.db_name = db_name
+        self.profile = profile
+        self.pool_size = 1 if db_name == ":memory:" else max(1, pool_size)
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+        self._version = 0
+        # PRAGMA data_version last seen on each pooled connection
+        self._seen_versions: Dict[sqlite3.Connection, int] = {}
+        self._migrate()
+        self.leaderboard = Leaderboard(self)
+
+    @classmethod
+    def in_memory(cls, profile: Union[str, SqliteProfile] = "default") -> 'DatabaseManager':
+        """
+        A private ':memory:' database on one shared connection: no disk I/O
+        at all. Use snapshot() to keep the result.
+        """
+        return cls(":memory:", profile=profile)
+
+    def snapshot(self, path: str) -> None:
+        """Copies the whole database to the file 'path' (replacing its contents)."""
+        target = sqlite3.connect(path)
+        try:
+            with self._get_connection() as conn:
+                conn.backup(target)
+        finally:
+            target.close()
+
+    def __enter__(self) -> 'DatabaseManager':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes every pooled connection. The manager cannot be used afterwards."""
+        with self._lock:
+            self._closed = True
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._seen_versions.clear()
+
+    @property
+    def data_version(self) -> int:
+        """
+        Goes up after every write this manager commits. For a file, reading
+        it also asks SQLite whether another connection (another process or
+        manager) committed since the last read; the pool's own connections
+        count too, which only costs a spurious refresh.
+        """
+        if self.db_name != ":memory:":
+            with self._get_connection() as conn:
+                seen = conn.execute("PRAGMA data_version").fetchone()[0]
+                with self._lock:
+                    # a connection seen for the first time has no baseline: assume a change
+                    if self._seen_versions.get(conn) != seen:
+                        self._seen_versions[conn] = seen
+                        self._version += 1
+        return self._version
+
+    def _get_connection(self) -> _PooledConnection:
+        return _PooledConnection(self)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_name, timeout=self.profile.busy_timeout,
+            check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        for pragma in self.profile.pragmas():
+            conn.execute(pragma)
+        return conn
+
+    def _checkout(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "depth", 0):
+            local.depth += 1
+            return local.conn
+
+        conn: Optional[sqlite3.Connection] = None
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                if len(self._connections) < self.pool_size:
+                    conn = self._connect()
+                    self._connections.append(conn)
+        if conn is None:
+            conn = self._idle.get()  # pool exhausted: wait for a connection to come back
+
+        local.conn, local.depth, local.changes = conn, 1, conn.total_changes
+        return conn
+
+    def _checkin(self, failed: bool) -> None:
+        local = self._local
+        local.depth -= 1
+        if local.depth:
+            return
+
+        conn, local.conn = local.conn, None
+        try:
+            if failed:
+                conn.rollback()
+            else:
+                conn.commit()
+                if conn.total_changes != local.changes:
+                    with self._lock:
+                        self._version += 1
+        finally:
+            self._idle.put(conn)
+
+    def _migrate(self) -> None:
+        """
+        Brings the schema up to SCHEMA_VERSION. Each pending migration runs
+        in its own transaction together with the user_version bump, so an
+        interrupted upgrade resumes at the first step that did not commit.
         """
         with self._get_connection() as conn:
-            conn.execute(query_players)
-            conn.execute(query_history)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return  # fast path: no DDL at all
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Database schema version {version} is newer than this program ({SCHEMA_VERSION})."
+            )
+
+        for migration in MIGRATIONS[version:]:
+            with self._get_connection() as conn:
+                # IMMEDIATE takes the write lock, so concurrent starters migrate one at a time
+                conn.execute("BEGIN IMMEDIATE")
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= migration.version:
+                    continue
+                for statement in migration.statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {migration.version}")
 
     def get_or_create_player(self, username: str) -> Tuple[int, int]:
         with self._get_connection() as conn:
@@ -53,44 +360,54 @@ class DatabaseManager:
             conn.commit()
             return cursor.lastrowid, 1000
 
+    def get_player(self, player_id: int) -> Optional[Tuple[str, int]]:
+        """(username, balance) of a player, None if there is no such id."""
+        with self._get_connection() as conn:
+            return conn.execute("SELECT username, balance FROM players WHERE id = ?", (player_id,)).fetchone()
+
     def update_balance(self, player_id: int, amount: int) -> None:
         with self._get_connection() as conn:
             conn.execute("UPDATE players SET balance = balance + ? WHERE id = ?", (amount, player_id))
 
+    def set_balance(self, player_id: int, balance: int) -> None:
+        with self._get_connection() as conn:
+            conn.execute("UPDATE players SET balance = ? WHERE id = ?", (balance, player_id))
+
     def record_hand_stats(self, player_id: int, won: bool, pot_size: int, hand_score: int, actions: dict) -> None:
+        self.settle_hand([SettlementEntry(
+            player_id, 0, actions=actions, won=won, pot_won=pot_size, hand_score=hand_score
+        )])
+
+    def settle_hand(self, entries: List['SettlementEntry']) -> None:
+        """
+        Applies a finished hand's balance changes, stats and history rows
+        in a single transaction: either all of it is written or none.
+        """
+        balances = [(e.balance_delta, e.player_id) for e in entries if e.balance_delta]
+        stats = [e for e in entries if e.actions is not None]
+        stat_rows = [(
+            1 if e.won else 0,
+            e.actions.get('fold', 0),
+            e.actions.get('check', 0),
+            e.actions.get('bet', 0),
+            e.actions.get('raise', 0),
+            e.pot_won if e.won else 0,
+            e.hand_score,
+            e.player_id,
+        ) for e in stats]
+        history = [(e.player_id, e.pot_won) for e in stats if e.won]
+
         with self._get_connection() as conn:
-            query = """
-            UPDATE players SET 
-                hands_played = hands_played + 1,
-                hands_won = hands_won + ?,
-                folds = folds + ?,
-                checks = checks + ?,
-                bets = bets + ?,
-                raises = raises + ?
-            WHERE id = ?
-            """
-            conn.execute(query, (
-                1 if won else 0,
-                actions.get('fold', 0),
-                actions.get('check', 0),
-                actions.get('bet', 0),
-                actions.get('raise', 0),
-                player_id
-            ))
-            if won:
-                conn.execute("UPDATE players SET biggest_pot_won = MAX(biggest_pot_won, ?) WHERE id = ?", (pot_size, player_id))
-                conn.execute("INSERT INTO game_history (winner_id, pot_size) VALUES (?, ?)", (player_id, pot_size))
-            conn.execute("UPDATE players SET best_hand_score = MAX(best_hand_score, ?) WHERE id = ?", (hand_score, player_id))
+            if balances:
+                conn.executemany("UPDATE players SET balance = balance + ? WHERE id = ?", balances)
+            if stat_rows:
+                conn.executemany(_SETTLE_STATS_QUERY, stat_rows)
+            if history:
+                conn.executemany("INSERT INTO game_history (winner_id, pot_size) VALUES (?, ?)", history)
 
     def get_leaderboard(self, limit: int = 10) -> List[Tuple[Any, ...]]:
         """Returns top players ordered by balance. Default limit 10."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT username, balance, hands_won, id FROM players ORDER BY balance DESC LIMIT ?", 
-                (limit,)
-            )
-            return cursor.fetchall()
+        return self.leaderboard.page(0, limit)
 
     def delete_player(self, player_id: int) -> None:
         """Deletes a player by ID."""
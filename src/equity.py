@@ -0,0 +1,269 @@
+"""
+Equity calculation: how often a hand wins, ties or loses against
+a number of unknown opponent hands on a given board.
+"""
+
+import math
+import random
+import time
+from dataclasses import dataclass
+from itertools import combinations
+from typing import List, Optional, Sequence
+
+from .game_logic import Card, Deck, HandEvaluator
+
+BATCH_SIZE = 250
+
+@dataclass(frozen=True)
+class EquityResult:
+    """
+    Raw outcome counts of an equity run.
+    'share' is the summed pot share of the hero (1 for a win, 1/k for a k-way tie)
+    and 'share_sq' the sum of its squares, so results can be merged and
+    the standard error derived.
+    """
+    wins: int = 0
+    ties: int = 0
+    losses: int = 0
+    share: float = 0.0
+    share_sq: float = 0.0
+    exact: bool = False
+
+    @property
+    def samples(self) -> int:
+        return self.wins + self.ties + self.losses
+
+    @property
+    def win(self) -> float:
+        return self.wins / self.samples if self.samples else 0.0
+
+    @property
+    def tie(self) -> float:
+        return self.ties / self.samples if self.samples else 0.0
+
+    @property
+    def loss(self) -> float:
+        return self.losses / self.samples if self.samples else 0.0
+
+    @property
+    def equity(self) -> float:
+        """Expected share of the pot."""
+        return self.share / self.samples if self.samples else 0.0
+
+    @property
+    def std_error(self) -> float:
+        """Standard error of the equity estimate (0 for exact results)."""
+        n = self.samples
+        if self.exact or n < 2:
+            return 0.0
+        variance = max(self.share_sq / n - self.equity ** 2, 0.0)
+        return math.sqrt(variance / n)
+
+    def merge(self, other: 'EquityResult') -> 'EquityResult':
+        """Combines the counts of two runs over the same spot."""
+        return EquityResult(
+            wins=self.wins + other.wins,
+            ties=self.ties + other.ties,
+            losses=self.losses + other.losses,
+            share=self.share + other.share,
+            share_sq=self.share_sq + other.share_sq,
+            exact=self.exact and other.exact,
+        )
+
+
+def _known_codes(hole_cards: Sequence[Card], board: Sequence[Card],
+                 dead_cards: Sequence[Card]) -> List[int]:
+    """Validates the known cards and returns their codes."""
+    if len(hole_cards) != 2:
+        raise ValueError("Need exactly 2 hole cards.")
+    if len(board) > 5:
+        raise ValueError("Board can have at most 5 cards.")
+
+    codes = [c.code for c in list(hole_cards) + list(board) + list(dead_cards)]
+    if len(set(codes)) != len(codes):
+        raise ValueError("Duplicate cards.")
+    return codes
+
+
+def remaining_codes(known: Sequence[int]) -> List[int]:
+    """Codes of the cards of a fresh deck that are not in 'known'."""
+    known_set = set(known)
+    return [c.code for c in Deck().cards if c.code not in known_set]
+
+
+def monte_carlo_equity(hole_cards: Sequence[Card], board: Sequence[Card] = (),
+                       opponents: int = 1, samples: int = 10000,
+                       time_limit: Optional[float] = None,
+                       target_error: Optional[float] = None,
+                       dead_cards: Sequence[Card] = (),
+                       rng: Optional[random.Random] = None) -> EquityResult:
+    """
+    Estimates equity by dealing random opponent hands and runouts.
+
+    Runs at most 'samples' deals, stops after 'time_limit' seconds if given,
+    and stops early once the standard error drops to 'target_error'.
+    Budgets are checked every BATCH_SIZE deals.
+    """
+    if opponents < 1:
+        raise ValueError("Need at least one opponent.")
+    known = _known_codes(hole_cards, board, dead_cards)
+    stub = remaining_codes(known)
+    missing = 5 - len(board)
+    needed = missing + 2 * opponents
+    if needed > len(stub):
+        raise ValueError("Not enough cards left for that many opponents.")
+
+    rng = rng or random.Random()
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    hero = [c.code for c in hole_cards]
+    hero_key = HandEvaluator.card_key(hero)
+    board_codes = [c.code for c in board]
+    board_key = HandEvaluator.card_key(board_codes)
+    keys = [HandEvaluator.card_key([c]) for c in range(52)]
+    score_key = HandEvaluator.score_key
+    sample = rng.sample
+
+    wins = ties = losses = 0
+    share = share_sq = 0.0
+    done = 0
+    while done < samples:
+        for _ in range(min(BATCH_SIZE, samples - done)):
+            dealt = sample(stub, needed)
+            full_board = board_codes + dealt[:missing]
+            full_key = board_key
+            for c in dealt[:missing]:
+                full_key += keys[c]
+            hero_score = score_key(full_key + hero_key, full_board + hero)
+
+            best = 0
+            tied = 0
+            for i in range(missing, needed, 2):
+                a, b = dealt[i], dealt[i + 1]
+                s = score_key(full_key + keys[a] + keys[b], full_board + [a, b])
+                if s > best:
+                    best, tied = s, 1
+                elif s == best:
+                    tied += 1
+
+            if hero_score > best:
+                wins += 1
+                share += 1.0
+                share_sq += 1.0
+            elif hero_score == best:
+                ties += 1
+                part = 1.0 / (tied + 1)
+                share += part
+                share_sq += part * part
+            else:
+                losses += 1
+        done = wins + ties + losses
+
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if target_error is not None:
+            result = EquityResult(wins, ties, losses, share, share_sq)
+            if result.std_error <= target_error:
+                break
+
+    return EquityResult(wins, ties, losses, share, share_sq)
+
+
+def exact_equity(hole_cards: Sequence[Card], board: Sequence[Card] = (),
+                 opponent_hands: Sequence[Sequence[Card]] = (), opponents: int = 0,
+                 dead_cards: Sequence[Card] = ()) -> EquityResult:
+    """
+    Computes equity exactly by enumerating every remaining runout.
+
+    'opponent_hands' are known opponent holdings; 'opponents' adds that many
+    unknown hands, enumerated over every disjoint combination of the remaining
+    cards. Each (hand, board) pair is scored once per runout. Cost grows fast
+    with missing board cards and unknown opponents, so this is meant for
+    turn/river spots or known hands; use monte_carlo_equity otherwise.
+    """
+    if not opponent_hands and opponents < 1:
+        raise ValueError("Need at least one opponent.")
+    for hand in opponent_hands:
+        if len(hand) != 2:
+            raise ValueError("Opponent hands need exactly 2 cards.")
+
+    known_hands = [[c.code for c in hand] for hand in opponent_hands]
+    known = _known_codes(hole_cards, board, list(dead_cards) + [c for h in opponent_hands for c in h])
+    stub = remaining_codes(known)
+    missing = 5 - len(board)
+    if missing + 2 * opponents > len(stub):
+        raise ValueError("Not enough cards left for that many opponents.")
+
+    hero = [c.code for c in hole_cards]
+    hero_key = HandEvaluator.card_key(hero)
+    known_keys = [HandEvaluator.card_key(h) for h in known_hands]
+    board_codes = [c.code for c in board]
+    score_key = HandEvaluator.score_key
+    card_key = HandEvaluator.card_key
+
+    # every possible unknown hand, keyed once and filtered per runout
+    pairs = []
+    if opponents:
+        for a, b in combinations(stub, 2):
+            pairs.append(((1 << a) | (1 << b), card_key((a, b)), [a, b]))
+
+    wins = ties = losses = 0
+    share = share_sq = 0.0
+
+    def record(hero_score: int, best: int, tied: int) -> None:
+        nonlocal wins, ties, losses, share, share_sq
+        if hero_score > best:
+            wins += 1
+            share += 1.0
+            share_sq += 1.0
+        elif hero_score == best:
+            ties += 1
+            part = 1.0 / (tied + 1)
+            share += part
+            share_sq += part * part
+        else:
+            losses += 1
+
+    for runout in combinations(stub, missing):
+        full_board = board_codes + list(runout)
+        board_key = card_key(full_board)
+        hero_score = score_key(board_key + hero_key, full_board + hero)
+
+        best, tied = 0, 0
+        for hand, key in zip(known_hands, known_keys):
+            s = score_key(board_key + key, full_board + hand)
+            if s > best:
+                best, tied = s, 1
+            elif s == best:
+                tied += 1
+
+        if not opponents:
+            record(hero_score, best, tied)
+            continue
+
+        runout_bits = 0
+        for c in runout:
+            runout_bits |= 1 << c
+        hands = [
+            (bits, score_key(board_key + key, full_board + pair))
+            for bits, key, pair in pairs
+            if not bits & runout_bits
+        ]
+
+        def walk(start: int, used_bits: int, best: int, tied: int, left: int) -> None:
+            if not left:
+                record(hero_score, best, tied)
+                return
+            for i in range(start, len(hands)):
+                bits, s = hands[i]
+                if used_bits & bits:
+                    continue
+                if s > best:
+                    walk(i + 1, used_bits | bits, s, 1, left - 1)
+                elif s == best:
+                    walk(i + 1, used_bits | bits, best, tied + 1, left - 1)
+                else:
+                    walk(i + 1, used_bits | bits, best, tied, left - 1)
+
+        walk(0, 0, best, tied, opponents)
+
+    return EquityResult(wins, ties, losses, share, share_sq, exact=True)
@@ -0,0 +1,113 @@
+"""
+Event-sourced log of PokerGame hands.
+
+A game with an EventLog emits every state transition of a hand as a
+fixed-size event (kind, seat, a, b) and shuffles its deck with a seed
+drawn from the log, so a hand can be rebuilt from its events alone (see
+src/replay.py). Events are plain tuples during the hand; each finished
+hand is packed into one bytes blob.
+
+    kind      seat        a                       b
+    START     dealer      shuffle seed            seat count
+    RULES     0           small blind             raise limit
+    SEAT      seat        player id               stack before the hand
+    HOLE      seat        card | card << 8        0
+    BLIND     seat        0 small / 1 big         chips posted
+    ACTION    seat        action index*           amount asked for
+    STREET    stage index packed new cards        card count
+    SHOWDOWN  seat        hand score              0
+    PAYOUT    seat        0                       chips won
+    END       0           winner count            pot
+
+    * hand_history.ACTION_INDEX, UNKNOWN_ACTION for anything else
+
+Log file: b"PKEV", then each hand as a 4-byte length and its blob.
+"""
+
+import functools
+import itertools
+import random
+import struct
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple
+
+START, RULES, SEAT, HOLE, BLIND, ACTION, STREET, SHOWDOWN, PAYOUT, END = range(10)
+KINDS = ("START", "RULES", "SEAT", "HOLE", "BLIND", "ACTION", "STREET", "SHOWDOWN", "PAYOUT", "END")
+UNKNOWN_ACTION = 255
+
+Event = Tuple[int, int, int, int]
+
+_EVENT = struct.Struct("<BBiq")
+_LENGTH = struct.Struct("<I")
+MAGIC = b"PKEV"
+
+def pack_cards(codes: Sequence[int]) -> int:
+    packed = 0
+    for i, code in enumerate(codes):
+        packed |= code << (8 * i)
+    return packed
+
+def unpack_cards(packed: int, count: int) -> List[int]:
+    return [(packed >> (8 * i)) & 0xFF for i in range(count)]
+
+@functools.lru_cache(maxsize=None)
+def _hand_struct(count: int) -> struct.Struct:
+    # one pack call per hand; hands only come in a few dozen lengths
+    return struct.Struct("<" + _EVENT.format[1:] * count)
+
+def encode_events(events: Sequence[Event]) -> bytes:
+    return _hand_struct(len(events)).pack(*itertools.chain.from_iterable(events))
+
+def decode_events(blob: bytes) -> List[Event]:
+    return list(_EVENT.iter_unpack(blob))
+
+class EventLog:
+    """
+    Finished hands of every game it is attached to, as encoded blobs.
+    'seed' fixes the sequence of shuffle seeds handed to the games.
+    """
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self._rng = random.Random(seed)
+        self.hands: List[bytes] = []
+
+    def __len__(self) -> int:
+        return len(self.hands)
+
+    def __iter__(self) -> Iterator[List[Event]]:
+        return (decode_events(blob) for blob in self.hands)
+
+    def new_seed(self) -> int:
+        return self._rng.getrandbits(31)
+
+    def append_hand(self, events: Sequence[Event]) -> None:
+        self.hands.append(encode_events(events))
+
+    def write(self, fp: BinaryIO) -> None:
+        fp.write(MAGIC)
+        for blob in self.hands:
+            fp.write(_LENGTH.pack(len(blob)))
+            fp.write(blob)
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as fp:
+            self.write(fp)
+
+    @classmethod
+    def load(cls, path: str) -> 'EventLog':
+        log = cls()
+        with open(path, "rb") as fp:
+            log.hands.extend(read_hands(fp))
+        return log
+
+def read_hands(fp: BinaryIO) -> Iterator[bytes]:
+    """Streams the hand blobs of a log file."""
+    if fp.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not an event log.")
+    while True:
+        header = fp.read(_LENGTH.size)
+        if not header:
+            return
+        (length,) = _LENGTH.unpack(header)
+        blob = fp.read(length)
+        if len(header) < _LENGTH.size or len(blob) < length or length % _EVENT.size:
+            raise ValueError("Truncated event log.")
+        yield blob
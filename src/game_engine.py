@@ -2,10 +2,15 @@
 The main game engine. Has One versus One and Solo play support
 """
 
+import random
 from typing import List, Tuple, Optional, Dict
 from .game_logic import Deck, Card, HandEvaluator
 from .player import Player
-from .database import DatabaseManager
+from .database import PlayerStorage, SettlementEntry
+from .event_log import (EventLog, START, RULES, SEAT, HOLE, BLIND, ACTION, STREET, PAYOUT, END,
+                        SHOWDOWN as SHOWDOWN_EVENT, UNKNOWN_ACTION, pack_cards)
+from .hand_history import HandHistoryStore, HandRecord, ACTION_INDEX, STAGE_INDEX
+from .stats import StatsEngine
 from .bot_logic import get_bot_move
 
 # Constants
@@ -16,19 +21,35 @@ RIVER = "RIVER"
 SHOWDOWN = "SHOWDOWN"
 
 class PokerGame:
-    def __init__(self, db: DatabaseManager, human_id: int, config: Dict):
+    def __init__(self, db: Optional[PlayerStorage], human_id: Optional[int], config: Dict,
+                 history: Optional[HandHistoryStore] = None, stats: Optional[StatsEngine] = None,
+                 events: Optional[EventLog] = None, rng: Optional[random.Random] = None):
         """
         config: {'mode': 'PVE', 'bot_count': 3, 'small_blind': 10, 'raise_limit': 0}
+        human_id None seats bots only (headless simulation).
+        config 'first_bot_id' (default 9000) numbers the bots from there.
+        history: optional store that receives every finished hand.
+        stats: optional StatsEngine updated after every hand.
+        events: optional EventLog that receives the events of every hand.
+        rng: shuffles (without an EventLog) and draws bot moves; default the random module.
         """
         self.db = db
+        self.history = history
+        self.stats = stats
+        self.events = events
+        self.rng = rng
+        self.hand_record: Optional[HandRecord] = None
+        # events of the hand in progress, while an EventLog is attached
+        self.hand_events: Optional[List[Tuple[int, int, int, int]]] = None
         self.config = config
         self.mode = config.get('mode', 'PVE')
         
         self.players: List[Player] = []
 
         # human setup
-        p1_data = self._get_player_data(human_id)
-        self.players.append(Player(id=human_id, name=p1_data[0], balance=p1_data[1]))
+        if human_id is not None:
+            p1_data = self._get_player_data(human_id)
+            self.players.append(Player(id=human_id, name=p1_data[0], balance=p1_data[1]))
 
         # bot setup
         if self.mode == 'PVP':
@@ -38,9 +59,10 @@ class PokerGame:
                 self.players.append(Player(id=p2_id, name=p2_data[0], balance=p2_data[1]))
         else:
             bot_count = config.get('bot_count', 1)
+            first_bot_id = config.get('first_bot_id', 9000)
             for i in range(bot_count):
                 self.players.append(Player(
-                    id=9000+i, 
+                    id=first_bot_id+i, 
                     name=f"Bot {i+1}", 
                     balance=2000, 
                     is_bot=True
@@ -61,14 +83,26 @@ class PokerGame:
 
         self.winner: Optional[Player] = None
 
+        # best score per live player id, updated as each street is dealt
+        self.board_key = 0
+        self._hand_scores: Dict[int, int] = {}
+
     def _get_player_data(self, pid: int):
-        with self.db._get_connection() as conn:
-            return conn.execute("SELECT username, balance FROM players WHERE id=?", (pid,)).fetchone()
+        return self.db.get_player(pid)
 
     def start_new_hand(self):
         self.deck = Deck()
-        self.deck.shuffle()
+        seed = 0
+        if self.events is not None:
+            seed = self.events.new_seed()
+            self.deck.shuffle(seed)
+        else:
+            self.deck.shuffle(rng=self.rng)
         self.community_cards = []
+        self.board_key = 0
+        self._hand_scores = {}
+        self.hand_record = None
+        self.hand_events = None
         self.pot = 0
         self.current_bet = 0
         self.winner = None
@@ -90,7 +124,22 @@ class PokerGame:
                 if p.balance > 0:
                     p.add_card(self.deck.deal(1)[0])
 
+        if self.history is not None or self.stats is not None:
+            self.hand_record = HandRecord(
+                seats=[p.id for p in self.players],
+                stacks=[p.balance for p in self.players],
+                hole_cards=[[c.code for c in p.hand] for p in self.players],
+            )
+
         n = len(self.players)
+        if self.events is not None:
+            self.hand_events = events = [
+                (START, self.dealer_index, seed, n),
+                (RULES, 0, self.small_blind, self.config.get('raise_limit', 0)),
+            ]
+            events += [(SEAT, i, p.id, p.balance) for i, p in enumerate(self.players)]
+            events += [(HOLE, i, p.hand[0].code | p.hand[1].code << 8, 0)
+                       for i, p in enumerate(self.players) if p.hand]
 
         if n == 2:
             sb_idx = self.dealer_index
@@ -99,16 +148,25 @@ class PokerGame:
             sb_idx = (self.dealer_index + 1) % n
             bb_idx = (self.dealer_index + 2) % n
 
-        self._post_bet(self.players[sb_idx], self.small_blind)
-        self._post_bet(self.players[bb_idx], self.big_blind)
+        sb_chips = self._post_bet(self.players[sb_idx], self.small_blind)
+        bb_chips = self._post_bet(self.players[bb_idx], self.big_blind)
+        self._record_action(sb_idx, "small_blind", sb_chips)
+        self._record_action(bb_idx, "big_blind", bb_chips)
+        if self.hand_events is not None:
+            self.hand_events += [(BLIND, sb_idx, 0, sb_chips), (BLIND, bb_idx, 1, bb_chips)]
 
         self.active_player_index = (bb_idx + 1) % n
 
-    def _post_bet(self, player: Player, amount: int):
+    def _post_bet(self, player: Player, amount: int) -> int:
         actual_bet = player.place_bet(amount)
         self.pot += actual_bet
         if player.current_bet > self.current_bet:
             self.current_bet = player.current_bet
+        return actual_bet
+
+    def _record_action(self, seat: int, action: str, amount: int = 0):
+        if self.hand_record is not None:
+            self.hand_record.add_action(seat, self.stage, action, amount)
 
     def process_action(self, action: str, amount: int = 0) -> str:
         result = self._execute_move(action, amount)
@@ -116,6 +174,11 @@ class PokerGame:
 
     def _execute_move(self, action: str, amount: int = 0) -> str:
         current_p = self.players[self.active_player_index]
+        if self.hand_events is not None:
+            # what was asked for, valid or not: replay repeats the same calls
+            self.hand_events.append(
+                (ACTION, self.active_player_index, ACTION_INDEX.get(action, UNKNOWN_ACTION), amount)
+            )
         
         # action text handling
         if action == "fold":
@@ -134,6 +197,7 @@ class PokerGame:
 
         if action == 'fold':
             current_p.is_folded = True
+            self._record_action(self.active_player_index, action)
             active = [p for p in self.players if not p.is_folded]
             if len(active) == 1:
                 self._end_hand(winner=active[0])
@@ -142,17 +206,18 @@ class PokerGame:
         elif action == 'check':
             if current_p.current_bet < self.current_bet:
                 return "Cannot check, must call."
+            self._record_action(self.active_player_index, action)
         
         elif action == 'call':
             needed = self.current_bet - current_p.current_bet
-            self._post_bet(current_p, needed)
+            self._record_action(self.active_player_index, action, self._post_bet(current_p, needed))
             
         elif action == 'bet' or action == 'raise':
             limit = self.config.get('raise_limit', 0)
             if limit > 0 and amount > limit: return f"Limit is {limit}"
             if amount < self.current_bet + self.big_blind: return "Raise too small"
             diff = amount - current_p.current_bet
-            self._post_bet(current_p, diff)
+            self._record_action(self.active_player_index, action, self._post_bet(current_p, diff))
             current_p.actions['raise'] += 1
 
         self.actions_this_round += 1
@@ -181,7 +246,7 @@ class PokerGame:
 
         active_p = self.players[self.active_player_index]
         if active_p.is_bot:
-            action, val = get_bot_move(self, active_p)
+            action, val = get_bot_move(self, active_p, self.rng)
             self._execute_move(action, val)
 
     def _is_betting_round_over(self) -> bool:
@@ -209,13 +274,13 @@ class PokerGame:
         
         if self.stage == PREFLOP:
             self.stage = FLOP
-            self.community_cards.extend(self.deck.deal(3))
+            self._deal_community(3)
         elif self.stage == FLOP:
             self.stage = TURN
-            self.community_cards.extend(self.deck.deal(1))
+            self._deal_community(1)
         elif self.stage == TURN:
             self.stage = RIVER
-            self.community_cards.extend(self.deck.deal(1))
+            self._deal_community(1)
         elif self.stage == RIVER:
             self.stage = SHOWDOWN
             self._resolve_showdown()
@@ -236,14 +301,44 @@ class PokerGame:
                  break
 
 
+    def _deal_community(self, count: int):
+        """Deals board cards and rescores every live player against the new board."""
+        new_cards = self.deck.deal(count)
+        self.community_cards.extend(new_cards)
+        new_codes = [c.code for c in new_cards]
+        self.board_key += HandEvaluator.card_key(new_codes)
+        if self.hand_events is not None:
+            self.hand_events.append((STREET, STAGE_INDEX[self.stage], pack_cards(new_codes), count))
+
+        board_codes = [c.code for c in self.community_cards]
+        for p in self.players:
+            if not p.is_folded and p.hand:
+                hole = [c.code for c in p.hand]
+                key = self.board_key + HandEvaluator.card_key(hole)
+                self._hand_scores[p.id] = HandEvaluator.score_key(key, board_codes + hole)
+
+    def hand_score(self, player: Player) -> int:
+        """
+        Current best score of a player's hole cards and the board (flop onwards).
+        Reads the value kept up to date by _deal_community.
+        """
+        score = self._hand_scores.get(player.id)
+        if score is None:
+            score = HandEvaluator.score(player.hand + self.community_cards)
+            self._hand_scores[player.id] = score
+        return score
+
     def _resolve_showdown(self):
         active = [p for p in self.players if not p.is_folded]
         if not active: return
         
         scores = []
         for p in active:
-            score = HandEvaluator.evaluate(p.hand + self.community_cards)
+            score = self.hand_score(p)
             scores.append((p, score))
+        if self.hand_events is not None:
+            self.hand_events.extend((SHOWDOWN_EVENT, i, self.hand_score(p), 0)
+                                    for i, p in enumerate(self.players) if not p.is_folded)
             
         scores.sort(key=lambda x: x[1], reverse=True)
         
@@ -261,31 +356,56 @@ class PokerGame:
             self._end_hand(None, winners=winners)
 
     def _end_hand(self, winner: Optional[Player], winners: List[Player] = None):
+        entries: List[SettlementEntry] = []
         if winner:
             winner.balance += self.pot
             self.winner = winner
             if not winner.is_bot:
-                 self.db.update_balance(winner.id, self.pot)
-                 self.db.record_hand_stats(winner.id, True, self.pot, 0, winner.actions)
+                entries.append(SettlementEntry(
+                    winner.id, self.pot, actions=winner.actions, won=True, pot_won=self.pot, hand_score=0
+                ))
         elif winners:
             split = self.pot // len(winners)
             for w in winners:
                 w.balance += split
                 if not w.is_bot:
-                    self.db.update_balance(w.id, split)
+                    entries.append(SettlementEntry(w.id, split))
             self.winner = None
 
         if winner:
             for p in self.players:
                 if p != winner and not p.is_bot:
-                    self.db.update_balance(p.id, -p.current_bet) # Simplified loss calc
+                    entries.append(SettlementEntry(p.id, -p.current_bet)) # Simplified loss calc
+
+        if entries and self.db is not None:  # detached copies (game_state.detach) settle nothing
+            self.db.settle_hand(entries)
+
+        if self.hand_events is not None:
+            events = self.hand_events
+            paid = [winner] if winner else winners or []
+            paid_ids = {w.id for w in paid}
+            share = self.pot // len(paid) if paid else 0
+            events.extend((PAYOUT, i, 0, share) for i, p in enumerate(self.players) if p.id in paid_ids)
+            events.append((END, 0, len(paid), self.pot))
+            self.events.append_hand(events)
+            self.hand_events = None
+
+        if self.hand_record is not None:
+            record = self.hand_record
+            record.board = [c.code for c in self.community_cards]
+            record.winners = [self.players.index(w) for w in ([winner] if winner else winners or [])]
+            record.pot = self.pot
+            if self.stats is not None:
+                self.stats.record_hand(record, self.big_blind,
+                                       persist=[p.id for p in self.players if not p.is_bot])
+            if self.history is not None:
+                self.history.append(record)
                     
         self.stage = SHOWDOWN
 
     def leave_game(self, player_id: int):
         """Safely saves state when a player leaves."""
         p = next((p for p in self.players if p.id == player_id), None)
-        if p:
+        if p and self.db is not None:
             # forfeit bet if left early
-            with self.db._get_connection() as conn:
-                conn.execute("UPDATE players SET balance=? WHERE id=?", (p.balance, p.id))
\ No newline at end of file
+            self.db.set_balance(p.id, p.balance)
\ No newline at end of file
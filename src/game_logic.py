@@ -3,11 +3,11 @@ The implementation of the elements and logic of the
 rules of Texas Hold'Em poker
 """
 
-import random
+import hashlib
 import itertools
+import random
 from dataclasses import dataclass, field
-from typing import List, Tuple
-from collections import Counter
+from typing import Dict, List, Optional, Tuple
 
 RANK_VALUES = {
     '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
@@ -15,19 +15,49 @@ RANK_VALUES = {
 }
 SUITS = ['H', 'D', 'C', 'S']
 
+# index of each suit inside a card code; hand-typed cards (e.g. "Ah Kh")
+# may use lower case suits
+SUIT_INDEX = {s: i for i, s in enumerate(SUITS)}
+SUIT_INDEX.update({s.lower(): i for s, i in list(SUIT_INDEX.items())})
+
 @dataclass(order=True, frozen=True)
 class Card:
-    """Represents a standard playing card."""
+    """
+    Represents a standard playing card.
+    Every card also carries a compact code in 0-51: (value - 2) * 4 + suit index.
+    """
     value: int = field(init=False)
     rank: str
     suit: str
+    code: int = field(init=False, compare=False, repr=False)
 
     def __post_init__(self):
-        object.__setattr__(self, 'value', RANK_VALUES[self.rank])
+        value = RANK_VALUES[self.rank]
+        object.__setattr__(self, 'value', value)
+        object.__setattr__(self, 'code', (value - 2) * 4 + SUIT_INDEX[self.suit])
+
+    def __hash__(self) -> int:
+        return self.code
 
     def __str__(self) -> str:
         return f"{self.rank}{self.suit}"
 
+    @staticmethod
+    def from_code(code: int) -> 'Card':
+        """Returns the shared Card instance for a 0-51 card code."""
+        return CARDS[code]
+
+# the 52 shared card instances, indexed by card code
+CARDS: List[Card] = [Card(rank=r, suit=s) for r in RANK_VALUES for s in SUITS]
+
+def cards_to_codes(cards: List[Card]) -> List[int]:
+    """Converts cards to their 0-51 codes."""
+    return [c.code for c in cards]
+
+def codes_to_cards(codes: List[int]) -> List[Card]:
+    """Converts 0-51 codes to the shared Card instances."""
+    return [CARDS[c] for c in codes]
+
 class Deck:
     """Represents a 52 card deck."""
     def __init__(self) -> None:
@@ -36,15 +66,24 @@ class Deck:
 
     def _initialize_deck(self) -> None:
         """Populates the deck with 52 cards."""
-        self.cards = [
-            Card(rank=r, suit=s)
-            for r in RANK_VALUES
-            for s in SUITS
-        ]
+        self.cards = list(CARDS)
 
-    def shuffle(self) -> None:
-        """Shuffles the deck in place."""
-        random.shuffle(self.cards)
+    def shuffle(self, seed: Optional[int] = None, rng: Optional[random.Random] = None) -> None:
+        """
+        Shuffles the deck in place. The same 'seed' always gives the same
+        order (replayable deals); without one 'rng' (default: the module
+        RNG) is used.
+        """
+        if seed is None:
+            (rng or random).shuffle(self.cards)
+            return
+        # Fisher-Yates drawing from one 320-bit hash of the seed (52! < 2**226),
+        # cheaper than seeding a random.Random for every deal
+        k = int.from_bytes(hashlib.blake2b(seed.to_bytes(8, "little"), digest_size=40).digest(), "little")
+        cards = self.cards
+        for i in range(len(cards) - 1, 0, -1):
+            k, j = divmod(k, i + 1)
+            cards[i], cards[j] = cards[j], cards[i]
 
     def deal(self, count: int = 1) -> List[Card]:
         """Deals 'count' cards from the top of the deck."""
@@ -62,8 +101,13 @@ class Deck:
 class HandEvaluator:
     """
     Evaluates the strength of a poker hand.
-    Input: 7 cards (2 hole + 5 community).
+    Input: 5 to 7 cards (2 hole + up to 5 community).
     Output: Best 5-card hand score.
+
+    Scoring is table driven: every card contributes an additive key that
+    packs its rank (3 bits per rank) and its suit count (4 bits per suit).
+    The summed rank part indexes a precomputed table of non-flush hands and
+    the suit part tells whether a flush lookup is needed instead.
     """
 
     # Hand Rankings
@@ -84,67 +128,197 @@ class HandEvaluator:
         Determines the best 5-card hand from a list of cards (usually 7).
         Returns a tuple: (Hand_Category_Score, List_of_Tie_Breakers)
         """
-        if len(cards) < 5:
+        return HandEvaluator.decode(HandEvaluator.score(cards))
+
+    @staticmethod
+    def score(cards: List[Card]) -> int:
+        """
+        Scores the best 5-card hand as a single integer.
+        Higher is better and equal scores are exact ties.
+        """
+        return HandEvaluator.score_codes([c.code for c in cards])
+
+    @staticmethod
+    def score_codes(codes: List[int]) -> int:
+        """Same as score(), for cards given as 0-51 codes."""
+        if len(codes) < 5:
             raise ValueError("Need at least 5 cards to evaluate.")
+        if len(codes) > 7:
+            # past the tables: the best five always lie within some seven of the cards
+            return max(HandEvaluator.score_codes(list(seven)) for seven in itertools.combinations(codes, 7))
 
-        # here generate all 5 card combinations
-        possible_hands = itertools.combinations(cards, 5)
-        best_score: Tuple[int, List[int]] = (-1, [])
+        key = 0
+        for c in codes:
+            key += _CARD_KEYS[c]
+        return HandEvaluator.score_key(key, codes)
 
-        for hand in possible_hands:
-            score = HandEvaluator._score_five_cards(list(hand))
-            best_score = max(best_score, score)
+    @staticmethod
+    def card_key(codes: List[int]) -> int:
+        """
+        Additive key of a group of card codes. Keys of disjoint groups can be
+        summed, so a board key can be computed once and reused for every hand.
+        """
+        key = 0
+        for c in codes:
+            key += _CARD_KEYS[c]
+        return key
 
-        return best_score
+    @staticmethod
+    def score_key(key: int, codes: List[int]) -> int:
+        """
+        Scores 5 to 7 cards from their summed card_key().
+        'codes' must list the same cards; it is only read when a flush is possible.
+        """
+        if not _FLUSH:
+            _build_tables()
+        key += _SUIT_BIAS
+        flush_bits = key & _FLUSH_BITS
+        if not flush_bits:
+            return _NON_FLUSH[key & _RANK_MASK]
+
+        # at most one suit can hold 5+ of 7 cards, and a flush then beats
+        # anything the remaining cards could make
+        suit = (flush_bits.bit_length() - _SUIT_SHIFT - 4) // 4
+        mask = 0
+        for c in codes:
+            if c & 3 == suit:
+                mask |= 1 << ((c >> 2) + 2)
+        return _FLUSH[mask]
+
+    @staticmethod
+    def category(score: int) -> int:
+        """Returns the hand category (PAIR, FLUSH, ...) of an integer score."""
+        return score >> _CATEGORY_SHIFT
 
     @staticmethod
-    def _score_five_cards(cards: List[Card]) -> Tuple[int, List[int]]:
-        """Internal method to score exactly 5 cards."""
-        cards.sort(key=lambda c: c.value, reverse=True)
-        values = [c.value for c in cards]
-        suits = [c.suit for c in cards]
+    def decode(score: int) -> Tuple[int, List[int]]:
+        """Converts an integer score back into (Hand_Category_Score, List_of_Tie_Breakers)."""
+        category = score >> _CATEGORY_SHIFT
+        count = _KICKER_COUNTS[category]
+        kickers = [(score >> (16 - 4 * i)) & 0xF for i in range(count)]
+        return category, kickers
+
+
+# Layout of the additive card key: 13 ranks x 3 bits, then 4 suits x 4 bits.
+# Each suit counter starts at 3 so that its high bit is set once it reaches 5.
+_SUIT_SHIFT = 39
+_RANK_MASK = (1 << _SUIT_SHIFT) - 1
+_SUIT_BIAS = 0x3333 << _SUIT_SHIFT
+_FLUSH_BITS = 0x8888 << _SUIT_SHIFT
+
+_RANK_KEYS = {v: 1 << (3 * (v - 2)) for v in RANK_VALUES.values()}
+_CARD_KEYS = [_RANK_KEYS[c.value] + (1 << (_SUIT_SHIFT + 4 * (c.code & 3))) for c in CARDS]
+
+_CATEGORY_SHIFT = 20
+_KICKER_COUNTS = {
+    HandEvaluator.HIGH_CARD: 5,
+    HandEvaluator.PAIR: 4,
+    HandEvaluator.TWO_PAIR: 3,
+    HandEvaluator.THREE_OF_A_KIND: 3,
+    HandEvaluator.STRAIGHT: 5,
+    HandEvaluator.FLUSH: 5,
+    HandEvaluator.FULL_HOUSE: 2,
+    HandEvaluator.FOUR_OF_A_KIND: 2,
+    HandEvaluator.STRAIGHT_FLUSH: 5,
+    HandEvaluator.ROYAL_FLUSH: 5,
+}
+
+_NON_FLUSH: Dict[int, int] = {}
+_FLUSH: List[int] = []
+
+
+def _pack(category: int, kickers: List[int]) -> int:
+    """Packs a category and its tie breakers into one comparable integer."""
+    score = category << _CATEGORY_SHIFT
+    for i, k in enumerate(kickers):
+        score |= k << (16 - 4 * i)
+    return score
+
+
+def _straight_high(mask: int) -> int:
+    """Returns the top rank of the best straight in a rank bitmask, or 0."""
+    for high in range(14, 5, -1):
+        run = 0b11111 << (high - 4)
+        if mask & run == run:
+            return high
+    wheel = (1 << 14) | 0b111100
+    if mask & wheel == wheel:
+        return 5
+    return 0
+
+
+def _straight_values(high: int) -> List[int]:
+    if high == 5:
+        return [5, 4, 3, 2, 1]
+    return list(range(high, high - 5, -1))
+
+
+def _score_groups(present: List[int], quads: List[int], trips: List[int],
+                  pairs: List[int], mask: int) -> int:
+    """
+    Scores the best non-flush 5-card hand. The lists hold rank values in
+    descending order: every rank present, and those seen 4, 3 and 2 times.
+    """
+    if quads:
+        kicker = next(v for v in present if v != quads[0])
+        return _pack(HandEvaluator.FOUR_OF_A_KIND, [quads[0], kicker])
 
-        is_flush = len(set(suits)) == 1
+    if trips and (len(trips) > 1 or pairs):
+        return _pack(HandEvaluator.FULL_HOUSE, [trips[0], max(trips[1:] + pairs)])
 
-        is_straight = False
-        if len(set(values)) == 5 and (values[0] - values[4] == 4):
-            is_straight = True
-        if values == [14, 5, 4, 3, 2]:
-            is_straight = True
-            values = [5, 4, 3, 2, 1]
+    high = _straight_high(mask)
+    if high:
+        return _pack(HandEvaluator.STRAIGHT, _straight_values(high))
 
-        if is_straight and is_flush:
-            if values[0] == 14: # Royal
-                return (HandEvaluator.ROYAL_FLUSH, values)
-            return (HandEvaluator.STRAIGHT_FLUSH, values)
+    if trips:
+        kickers = [v for v in present if v != trips[0]][:2]
+        return _pack(HandEvaluator.THREE_OF_A_KIND, [trips[0]] + kickers)
 
-        counts = Counter(values)
-        count_values = counts.most_common()
+    if len(pairs) >= 2:
+        kicker = next(v for v in present if v not in pairs[:2])
+        return _pack(HandEvaluator.TWO_PAIR, pairs[:2] + [kicker])
 
+    if pairs:
+        kickers = [v for v in present if v != pairs[0]][:3]
+        return _pack(HandEvaluator.PAIR, [pairs[0]] + kickers)
 
-        if count_values[0][1] == 4:
-            return (HandEvaluator.FOUR_OF_A_KIND, [count_values[0][0], count_values[1][0]])
+    return _pack(HandEvaluator.HIGH_CARD, present[:5])
 
-        if count_values[0][1] == 3 and count_values[1][1] == 2:
-            return (HandEvaluator.FULL_HOUSE, [count_values[0][0], count_values[1][0]])
 
-        if is_flush:
-            return (HandEvaluator.FLUSH, values)
+def _score_flush_mask(mask: int) -> int:
+    """Scores the best hand made from 5+ suited ranks given as a bitmask."""
+    high = _straight_high(mask)
+    if high == 14:
+        return _pack(HandEvaluator.ROYAL_FLUSH, _straight_values(high))
+    if high:
+        return _pack(HandEvaluator.STRAIGHT_FLUSH, _straight_values(high))
+    values = [v for v in range(14, 1, -1) if mask >> v & 1]
+    return _pack(HandEvaluator.FLUSH, values[:5])
 
-        if is_straight:
-            return (HandEvaluator.STRAIGHT, values)
 
-        if count_values[0][1] == 3:
-            kickers = sorted([k for k, v in counts.items() if v == 1], reverse=True)
-            return (HandEvaluator.THREE_OF_A_KIND, [count_values[0][0]] + kickers)
+def _build_tables() -> None:
+    """Fills the flush and non-flush lookup tables for 5 to 7 cards."""
+    present: List[int] = []
+    groups: Dict[int, List[int]] = {1: [], 2: [], 3: [], 4: []}
 
-        if count_values[0][1] == 2 and count_values[1][1] == 2:
-            pairs = sorted([k for k, v in counts.items() if v == 2], reverse=True)
-            kicker = [k for k, v in counts.items() if v == 1][0]
-            return (HandEvaluator.TWO_PAIR, pairs + [kicker])
+    # walks ranks from high to low so every list stays sorted descending
+    def walk(value: int, total: int, key: int, mask: int) -> None:
+        if value < 2:
+            if total >= 5:
+                _NON_FLUSH[key] = _score_groups(present, groups[4], groups[3], groups[2], mask)
+            return
+        walk(value - 1, total, key, mask)
+        present.append(value)
+        for n in range(1, min(4, 7 - total) + 1):
+            groups[n].append(value)
+            walk(value - 1, total + n, key + n * _RANK_KEYS[value], mask | 1 << value)
+            groups[n].pop()
+        present.pop()
 
-        if count_values[0][1] == 2:
-            kickers = sorted([k for k, v in counts.items() if v == 1], reverse=True)
-            return (HandEvaluator.PAIR, [count_values[0][0]] + kickers)
+    walk(14, 0, 0, 0)
 
-        return (HandEvaluator.HIGH_CARD, values)
+    flush = [0] * (1 << 15)
+    for mask in range(0, 1 << 15, 4):
+        if bin(mask).count("1") >= 5:
+            flush[mask] = _score_flush_mask(mask)
+    _FLUSH.extend(flush)
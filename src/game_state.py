@@ -0,0 +1,159 @@
+"""
+Compact snapshots of PokerGame state for search-based bots.
+
+A GameState is an immutable tuple of everything the engine's rules read:
+one SeatState per seat, the remaining deck and the board (shared Card
+instances, see game_logic.CARDS) and the betting counters. Taking or
+restoring one costs O(players) plus a 52-pointer copy of the deck, and
+never touches storage.
+
+SearchGame walks the game tree on a detached copy of a game: apply()
+plays a move and remembers the state before it, undo() puts it back.
+
+    search = SearchGame(game)
+    for move in search.legal_actions():
+        search.apply(*move)
+        ...  # evaluate or recurse
+        search.undo()
+"""
+
+from typing import List, NamedTuple, Tuple
+
+from .game_engine import PokerGame, SHOWDOWN
+from .game_logic import Card
+from .player import Player
+
+# NamedTuples rather than frozen dataclasses: a search creates them by the
+# million and tuple construction is several times cheaper
+
+class SeatState(NamedTuple):
+    balance: int
+    current_bet: int
+    is_folded: bool
+    is_all_in: bool
+    hand: Tuple[Card, ...]
+    actions: Tuple[int, ...]  # Player.actions counts, in key order
+    last_action_text: str
+
+class GameState(NamedTuple):
+    seats: Tuple[SeatState, ...]
+    deck: Tuple[Card, ...]  # remaining cards, dealt from the end
+    community_cards: Tuple[Card, ...]
+    pot: int
+    current_bet: int
+    stage: str
+    dealer_index: int
+    active_player_index: int
+    actions_this_round: int
+    winner: int  # seat index, -1 for none
+    board_key: int
+    hand_scores: Tuple[Tuple[int, int], ...]  # (player id, score)
+
+def snapshot(game: PokerGame) -> GameState:
+    players = game.players
+    winner = game.winner
+    return GameState(
+        tuple([SeatState(p.balance, p.current_bet, p.is_folded, p.is_all_in, tuple(p.hand),
+                         tuple(p.actions.values()), p.last_action_text) for p in players]),
+        tuple(game.deck.cards),
+        tuple(game.community_cards),
+        game.pot,
+        game.current_bet,
+        game.stage,
+        game.dealer_index,
+        game.active_player_index,
+        game.actions_this_round,
+        -1 if winner is None else next(i for i, p in enumerate(players) if p is winner),
+        game.board_key,
+        tuple(game._hand_scores.items()),
+    )
+
+def restore(game: PokerGame, state: GameState) -> None:
+    """
+    Puts 'game' back into 'state', in place. Recorders attached to the game
+    (hand history, stats, event log) are not rolled back: search on a
+    detach()ed copy.
+    """
+    if len(state.seats) != len(game.players):
+        raise ValueError("State has a different number of seats than the game.")
+    for p, seat in zip(game.players, state.seats):
+        p.balance = seat.balance
+        p.current_bet = seat.current_bet
+        p.is_folded = seat.is_folded
+        p.is_all_in = seat.is_all_in
+        p.hand = list(seat.hand)
+        p.actions = dict(zip(p.actions, seat.actions))
+        p.last_action_text = seat.last_action_text
+    game.deck.cards = list(state.deck)
+    game.community_cards = list(state.community_cards)
+    game.pot = state.pot
+    game.current_bet = state.current_bet
+    game.stage = state.stage
+    game.dealer_index = state.dealer_index
+    game.active_player_index = state.active_player_index
+    game.actions_this_round = state.actions_this_round
+    game.winner = None if state.winner < 0 else game.players[state.winner]
+    game.board_key = state.board_key
+    game._hand_scores = dict(state.hand_scores)
+
+def detach(game: PokerGame) -> PokerGame:
+    """Copy of 'game' with no storage or recorders, for what-if play."""
+    copy = PokerGame(None, None, dict(game.config, mode='PVE', bot_count=0))
+    copy.players = [Player(p.id, p.name, p.balance, is_bot=p.is_bot) for p in game.players]
+    copy.small_blind = game.small_blind
+    copy.big_blind = game.big_blind
+    restore(copy, snapshot(game))
+    return copy
+
+class SearchGame:
+    """A detached game with apply/undo, for lookahead bots."""
+    def __init__(self, game: PokerGame) -> None:
+        self.game = detach(game)
+        self._undo: List[GameState] = []
+
+    @property
+    def depth(self) -> int:
+        return len(self._undo)
+
+    @property
+    def hand_over(self) -> bool:
+        return self.game.stage == SHOWDOWN or self.game.winner is not None
+
+    def legal_actions(self) -> List[Tuple[str, int]]:
+        """Fold, check or call, and the smallest raise when it is allowed."""
+        if self.hand_over:
+            return []
+        game = self.game
+        p = game.players[game.active_player_index]
+        moves = [("check", 0)] if p.current_bet >= game.current_bet else [("fold", 0), ("call", 0)]
+        raise_to = game.current_bet + game.big_blind
+        limit = game.config.get('raise_limit', 0)
+        # a raise the stack cannot cover goes all-in
+        if p.balance > game.current_bet - p.current_bet and not (limit > 0 and raise_to > limit):
+            moves.append(("raise", raise_to))
+        return moves
+
+    def apply(self, action: str, amount: int = 0) -> str:
+        """
+        Plays a move for the active seat. Returns the engine's answer; a
+        refused move leaves the state as it was and is not undoable.
+        """
+        state = snapshot(self.game)
+        result = self.game.process_action(action, amount)
+        if result in ("OK", "Hand Over"):
+            self._undo.append(state)
+        else:
+            restore(self.game, state)
+        return result
+
+    def undo(self) -> None:
+        restore(self.game, self._undo.pop())
+
+    def reset(self) -> None:
+        """Undoes every applied move."""
+        if self._undo:
+            restore(self.game, self._undo[0])
+            self._undo.clear()
+
+    def state(self) -> GameState:
+        return snapshot(self.game)
@@ -0,0 +1,189 @@
+"""
+Append-only hand history in SQLite.
+
+Each hand is one row with compact blobs: seats (player id, starting stack,
+hole card codes), board card codes, packed action rows and winning seats.
+A (player_id, hand_id) index table serves "last N hands of a player" as
+a single index range scan, however many hands are stored.
+
+Hands are buffered in memory and full batches are written with
+executemany by a background thread, so recording a hand costs a list
+append in the game loop.
+"""
+
+import atexit
+import itertools
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from .database import DatabaseManager
+from .write_behind import BatchWriter
+
+STAGES = ("PREFLOP", "FLOP", "TURN", "RIVER")
+ACTIONS = ("small_blind", "big_blind", "fold", "check", "call", "bet", "raise")
+STAGE_INDEX = {name: i for i, name in enumerate(STAGES)}
+ACTION_INDEX = {name: i for i, name in enumerate(ACTIONS)}
+
+NO_CARD = 255
+
+# player id, starting stack, two hole card codes
+_SEAT = struct.Struct("<qqBB")
+# seat, stage, action, chips put in
+_ACTION = struct.Struct("<BBBi")
+
+@dataclass
+class HandRecord:
+    """
+    One finished hand. Seats are indexes into 'seats'; cards are 0-51 codes.
+    Actions are (seat, stage index, action index, chips put in).
+    """
+    seats: List[int]
+    stacks: List[int]
+    hole_cards: List[List[int]]
+    board: List[int] = field(default_factory=list)
+    actions: List[Tuple[int, int, int, int]] = field(default_factory=list)
+    winners: List[int] = field(default_factory=list)
+    pot: int = 0
+    played_at: float = 0.0
+    hand_id: Optional[int] = None
+
+    def add_action(self, seat: int, stage: str, action: str, amount: int = 0) -> None:
+        self.actions.append((seat, STAGE_INDEX[stage], ACTION_INDEX[action], amount))
+
+    def action_names(self) -> List[Tuple[int, str, str, int]]:
+        """Actions with stage and action names instead of indexes."""
+        return [(seat, STAGES[stage], ACTIONS[action], amount) for seat, stage, action, amount in self.actions]
+
+def encode_record(record: HandRecord) -> Tuple[float, int, bytes, bytes, bytes, bytes]:
+    seats = b"".join(
+        _SEAT.pack(pid, stack, *(list(cards) + [NO_CARD, NO_CARD])[:2])
+        for pid, stack, cards in zip(record.seats, record.stacks, record.hole_cards)
+    )
+    actions = b"".join(_ACTION.pack(*row) for row in record.actions)
+    return (record.played_at, record.pot, seats, bytes(record.board), actions, bytes(record.winners))
+
+def decode_record(row: Tuple) -> HandRecord:
+    hand_id, played_at, pot, seats, board, actions, winners = row
+    record = HandRecord([], [], [], list(board), list(_ACTION.iter_unpack(actions)),
+                        list(winners), pot, played_at, hand_id)
+    for pid, stack, first, second in _SEAT.iter_unpack(seats):
+        record.seats.append(pid)
+        record.stacks.append(stack)
+        record.hole_cards.append([c for c in (first, second) if c != NO_CARD])
+    return record
+
+class HandHistoryStore:
+    """
+    Append-only store of HandRecords next to the player tables
+    (the tables come from the database migrations).
+
+    append() only buffers; every 'batch_size' hands the buffer is queued
+    for a BatchWriter, whose thread writes it in one transaction. Reads
+    flush first.
+    """
+    def __init__(self, db: DatabaseManager, batch_size: int = 64, max_pending: int = 8) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive.")
+        self.db = db
+        self.batch_size = batch_size
+        self._pending: List[HandRecord] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._writer: BatchWriter[List[HandRecord]] = BatchWriter(
+            self._write, "Hand history writer", max_pending
+        )
+        atexit.register(self.close)
+
+    def append(self, record: HandRecord) -> None:
+        if not record.played_at:
+            record.played_at = time.time()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Hand history store is closed.")
+            self._pending.append(record)
+            if len(self._pending) >= self.batch_size:
+                # queued under the lock, so close() cannot stop the writer in between
+                batch, self._pending = self._pending, []
+                self._writer.put(batch)
+
+    def append_many(self, records: List[HandRecord]) -> None:
+        """Writes records immediately in one transaction and sets their hand_id."""
+        if not records:
+            return
+        rows = [encode_record(r) for r in records]
+        insert = "INSERT INTO hands (played_at, pot, seats, board, actions, winners) VALUES (?, ?, ?, ?, ?, ?)"
+        with self.db._get_connection() as conn:
+            # the first insert takes the write lock, so the following ids are consecutive
+            first_id = conn.execute(insert, rows[0]).lastrowid
+            conn.executemany(insert, rows[1:])
+            links = []
+            for offset, record in enumerate(records):
+                record.hand_id = first_id + offset
+                links.extend((pid, record.hand_id) for pid in set(record.seats))
+            conn.executemany("INSERT INTO hand_players (player_id, hand_id) VALUES (?, ?)", links)
+
+    def flush(self) -> None:
+        """Blocks until every hand appended so far is written."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if batch:
+                self._writer.put(batch)
+        self._writer.flush()
+
+    def close(self) -> None:
+        """Writes the buffered hands and stops the writer. Reads keep working."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            batch, self._pending = self._pending, []
+            if batch:
+                self._writer.put(batch)
+        atexit.unregister(self.close)
+        self._writer.close()
+
+    def _write(self, batches: List[List[HandRecord]]) -> None:
+        self.append_many(list(itertools.chain.from_iterable(batches)))
+
+    def get_hand(self, hand_id: int) -> Optional[HandRecord]:
+        self.flush()
+        with self.db._get_connection() as conn:
+            row = conn.execute(
+                "SELECT id, played_at, pot, seats, board, actions, winners FROM hands WHERE id = ?",
+                (hand_id,)
+            ).fetchone()
+        return decode_record(row) if row else None
+
+    def last_hands(self, player_id: int, limit: int = 10) -> List[HandRecord]:
+        """The player's most recent hands, newest first."""
+        self.flush()
+        with self.db._get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT h.id, h.played_at, h.pot, h.seats, h.board, h.actions, h.winners
+                FROM hand_players hp JOIN hands h ON h.id = hp.hand_id
+                WHERE hp.player_id = ?
+                ORDER BY hp.hand_id DESC LIMIT ?
+                """,
+                (player_id, limit)
+            ).fetchall()
+        return [decode_record(row) for row in rows]
+
+    def hands_between(self, start: float, end: float) -> List[HandRecord]:
+        """Hands played in [start, end), oldest first."""
+        self.flush()
+        with self.db._get_connection() as conn:
+            rows = conn.execute(
+                "SELECT id, played_at, pot, seats, board, actions, winners FROM hands "
+                "WHERE played_at >= ? AND played_at < ? ORDER BY played_at",
+                (start, end)
+            ).fetchall()
+        return [decode_record(row) for row in rows]
+
+    def count(self) -> int:
+        self.flush()
+        with self.db._get_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM hands").fetchone()[0]
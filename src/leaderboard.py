@@ -0,0 +1,81 @@
+"""
+Leaderboard queries with an in-process cache.
+
+Every sortable column has a descending index on players, so a page is an
+index range scan and a player's rank is an index count, never a sort of
+the whole table. Results are cached until the database's data_version
+changes, i.e. until the next committed write, from this process or any
+other one using the same file.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .database import DatabaseManager
+
+SORT_COLUMNS = ("balance", "hands_won", "biggest_pot_won")
+# cached pages and ranks kept before the cache is cleared
+MAX_CACHED = 256
+
+class Leaderboard:
+    """
+    Pages of (username, balance, hands_won, id) rows ordered by one of
+    SORT_COLUMNS, highest first; ties keep account creation order.
+    """
+    def __init__(self, db: 'DatabaseManager') -> None:
+        self.db = db
+        self._cache: Dict[Tuple[Any, ...], Any] = {}
+        self._version = -1
+        self._lock = threading.Lock()
+
+    def page(self, page: int = 0, page_size: int = 10, sort_by: str = "balance") -> List[Tuple[Any, ...]]:
+        self._check_column(sort_by)
+        if page < 0 or page_size < 1:
+            raise ValueError("page must be >= 0 and page_size >= 1.")
+        return self._cached(("page", sort_by, page, page_size), lambda conn: conn.execute(
+            f"SELECT username, balance, hands_won, id FROM players "
+            f"ORDER BY {sort_by} DESC, id LIMIT ? OFFSET ?",
+            (page_size, page * page_size)
+        ).fetchall())
+
+    def rank(self, player_id: int, sort_by: str = "balance") -> Optional[int]:
+        """1-based rank of a player (equal values share a rank), None if unknown."""
+        self._check_column(sort_by)
+
+        def query(conn):
+            row = conn.execute(f"SELECT {sort_by} FROM players WHERE id = ?", (player_id,)).fetchone()
+            if row is None:
+                return None
+            return conn.execute(f"SELECT COUNT(*) FROM players WHERE {sort_by} > ?", row).fetchone()[0] + 1
+
+        return self._cached(("rank", sort_by, player_id), query)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _cached(self, key: Tuple[Any, ...], query) -> Any:
+        version = self.db.data_version
+        with self._lock:
+            if version != self._version:
+                self._cache.clear()
+                self._version = version
+            if key in self._cache:
+                return self._cache[key]
+
+        with self.db._get_connection() as conn:
+            result = query(conn)
+
+        with self._lock:
+            # only keep results that are still current
+            if self._version == version == self.db.data_version:
+                if len(self._cache) >= MAX_CACHED:
+                    self._cache.clear()
+                self._cache[key] = result
+        return result
+
+    @staticmethod
+    def _check_column(sort_by: str) -> None:
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort the leaderboard by {sort_by}.")
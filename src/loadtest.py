@@ -0,0 +1,273 @@
+"""
+Load generator for the game server (src/server.py).
+
+Opens many concurrent client sessions that log in, get paired into
+heads-up tables and play with a policy: "bot" (get_bot_move on the
+client's view of the table) or "call" (check or call, never folds).
+Latency is measured per action, from sending it to the server's answer
+(the state broadcast or an error).
+
+Without --port a server with an in-memory database runs in the same
+event loop, so nothing leaves the machine; against a separately started
+server the numbers exclude the client's own CPU. Reports are JSON with
+fixed keys; --baseline prints the change against an earlier report.
+
+    python -m src.loadtest --seats 1000 --duration 30 --json run.json
+    python -m src.loadtest --seats 1000 --duration 30 --baseline run.json
+
+Each seat is a socket (two with the in-process server): raise the
+open-file limit (ulimit -n) for thousands of seats.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .bot_logic import get_bot_move
+from .database import DatabaseManager
+from .game_logic import Card, HandEvaluator, codes_to_cards
+from .player import Player
+from .server import GameClient, GameServer
+
+POLICIES = ("bot", "call")
+# concurrent connection attempts, so a burst of seats does not overflow the listen backlog
+CONNECT_CONCURRENCY = 100
+# report fields compared by --baseline, and whether lower is better
+COMPARED = {
+    "actions_per_second": False,
+    "hands_per_second": False,
+    "latency_p50_ms": True,
+    "latency_p90_ms": True,
+    "latency_p99_ms": True,
+    "errors": True,
+}
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(round(fraction * len(sorted_values), 9))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+@dataclass
+class LoadReport:
+    seats: int
+    policy: str
+    seconds: float = 0.0
+    actions: int = 0
+    hands: int = 0
+    errors: int = 0
+    latencies: List[float] = field(default_factory=list, repr=False)  # seconds
+
+    @property
+    def actions_per_second(self) -> float:
+        return self.actions / self.seconds if self.seconds else 0.0
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        return {
+            "seats": self.seats,
+            "policy": self.policy,
+            "seconds": round(self.seconds, 3),
+            "actions": self.actions,
+            "hands": self.hands,
+            "errors": self.errors,
+            "actions_per_second": round(self.actions_per_second, 1),
+            "hands_per_second": round(self.hands_per_second, 1),
+            "latency_p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+            "latency_p90_ms": round(percentile(ordered, 0.90) * 1000, 3),
+            "latency_p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+            "latency_max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        }
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Relative change of each COMPARED field against 'baseline' (0.1 = 10%
+    more). Fields missing or zero in the baseline are left out.
+    """
+    changes = {}
+    for key in COMPARED:
+        before = baseline.get(key)
+        if before:
+            changes[key] = (report[key] - before) / before
+    return changes
+
+class TableView:
+    """What a seat can see, shaped like PokerGame for get_bot_move."""
+    def __init__(self, state: Dict[str, Any], hole: List[Card], seat: int, big_blind: int) -> None:
+        self.current_bet = state.get("current_bet", 0)
+        self.big_blind = big_blind
+        self.community_cards = codes_to_cards(state.get("board", []))
+        self.players = [
+            Player(i, s["name"], s["balance"], current_bet=s["bet"], is_folded=s["folded"])
+            for i, s in enumerate(state.get("seats", []))
+        ]
+        self.me = self.players[seat]
+        self.me.hand = hole
+
+    def hand_score(self, player: Player) -> int:
+        return HandEvaluator.score(player.hand + self.community_cards)
+
+def choose_action(policy: str, view: TableView) -> Tuple[str, int]:
+    if policy == "bot":
+        return get_bot_move(view, view.me)
+    return ("check", 0) if view.me.current_bet >= view.current_bet else ("call", 0)
+
+class LoadTest:
+    """Runs 'seats' client sessions against host:port until 'duration' has passed."""
+    def __init__(self, host: str, port: int, seats: int, duration: float,
+                 policy: str = "bot", prefix: Optional[str] = None) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy}. Use one of {', '.join(POLICIES)}.")
+        if seats < 2:
+            raise ValueError("A load test needs at least two seats.")
+        self.host = host
+        self.port = port
+        self.seats = seats
+        self.duration = duration
+        self.policy = policy
+        # fresh names per run: a reused account may be broke on a persistent server
+        self.prefix = prefix or f"load-{os.getpid()}-{int(time.time())}-"
+        self.report = LoadReport(seats, policy)
+        self._result_messages = 0
+        self._connect = asyncio.Semaphore(CONNECT_CONCURRENCY)
+
+    async def run(self) -> LoadReport:
+        start = time.perf_counter()
+        self._deadline = start + self.duration
+        await asyncio.gather(*(self._seat(i) for i in range(self.seats)))
+        self.report.seconds = time.perf_counter() - start
+        # both seats of a table see every result
+        self.report.hands = self._result_messages // 2
+        return self.report
+
+    async def _seat(self, index: int) -> None:
+        generation = 0
+        while time.perf_counter() < self._deadline:
+            async with self._connect:
+                try:
+                    client = await GameClient.connect(self.host, self.port)
+                except OSError:
+                    self.report.errors += 1
+                    await asyncio.sleep(0.1)
+                    continue
+            try:
+                await self._play(client, f"{self.prefix}{index}.{generation}")
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.report.errors += 1
+            finally:
+                await _close(client)
+            generation += 1  # the table ended with a broke player: both start over
+
+    async def _play(self, client: GameClient, username: str) -> None:
+        """Plays until the deadline or the end of the table's game."""
+        await client.send(type="login", username=username)
+        await client.recv_until("welcome")
+        await client.send(type="join")
+        seat, big_blind, hole = -1, 0, []
+        sent_at: Optional[float] = None
+        retried = False
+
+        while True:
+            remaining = self._deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            try:
+                message = await client.recv(timeout=remaining)
+            except asyncio.TimeoutError:
+                return
+            if message is None:
+                raise ConnectionError("Server closed the connection.")
+
+            kind = message["type"]
+            if sent_at is not None and kind in ("state", "error"):
+                self.report.latencies.append(time.perf_counter() - sent_at)
+                sent_at = None
+                if kind == "error":
+                    self.report.errors += 1
+                    if not retried:
+                        # e.g. a raise the server refused: calling is always legal
+                        retried = True
+                        await self._act(client, "call", 0)
+                        sent_at = time.perf_counter()
+                    continue
+            if kind == "joined":
+                seat, big_blind = message["seat"], message["big_blind"]
+            elif kind == "hand":
+                hole = codes_to_cards(message["cards"])
+            elif kind == "result":
+                self._result_messages += 1
+            elif kind == "opponent_left":
+                await client.send(type="join")
+            elif kind == "game_over":
+                return
+            elif kind == "error":
+                self.report.errors += 1
+
+            if sent_at is None and kind == "state" and client.state.get("active_seat") == seat:
+                action, amount = choose_action(self.policy, TableView(client.state, hole, seat, big_blind))
+                await self._act(client, action, amount)
+                sent_at = time.perf_counter()
+                retried = False
+
+    async def _act(self, client: GameClient, action: str, amount: int) -> None:
+        await client.send(type="action", action=action, amount=amount)
+        self.report.actions += 1
+
+async def _close(client: GameClient) -> None:
+    try:
+        await client.close()
+    except (ConnectionError, OSError):
+        pass
+
+async def run_load_test(seats: int, duration: float, policy: str = "bot",
+                        host: str = "127.0.0.1", port: Optional[int] = None) -> LoadReport:
+    """Runs a load test; without 'port' against an in-process, in-memory server."""
+    server = None
+    if port is None:
+        server = GameServer(DatabaseManager.in_memory(), host, port=0, hand_pause=0)
+        await server.start()
+        port = server.port
+    try:
+        return await LoadTest(host, port, seats, duration, policy).run()
+    finally:
+        if server is not None:
+            await server.close()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Drive many simulated seats against the game server.")
+    parser.add_argument("--seats", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--policy", choices=POLICIES, default="bot")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None,
+                        help="a running server (default: start one in this process)")
+    parser.add_argument("--json", metavar="PATH", help="write the report to PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="compare with a report written earlier")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load_test(args.seats, args.duration, args.policy, args.host, args.port)).to_dict()
+    for key, value in report.items():
+        print(f"{key:>20}: {value}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for key, change in compare(report, baseline).items():
+            worse = change > 0 if COMPARED[key] else change < 0
+            print(f"{key:>20}: {change:+.1%} vs baseline{' (worse)' if worse and change else ''}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Parallel execution of CPU-bound work (equity sampling, hand simulation)
+across a process pool.
+
+Work is split into fixed-size shards that each get their own seed drawn
+from one base seed. Shard boundaries and seeds only depend on the total
+budget, the chunk size and the base seed, never on the number of workers,
+and shard results are merged in shard order, so a run is reproducible
+whatever the pool size.
+
+Scaling benchmark:
+
+    python -m src.parallel --samples 200000
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from .game_logic import Card, codes_to_cards
+from .equity import EquityResult, monte_carlo_equity
+
+# default shard size: ~50ms of sampling, far above the cost of pickling
+# the arguments and the result, and small enough that a large budget gives
+# every worker several shards. Fixed, so results never depend on 'workers'.
+MIN_CHUNK = 5000
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def split_budget(total: int, chunk_size: int) -> List[int]:
+    """Splits 'total' units of work into shards of at most 'chunk_size'."""
+    if total <= 0:
+        return []
+    full, rest = divmod(total, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+def shard_seeds(seed: int, count: int) -> List[int]:
+    """Independent per-shard seeds derived from one base seed."""
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(count)]
+
+
+def run_sharded(task: Callable[[Any], Any], shards: Sequence[Any],
+                workers: Optional[int] = None) -> List[Any]:
+    """
+    Runs 'task' over every shard and returns the results in shard order.
+    'task' must be a module-level function. With one worker (or one shard)
+    everything runs in this process.
+    """
+    workers = workers or default_workers()
+    if workers <= 1 or len(shards) <= 1:
+        return [task(shard) for shard in shards]
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+        return list(pool.map(task, shards))
+
+
+def _equity_shard(args: Tuple[List[int], List[int], int, List[int], int, int]) -> EquityResult:
+    hole, board, opponents, dead, samples, seed = args
+    return monte_carlo_equity(
+        codes_to_cards(hole), codes_to_cards(board), opponents=opponents,
+        samples=samples, dead_cards=codes_to_cards(dead), rng=random.Random(seed)
+    )
+
+
+def parallel_equity(hole_cards: Sequence[Card], board: Sequence[Card] = (),
+                    opponents: int = 1, samples: int = 100000,
+                    dead_cards: Sequence[Card] = (), workers: Optional[int] = None,
+                    seed: int = 0, chunk_size: Optional[int] = None) -> EquityResult:
+    """Monte Carlo equity with the sample budget sharded across processes."""
+    budgets = split_budget(samples, chunk_size or MIN_CHUNK)
+    hole = [c.code for c in hole_cards]
+    board_codes = [c.code for c in board]
+    dead = [c.code for c in dead_cards]
+
+    shards = [
+        (hole, board_codes, opponents, dead, budget, shard_seed)
+        for budget, shard_seed in zip(budgets, shard_seeds(seed, len(budgets)))
+    ]
+    result = EquityResult()
+    for part in run_sharded(_equity_shard, shards, workers):
+        result = result.merge(part)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Measures equity throughput for 1..N workers."""
+    parser = argparse.ArgumentParser(description="Parallel equity scaling benchmark.")
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--opponents", type=int, default=1)
+    parser.add_argument("--max-workers", type=int, default=default_workers())
+    args = parser.parse_args(argv)
+
+    hand = [Card(rank='A', suit='H'), Card(rank='K', suit='H')]
+    # warm the lookup tables (and forked workers) before timing
+    parallel_equity(hand, samples=MIN_CHUNK, workers=1)
+
+    base = None
+    print(f"{'workers':>8} {'seconds':>9} {'samples/s':>12} {'speedup':>8}")
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        parallel_equity(hand, opponents=args.opponents, samples=args.samples, workers=workers)
+        elapsed = time.perf_counter() - start
+        base = base or elapsed
+        print(f"{workers:>8} {elapsed:>9.3f} {args.samples / elapsed:>12.0f} {base / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
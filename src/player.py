@@ -26,6 +26,8 @@ class Player:
         self.current_bet = 0
         self.is_folded = False
         self.is_all_in = False
+        # per-hand counts: settlement adds them to the stored totals
+        self.actions = {action: 0 for action in self.actions}
     
     def add_card(self, card: Card):
         self.hand.append(card)
@@ -0,0 +1,132 @@
+"""
+Precomputed preflop equities for the 169 starting-hand classes.
+
+The table is a small flat binary file: a header (magic, version, number of
+classes, number of player counts) followed by little-endian float32
+equities, one row per hand class and one column per player count.
+Regenerate it with:
+
+    python -m src.preflop --samples 20000
+"""
+
+import argparse
+import os
+import random
+import struct
+import sys
+from array import array
+from typing import List, Optional, Sequence
+
+from .game_logic import CARDS, Card
+from .equity import monte_carlo_equity
+
+TABLE_VERSION = 1
+TABLE_MAGIC = b"PFEQ"
+MIN_PLAYERS = 2
+MAX_PLAYERS = 5
+NUM_CLASSES = 169
+TABLE_PATH = os.path.join(os.path.dirname(__file__), "data", "preflop_equity.bin")
+
+_HEADER = struct.Struct("<4sHHH")
+_RANK_CHARS = "23456789TJQKA"
+
+_table: Optional[array] = None
+
+
+def hand_class_index(cards: Sequence[Card]) -> int:
+    """
+    Index (0-168) of the starting-hand class of two hole cards.
+    Classes form a 13x13 grid: pairs on the diagonal, suited hands with
+    the higher rank as the row, offsuit hands with the lower rank as the row.
+    """
+    high, low = sorted((cards[0].value - 2, cards[1].value - 2), reverse=True)
+    if high != low and cards[0].code & 3 == cards[1].code & 3:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def hand_class_name(index: int) -> str:
+    """Label of a hand class, e.g. 'AA', 'AKs' or 'T9o'."""
+    row, col = divmod(index, 13)
+    if row == col:
+        return _RANK_CHARS[row] * 2
+    if row > col:
+        return f"{_RANK_CHARS[row]}{_RANK_CHARS[col]}s"
+    return f"{_RANK_CHARS[col]}{_RANK_CHARS[row]}o"
+
+
+def representative_cards(index: int) -> List[Card]:
+    """Two concrete hole cards belonging to a hand class."""
+    row, col = divmod(index, 13)
+    if row > col:  # suited: same suit
+        return [CARDS[row * 4], CARDS[col * 4]]
+    return [CARDS[col * 4], CARDS[row * 4 + 1]]
+
+
+def _load_table(path: str = TABLE_PATH) -> array:
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, classes, columns = _HEADER.unpack_from(data)
+    if magic != TABLE_MAGIC or version != TABLE_VERSION:
+        raise ValueError(f"Preflop table {path} is not version {TABLE_VERSION}; regenerate it.")
+    if classes != NUM_CLASSES or columns != MAX_PLAYERS - MIN_PLAYERS + 1:
+        raise ValueError(f"Preflop table {path} has an unexpected shape.")
+
+    table = array("f")
+    table.frombytes(data[_HEADER.size:])
+    if sys.byteorder != "little":
+        table.byteswap()
+    return table
+
+
+def preflop_equity(cards: Sequence[Card], players: int = 2) -> float:
+    """
+    Equity of two hole cards against (players - 1) random hands.
+    The table is read from disk on first use.
+    """
+    global _table
+    if not MIN_PLAYERS <= players <= MAX_PLAYERS:
+        raise ValueError(f"Players must be between {MIN_PLAYERS} and {MAX_PLAYERS}.")
+    if _table is None:
+        _table = _load_table()
+    columns = MAX_PLAYERS - MIN_PLAYERS + 1
+    return _table[hand_class_index(cards) * columns + players - MIN_PLAYERS]
+
+
+def generate_table(samples: int, seed: int = 0) -> List[List[float]]:
+    """Estimates every (hand class, player count) equity by Monte Carlo."""
+    rng = random.Random(seed)
+    rows = []
+    for index in range(NUM_CLASSES):
+        hand = representative_cards(index)
+        rows.append([
+            monte_carlo_equity(hand, opponents=players - 1, samples=samples, rng=rng).equity
+            for players in range(MIN_PLAYERS, MAX_PLAYERS + 1)
+        ])
+    return rows
+
+
+def write_table(rows: List[List[float]], path: str = TABLE_PATH) -> None:
+    """Writes equities in the on-disk table format."""
+    table = array("f", [value for row in rows for value in row])
+    if sys.byteorder != "little":
+        table.byteswap()
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, len(rows), len(rows[0])))
+        f.write(table.tobytes())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Regenerates the preflop equity table."""
+    parser = argparse.ArgumentParser(description="Regenerate the preflop equity table.")
+    parser.add_argument("--samples", type=int, default=20000, help="Monte Carlo samples per cell")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=TABLE_PATH)
+    args = parser.parse_args(argv)
+
+    write_table(generate_table(args.samples, args.seed), args.output)
+    print(f"Wrote {NUM_CLASSES} hand classes to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Deterministic replay of hands recorded in an EventLog.
+
+replay_hand() seats the recorded stacks on a fresh PokerGame, deals with
+the recorded shuffle seed and repeats the recorded actions; the game emits
+its own events on the way, and verify_hand() checks they are identical to
+the log. No storage is attached, so replay only costs the engine's work.
+
+    python -m src.replay hands.pkev
+"""
+
+import argparse
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from .event_log import ACTION, RULES, SEAT, START, Event, decode_events, read_hands
+from .game_engine import PokerGame
+from .hand_history import ACTIONS
+from .player import Player
+
+class _Capture:
+    """Stands in for the EventLog: hands out the recorded seed and keeps the replayed events."""
+    def __init__(self, seed: int) -> None:
+        self.seed = seed
+        self.events: Optional[List[Event]] = None
+
+    def new_seed(self) -> int:
+        return self.seed
+
+    def append_hand(self, events: Sequence[Event]) -> None:
+        self.events = list(events)
+
+def replay_hand(events: Sequence[Event], actions: Optional[int] = None,
+                on_action: Optional[Callable[[PokerGame, int, str, int], None]] = None) -> PokerGame:
+    """
+    Rebuilds a hand from its events. 'actions' stops after that many
+    recorded actions, leaving the game as it was when the next decision
+    was made; on_action(game, seat, action, amount) runs before each one.
+    """
+    if len(events) < 2 or events[0][0] != START or events[1][0] != RULES:
+        raise ValueError("A hand starts with START and RULES events.")
+    _, dealer, seed, seats = events[0]
+    _, _, small_blind, raise_limit = events[1]
+
+    config = {'mode': 'PVE', 'bot_count': 0, 'small_blind': small_blind, 'raise_limit': raise_limit}
+    game = PokerGame(None, None, config, events=_Capture(seed))
+    # no storage: every seat settles like a bot
+    game.players = [Player(pid, f"Seat {seat + 1}", stack, is_bot=True)
+                    for kind, seat, pid, stack in events if kind == SEAT]
+    if len(game.players) != seats:
+        raise ValueError(f"Hand has {len(game.players)} SEAT events for {seats} seats.")
+    game.dealer_index = (dealer - 1) % seats  # start_new_hand moves the button on
+    game.start_new_hand()
+
+    played = 0
+    for kind, seat, action, amount in events:
+        if kind != ACTION:
+            continue
+        if actions is not None and played >= actions:
+            break
+        name = ACTIONS[action] if action < len(ACTIONS) else "unknown"
+        if on_action is not None:
+            on_action(game, seat, name, amount)
+        game.process_action(name, amount)
+        played += 1
+    return game
+
+def replayed_events(game: PokerGame) -> List[Event]:
+    """Events a replayed game emitted, finished or not."""
+    capture = game.events
+    return capture.events if capture.events is not None else list(game.hand_events or [])
+
+def verify_hand(events: Sequence[Event]) -> bool:
+    """True when replaying the hand emits exactly the recorded events."""
+    return replayed_events(replay_hand(events)) == list(events)
+
+@dataclass
+class ReplayReport:
+    hands: int = 0
+    seconds: float = 0.0
+    mismatches: List[int] = field(default_factory=list)  # positions in the log
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.seconds if self.seconds else 0.0
+
+def replay_log(blobs: Iterable[bytes]) -> ReplayReport:
+    """Replays and verifies every hand of a log (e.g. read_hands(fp))."""
+    report = ReplayReport()
+    start = time.perf_counter()
+    for i, blob in enumerate(blobs):
+        if not verify_hand(decode_events(blob)):
+            report.mismatches.append(i)
+        report.hands += 1
+    report.seconds = time.perf_counter() - start
+    return report
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay and verify the hands of an event log.")
+    parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    with open(args.path, "rb") as fp:
+        report = replay_log(read_hands(fp))
+    print(f"Replayed {report.hands} hands in {report.seconds:.2f}s ({report.hands_per_second:.0f} hands/s)")
+    if report.mismatches:
+        print(f"{len(report.mismatches)} hands differ, first at position {report.mismatches[0]}")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""
+asyncio TCP server for remote heads-up (PVP) tables.
+
+Protocol: every message is a 4-byte big-endian length followed by a
+compact JSON object with a "type" field.
+
+    client -> server   login {username}, join {}, action {action, amount}, leave {}
+    server -> client   welcome, joined {table_id, seat, big_blind}, hand {cards},
+                       state {changed fields}, timeout, result, error,
+                       opponent_left, game_over
+
+"state" messages only carry the fields that changed since the previous
+one for that table (clients merge them, see GameClient). A player who
+does not act within 'action_timeout' seconds checks if possible and
+folds otherwise. Settlement goes through a WriteBehindDatabase, so the
+event loop never waits on disk writes.
+
+Only loopback and private (LAN) addresses can be served.
+
+    python -m src.server --host 127.0.0.1 --port 8765 --db poker_game.db
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import itertools
+import json
+import struct
+from typing import Any, Dict, List, Optional
+
+from .database import DatabaseManager
+from .game_engine import PokerGame, SHOWDOWN
+from .write_behind import WriteBehindDatabase
+
+_LENGTH = struct.Struct(">I")
+MAX_MESSAGE = 64 * 1024
+DEFAULT_PORT = 8765
+
+class ProtocolError(Exception):
+    pass
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    body = json.dumps(message, separators=(",", ":")).encode()
+    return _LENGTH.pack(len(body)) + body
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """Next message, or None when the peer closed the connection."""
+    try:
+        header = await reader.readexactly(_LENGTH.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = _LENGTH.unpack(header)
+    if length > MAX_MESSAGE:
+        raise ProtocolError(f"Message of {length} bytes is too large.")
+    try:
+        message = json.loads(await reader.readexactly(length))
+    except (asyncio.IncompleteReadError, ValueError) as e:
+        raise ProtocolError("Malformed message.") from e
+    if not isinstance(message, dict) or "type" not in message:
+        raise ProtocolError("Messages must be objects with a type.")
+    return message
+
+def check_local_host(host: str) -> None:
+    """Raises ValueError unless 'host' is localhost or a loopback/private address."""
+    if host == "localhost":
+        return
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        raise ValueError(f"Serve on an IP address or localhost, not {host}.") from None
+    if not (address.is_loopback or address.is_private) or address.is_unspecified:
+        raise ValueError(f"{host} is not a loopback or LAN address.")
+
+def public_state(game: PokerGame) -> Dict[str, Any]:
+    """Everything both players may see about a table."""
+    hand_over = game.stage == SHOWDOWN or game.winner is not None
+    return {
+        "stage": game.stage,
+        "pot": game.pot,
+        "current_bet": game.current_bet,
+        "board": [c.code for c in game.community_cards],
+        "active_seat": None if hand_over else game.active_player_index,
+        "seats": [
+            {"name": p.name, "balance": p.balance, "bet": p.current_bet,
+             "folded": p.is_folded, "last_action": p.last_action_text}
+            for p in game.players
+        ],
+    }
+
+class Session:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.player_id: Optional[int] = None
+        self.username = ""
+        self.table: Optional['ServerTable'] = None
+
+    def send(self, message: Dict[str, Any]) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(encode_message(message))
+
+class ServerTable:
+    """One PokerGame between two sessions, with the per-action timer."""
+    def __init__(self, server: 'GameServer', table_id: int, first: Session) -> None:
+        self.server = server
+        self.table_id = table_id
+        self.sessions: List[Session] = [first]
+        self.game: Optional[PokerGame] = None
+        self.last_state: Dict[str, Any] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._turn = itertools.count()
+        self._turn_token = -1
+        self.closed = False
+
+    def broadcast(self, message: Dict[str, Any]) -> None:
+        for session in self.sessions:
+            session.send(message)
+
+    async def start(self) -> None:
+        first, second = self.sessions
+        config = {'mode': 'PVP', 'p2_id': second.player_id, 'small_blind': self.server.small_blind}
+        loop = asyncio.get_running_loop()
+        # reads the two accounts: keep it off the event loop
+        self.game = await loop.run_in_executor(
+            None, lambda: PokerGame(self.server.db, first.player_id, config)
+        )
+        self.new_hand()
+
+    def new_hand(self) -> None:
+        if self.closed:
+            return
+        if self.game.start_new_hand() == "GAME_OVER":
+            self.broadcast({"type": "game_over"})
+            self.close()
+            return
+        self.last_state = {}
+        for session, player in zip(self.sessions, self.game.players):
+            session.send({"type": "hand", "cards": [c.code for c in player.hand]})
+        self.after_action()
+
+    def seat_of(self, session: Session) -> int:
+        return self.sessions.index(session)
+
+    def act(self, session: Session, action: str, amount: int) -> Optional[str]:
+        """Plays a move for 'session'. Returns an error text or None."""
+        if self.game is None or self.closed:
+            return "The table has not started."
+        if self.game.stage == SHOWDOWN or self.game.winner is not None:
+            return "The hand is over."
+        if self.game.active_player_index != self.seat_of(session):
+            return "Not your turn."
+        result = self.game.process_action(action, amount)
+        if result not in ("OK", "Hand Over"):
+            return result
+        self.after_action()
+        return None
+
+    def after_action(self) -> None:
+        state = public_state(self.game)
+        delta = {k: v for k, v in state.items() if self.last_state.get(k) != v}
+        self.last_state = state
+        if delta:
+            self.broadcast({"type": "state", **delta})
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if state["active_seat"] is None:
+            self.finish_hand()
+        else:
+            token = self._turn_token = next(self._turn)
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.server.action_timeout, self.on_timeout, token)
+
+    def on_timeout(self, token: int) -> None:
+        if token != self._turn_token or self.closed:
+            return
+        session = self.sessions[self.game.active_player_index]
+        player = self.game.players[self.game.active_player_index]
+        action = "check" if player.current_bet >= self.game.current_bet else "fold"
+        session.send({"type": "timeout", "action": action})
+        self.act(session, action, 0)
+
+    def finish_hand(self) -> None:
+        winner = self.game.winner
+        self.broadcast({
+            "type": "result",
+            "winner": winner.name if winner else None,
+            "pot": self.game.pot,
+            "hands": self.shown_hands(),
+        })
+        asyncio.get_running_loop().call_later(self.server.hand_pause, self.new_hand)
+
+    def shown_hands(self) -> Dict[str, List[int]]:
+        """Hole cards turned over at a showdown; a hand won on a fold shows nothing."""
+        live = [p for p in self.game.players if not p.is_folded]
+        if self.game.stage != SHOWDOWN or len(live) < 2:
+            return {}
+        return {p.name: [c.code for c in p.hand] for p in live}
+
+    def leave(self, session: Session) -> None:
+        if session not in self.sessions:
+            return
+        game = self.game
+        if game is not None:
+            if not (game.stage == SHOWDOWN or game.winner is not None):
+                # leaving mid-hand is a fold, so the opponent is paid the pot
+                game.active_player_index = self.seat_of(session)
+                game.process_action("fold")
+            game.leave_game(session.player_id)
+        self.sessions.remove(session)
+        session.table = None
+        self.broadcast({"type": "opponent_left"})
+        self.close()
+
+    def close(self) -> None:
+        self.closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+        for session in self.sessions:
+            if self.game is not None:
+                self.game.leave_game(session.player_id)
+            session.table = None
+        self.sessions = []
+        self.server.tables.pop(self.table_id, None)
+        if self.server.waiting is self:
+            self.server.waiting = None
+
+class GameServer:
+    """
+    Pairs logged-in clients into heads-up tables and relays their moves.
+    A DatabaseManager is wrapped in a WriteBehindDatabase.
+    """
+    def __init__(self, db, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 action_timeout: float = 30.0, small_blind: int = 10, hand_pause: float = 2.0) -> None:
+        check_local_host(host)
+        if isinstance(db, DatabaseManager):
+            db = WriteBehindDatabase(db)
+        self.db = db
+        self.host = host
+        self.port = port
+        self.action_timeout = action_timeout
+        self.small_blind = small_blind
+        self.hand_pause = hand_pause
+        self.tables: Dict[int, ServerTable] = {}
+        self.waiting: Optional[ServerTable] = None
+        self._table_ids = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        for table in list(self.tables.values()):
+            table.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await asyncio.get_running_loop().run_in_executor(None, self.db.close)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session = Session(reader, writer)
+        try:
+            while True:
+                try:
+                    message = await read_message(reader)
+                except ProtocolError as e:
+                    session.send({"type": "error", "message": str(e)})
+                    break
+                if message is None:
+                    break
+                await self._dispatch(session, message)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if session.table is not None:
+                session.table.leave(session)
+            writer.close()
+
+    async def _dispatch(self, session: Session, message: Dict[str, Any]) -> None:
+        kind = message["type"]
+        if kind == "login":
+            username = str(message.get("username", "")).strip()
+            if not username or session.player_id is not None:
+                session.send({"type": "error", "message": "Send one login with a username."})
+                return
+            loop = asyncio.get_running_loop()
+            session.player_id, balance = await loop.run_in_executor(None, self.db.get_or_create_player, username)
+            session.username = username
+            session.send({"type": "welcome", "player_id": session.player_id, "balance": balance})
+        elif session.player_id is None:
+            session.send({"type": "error", "message": "Log in first."})
+        elif kind == "join":
+            await self._join(session)
+        elif kind == "action":
+            if session.table is None:
+                session.send({"type": "error", "message": "Join a table first."})
+                return
+            try:
+                amount = int(message.get("amount", 0))
+            except (TypeError, ValueError):
+                session.send({"type": "error", "message": "amount must be a whole number."})
+                return
+            error = session.table.act(session, str(message.get("action")), amount)
+            if error:
+                session.send({"type": "error", "message": error})
+        elif kind == "leave":
+            if session.table is not None:
+                session.table.leave(session)
+        else:
+            session.send({"type": "error", "message": f"Unknown message type {kind}."})
+
+    async def _join(self, session: Session) -> None:
+        if session.table is not None:
+            session.send({"type": "error", "message": "Already at a table."})
+            return
+        table = self.waiting
+        if table is None or any(s.player_id == session.player_id for s in table.sessions):
+            table = ServerTable(self, next(self._table_ids), session)
+            self.tables[table.table_id] = table
+            self.waiting = table
+        else:
+            table.sessions.append(session)
+            self.waiting = None
+        session.table = table
+        session.send({"type": "joined", "table_id": table.table_id, "seat": table.seat_of(session),
+                      "big_blind": self.small_blind * 2})
+        if len(table.sessions) == 2:
+            await table.start()
+
+class GameClient:
+    """Minimal client, used by tests and scripts. 'state' merges the deltas."""
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.state: Dict[str, Any] = {}
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> 'GameClient':
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def send(self, **message: Any) -> None:
+        self.writer.write(encode_message(message))
+        await self.writer.drain()
+
+    async def recv(self, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+        message = await asyncio.wait_for(read_message(self.reader), timeout)
+        if message is not None and message["type"] == "state":
+            self.state.update({k: v for k, v in message.items() if k != "type"})
+        if message is not None and message["type"] == "hand":
+            self.state = {}
+        return message
+
+    async def recv_until(self, kind: str, timeout: float = 5.0) -> Dict[str, Any]:
+        """Reads (and merges) messages until one of type 'kind' arrives."""
+        while True:
+            message = await self.recv(timeout)
+            if message is None:
+                raise ConnectionError("Server closed the connection.")
+            if message["type"] == kind:
+                return message
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve remote heads-up poker tables on the LAN.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", default="poker_game.db")
+    parser.add_argument("--action-timeout", type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    server = GameServer(DatabaseManager(args.db, profile="durable"), args.host, args.port,
+                        action_timeout=args.action_timeout)
+    print(f"Serving on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
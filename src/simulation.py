@@ -0,0 +1,189 @@
+"""
+Headless bot-vs-bot simulation of PokerGame: no UI, no pygame, no delays.
+Used to regression-test bot strategies and stress the engine.
+
+    python -m src.simulation --hands 100000 --bots 4 --seed 1
+"""
+
+import argparse
+import random
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .game_engine import PokerGame, SHOWDOWN
+from .bot_logic import get_bot_move
+from .database import DatabaseManager, PROFILES
+from .event_log import EventLog
+from .hand_history import HandHistoryStore
+from .stats import StatsEngine
+from .write_behind import WriteBehindDatabase
+from .parallel import default_workers, run_sharded, shard_seeds, split_budget
+
+REBUY_STACK = 2000
+# guards against an engine bug turning one hand into an endless loop
+MAX_ACTIONS_PER_HAND = 1000
+SIM_PLAYER_NAME = "simulator"
+
+@dataclass(frozen=True)
+class SimulationResult:
+    hands: int = 0
+    actions: int = 0
+    seconds: float = 0.0
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.seconds if self.seconds else 0.0
+
+    def merge(self, other: 'SimulationResult') -> 'SimulationResult':
+        """Combines two runs; time is summed (CPU time across shards)."""
+        return SimulationResult(
+            self.hands + other.hands,
+            self.actions + other.actions,
+            self.seconds + other.seconds,
+        )
+
+
+def build_game(bots: int, small_blind: int = 10, db=None,
+               history: Optional[HandHistoryStore] = None,
+               stats: Optional[StatsEngine] = None,
+               events: Optional[EventLog] = None,
+               rng: Optional[random.Random] = None) -> PokerGame:
+    """
+    Creates a table of bots. With a database, seat 0 is a real database
+    player (driven by the bot policy) so settlement code runs as well.
+    """
+    config = {'mode': 'PVE', 'bot_count': bots, 'small_blind': small_blind, 'raise_limit': 0}
+    if db is None:
+        return PokerGame(db, None, config, history=history, stats=stats, events=events, rng=rng)
+    player_id, _ = db.get_or_create_player(SIM_PLAYER_NAME)
+    return PokerGame(db, player_id, config, history=history, stats=stats, events=events, rng=rng)
+
+
+def start_hand(game: PokerGame) -> None:
+    """Tops up busted seats and deals the next hand."""
+    for p in game.players:
+        if p.balance <= 0:
+            p.balance = REBUY_STACK
+    game.start_new_hand()
+
+
+def hand_over(game: PokerGame) -> bool:
+    return game.stage == SHOWDOWN or game.winner is not None
+
+
+def bot_action(game: PokerGame) -> None:
+    """Plays the active seat's move with get_bot_move."""
+    p = game.players[game.active_player_index]
+    action, amount = get_bot_move(game, p, game.rng)
+    if game.process_action(action, amount) not in ("OK", "Hand Over"):
+        # e.g. a raise over the table limit; calling is always legal
+        game.process_action("call")
+
+
+def play_hand(game: PokerGame) -> int:
+    """Plays one full hand with every seat using get_bot_move. Returns the action count."""
+    start_hand(game)
+    actions = 0
+    while not hand_over(game):
+        bot_action(game)
+        actions += 1
+        if actions > MAX_ACTIONS_PER_HAND:
+            raise RuntimeError(f"Hand did not finish after {MAX_ACTIONS_PER_HAND} actions.")
+    return actions
+
+
+def simulate(hands: int, bots: int = 3, small_blind: int = 10, db=None,
+             seed: Optional[int] = None,
+             history: Optional[HandHistoryStore] = None,
+             events: Optional[EventLog] = None) -> SimulationResult:
+    """
+    Plays 'hands' hands on one table in this process. 'seed' fixes the
+    table's own RNG; the random module is left alone.
+    """
+    game = build_game(bots, small_blind, db, history, events=events, rng=random.Random(seed))
+
+    start = time.perf_counter()
+    actions = 0
+    for _ in range(hands):
+        actions += play_hand(game)
+    if history is not None:
+        history.flush()
+    return SimulationResult(hands, actions, time.perf_counter() - start)
+
+
+def _simulation_shard(args: Tuple[int, int, int, int]) -> SimulationResult:
+    hands, bots, small_blind, seed = args
+    return simulate(hands, bots, small_blind, seed=seed)
+
+
+def simulate_parallel(hands: int, bots: int = 3, small_blind: int = 10,
+                      workers: Optional[int] = None, seed: int = 0,
+                      chunk_size: int = 10000) -> SimulationResult:
+    """Shards a bot-only simulation across processes (one table per shard)."""
+    budgets = split_budget(hands, chunk_size)
+    shards = [
+        (budget, bots, small_blind, shard_seed)
+        for budget, shard_seed in zip(budgets, shard_seeds(seed, len(budgets)))
+    ]
+    result = SimulationResult()
+    for part in run_sharded(_simulation_shard, shards, workers):
+        result = result.merge(part)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run headless bot-vs-bot poker hands.")
+    parser.add_argument("--hands", type=int, default=10000)
+    parser.add_argument("--bots", type=int, default=3)
+    parser.add_argument("--small-blind", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--db", default=None,
+                        help="SQLite file (or :memory:) for a database-backed seat")
+    parser.add_argument("--snapshot", default=None, metavar="PATH",
+                        help="copy the database to PATH when done (e.g. with --db :memory:)")
+    parser.add_argument("--db-profile", choices=sorted(PROFILES), default="default")
+    parser.add_argument("--history", action="store_true",
+                        help="record every hand in the database's hand history")
+    parser.add_argument("--write-behind", action="store_true",
+                        help="queue database writes on a background thread")
+    parser.add_argument("--events", default=None, metavar="PATH",
+                        help="write an event log of every hand to PATH (see src.replay)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"processes for bot-only tables (this machine: {default_workers()})")
+    args = parser.parse_args(argv)
+    if args.workers > 1:
+        single = [flag for flag, value in (
+            ("--db", args.db), ("--snapshot", args.snapshot), ("--history", args.history),
+            ("--write-behind", args.write_behind), ("--events", args.events),
+        ) if value]
+        if single:
+            parser.error(f"--workers runs bot-only tables; it cannot be combined with {', '.join(single)}")
+
+    start = time.perf_counter()
+    if args.workers > 1:
+        result = simulate_parallel(args.hands, args.bots, args.small_blind,
+                                   workers=args.workers, seed=args.seed or 0)
+    else:
+        manager = DatabaseManager(args.db, profile=args.db_profile) if args.db else None
+        history = HandHistoryStore(manager) if manager and args.history else None
+        db = WriteBehindDatabase(manager) if manager and args.write_behind else manager
+        events = EventLog(args.seed) if args.events else None
+        result = simulate(args.hands, args.bots, args.small_blind, db=db, seed=args.seed,
+                          history=history, events=events)
+        if events is not None:
+            events.save(args.events)
+        if db:
+            if args.write_behind:
+                db.flush()
+            if args.snapshot:
+                manager.snapshot(args.snapshot)
+            db.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"Played {result.hands} hands ({result.actions} actions) in {elapsed:.2f}s")
+    print(f"{result.hands / elapsed:.0f} hands/s")
+
+
+if __name__ == "__main__":
+    main()
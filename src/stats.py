@@ -0,0 +1,195 @@
+"""
+Per-player poker statistics kept as running totals.
+
+Every finished hand (a HandRecord) adds to a handful of counters per seat;
+VPIP, PFR, aggression factor, showdown win rate and bb/100 are ratios of
+those counters, so reading them is O(1) and nothing is recomputed from
+the hand history. Totals of real players persist in 'player_stats'.
+"""
+
+import atexit
+import itertools
+import threading
+from dataclasses import dataclass, astuple, fields
+from typing import Collection, Dict, List, Optional, Set
+
+from .database import DatabaseManager
+from .hand_history import ACTION_INDEX, HandRecord
+from .write_behind import BatchWriter
+
+_FOLD = ACTION_INDEX["fold"]
+_CALL = ACTION_INDEX["call"]
+_AGGRESSIVE = {ACTION_INDEX["bet"], ACTION_INDEX["raise"]}
+_BLINDS = {ACTION_INDEX["small_blind"], ACTION_INDEX["big_blind"]}
+
+@dataclass
+class PlayerStats:
+    hands: int = 0
+    vpip_hands: int = 0  # put money in preflop by choice
+    pfr_hands: int = 0  # bet or raised preflop
+    postflop_aggressive: int = 0  # bets and raises after the flop
+    postflop_calls: int = 0
+    showdowns: int = 0
+    showdown_wins: int = 0
+    net_big_blinds: float = 0.0
+
+    @property
+    def vpip(self) -> float:
+        return self.vpip_hands / self.hands if self.hands else 0.0
+
+    @property
+    def pfr(self) -> float:
+        return self.pfr_hands / self.hands if self.hands else 0.0
+
+    @property
+    def aggression_factor(self) -> float:
+        """(bets + raises) / calls after the flop; bets + raises when there are no calls."""
+        if not self.postflop_calls:
+            return float(self.postflop_aggressive)
+        return self.postflop_aggressive / self.postflop_calls
+
+    @property
+    def showdown_win_rate(self) -> float:
+        return self.showdown_wins / self.showdowns if self.showdowns else 0.0
+
+    @property
+    def bb_per_100(self) -> float:
+        return self.net_big_blinds * 100 / self.hands if self.hands else 0.0
+
+_COLUMNS = [f.name for f in fields(PlayerStats)]
+_UPSERT = (
+    f"INSERT OR REPLACE INTO player_stats (player_id, {', '.join(_COLUMNS)}) "
+    f"VALUES (?, {', '.join('?' for _ in _COLUMNS)})"
+)
+
+class StatsEngine:
+    """
+    Running PlayerStats per player id, fed by PokerGame after every hand.
+
+    With a database, totals of the ids passed as 'persist' are loaded on
+    first use, and every 'batch_size' hands the changed ones are queued
+    for a BatchWriter that writes them back. flush() waits for them.
+    """
+    def __init__(self, db: Optional[DatabaseManager] = None, batch_size: int = 64,
+                 max_pending: int = 8) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive.")
+        self.db = db
+        self.batch_size = batch_size
+        self._stats: Dict[int, PlayerStats] = {}
+        self._dirty: Set[int] = set()
+        self._pending_hands = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._writer: Optional[BatchWriter[List[tuple]]] = None
+        if db is not None:
+            self._writer = BatchWriter(self._write, "Stats writer", max_pending)
+            atexit.register(self.close)
+
+    def get(self, player_id: int) -> PlayerStats:
+        stats = self._stats.get(player_id)
+        if stats is None:
+            stats = self._load(player_id)
+        return stats
+
+    def _load(self, player_id: int) -> PlayerStats:
+        stats = PlayerStats()
+        if self.db is not None:
+            with self.db._get_connection() as conn:
+                row = conn.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM player_stats WHERE player_id = ?", (player_id,)
+                ).fetchone()
+            if row:
+                stats = PlayerStats(*row)
+        with self._lock:
+            return self._stats.setdefault(player_id, stats)
+
+    def record_hand(self, record: HandRecord, big_blind: int, persist: Collection[int] = ()) -> None:
+        """Adds one finished hand to every dealt-in seat's totals."""
+        dealt = [seat for seat, cards in enumerate(record.hole_cards) if cards]
+        put_in = [0] * len(record.seats)
+        voluntary: Set[int] = set()
+        raised: Set[int] = set()
+        folded: Set[int] = set()
+        aggressive = [0] * len(record.seats)
+        calls = [0] * len(record.seats)
+
+        for seat, stage, action, amount in record.actions:
+            put_in[seat] += amount
+            if action == _FOLD:
+                folded.add(seat)
+            elif stage == 0:
+                # the engine records a "call" with nothing owed (the big blind's option): not voluntary
+                if action in _AGGRESSIVE or (action == _CALL and amount > 0):
+                    voluntary.add(seat)
+                if action in _AGGRESSIVE:
+                    raised.add(seat)
+            elif action in _AGGRESSIVE:
+                aggressive[seat] += 1
+            elif action == _CALL and amount > 0:
+                calls[seat] += 1
+
+        showdown = [seat for seat in dealt if seat not in folded]
+        went_to_showdown = len(showdown) > 1
+        share = record.pot // len(record.winners) if record.winners else 0
+
+        for seat in dealt:
+            stats = self.get(record.seats[seat])
+            with self._lock:
+                stats.hands += 1
+                stats.vpip_hands += seat in voluntary
+                stats.pfr_hands += seat in raised
+                stats.postflop_aggressive += aggressive[seat]
+                stats.postflop_calls += calls[seat]
+                if went_to_showdown and seat in showdown:
+                    stats.showdowns += 1
+                    stats.showdown_wins += seat in record.winners
+                won = share if seat in record.winners else 0
+                stats.net_big_blinds += (won - put_in[seat]) / big_blind
+
+        if self._writer is None or not persist:
+            return
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Stats engine is closed.")
+            self._dirty.update(persist)
+            self._pending_hands += 1
+            if self._pending_hands >= self.batch_size:
+                # queued under the lock, so close() cannot stop the writer in between
+                self._writer.put(self._take_rows())
+
+    def flush(self) -> None:
+        """Blocks until the totals of every persisted player changed so far are written."""
+        if self._writer is None:
+            return
+        with self._lock:
+            rows = self._take_rows()
+            if rows and not self._closed:
+                self._writer.put(rows)
+        self._writer.flush()
+
+    def close(self) -> None:
+        """Writes the changed totals and stops the writer."""
+        if self._writer is None:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            rows = self._take_rows()
+            if rows:
+                self._writer.put(rows)
+        atexit.unregister(self.close)
+        self._writer.close()
+
+    def _take_rows(self) -> List[tuple]:
+        """Rows of the changed totals, as they are now. Call with the lock held."""
+        rows = [(pid,) + astuple(self._stats[pid]) for pid in self._dirty if pid in self._stats]
+        self._dirty.clear()
+        self._pending_hands = 0
+        return rows
+
+    def _write(self, batches: List[List[tuple]]) -> None:
+        # in queue order, so the newest totals of a player are written last
+        with self.db._get_connection() as conn:
+            conn.executemany(_UPSERT, itertools.chain.from_iterable(batches))
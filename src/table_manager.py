@@ -0,0 +1,230 @@
+"""
+Many PokerGame tables in one process.
+
+A cooperative scheduler keeps a heap of tables ordered by when their next
+action is due. Each step advances one table by one action (a bot move or
+dealing the next hand) and puts it back with its delay, so hundreds of
+tables interleave fairly on one thread. Seats played by people wait for
+submit_action() and are not scheduled meanwhile.
+
+All tables share one storage; a DatabaseManager is wrapped in a
+WriteBehindDatabase so settlements of every table are batched together.
+Bots get negative ids unique to their table, so the shared hand history
+and stats never mix bots of different tables or bots with accounts.
+
+    python -m src.table_manager --tables 200 --hands 20000
+"""
+
+import argparse
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from .database import DatabaseManager
+from .game_engine import PokerGame
+from .hand_history import HandHistoryStore
+from .simulation import MAX_ACTIONS_PER_HAND, SimulationResult, bot_action, hand_over, start_hand
+from .stats import StatsEngine
+from .write_behind import WriteBehindDatabase
+
+# bot ids of table t are -t * BOT_ID_STRIDE onwards
+BOT_ID_STRIDE = 100
+
+@dataclass
+class Table:
+    table_id: int
+    game: PokerGame
+    # ids of seats that wait for submit_action instead of the bot policy
+    human_ids: Set[int] = field(default_factory=set)
+    delay: float = 0.0
+    hands: int = 0
+    actions: int = 0
+    hand_actions: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    in_hand: bool = False
+    waiting: bool = False
+    closed: bool = False
+
+    @property
+    def active_player(self):
+        return self.game.players[self.game.active_player_index]
+
+    def metrics(self, now: Optional[float] = None) -> SimulationResult:
+        return SimulationResult(self.hands, self.actions, (now or time.perf_counter()) - self.started_at)
+
+class TableManager:
+    """
+    Hosts tables and drives them with one scheduler.
+
+    'delay' per table is the pause before each bot action (0 for
+    simulations, e.g. 0.5s to pace tables that people watch).
+    """
+    def __init__(self, db=None, history: Optional[HandHistoryStore] = None,
+                 stats: Optional[StatsEngine] = None, write_behind: bool = True) -> None:
+        if isinstance(db, DatabaseManager) and write_behind:
+            db = WriteBehindDatabase(db)
+        self.db = db
+        self.history = history
+        self.stats = stats
+        self.tables: Dict[int, Table] = {}
+        self._ready: List[Tuple[float, int, int]] = []  # (due, tie-breaker, table id)
+        self._ids = itertools.count(1)
+        self._order = itertools.count()
+        self._hands = 0
+        self._actions = 0
+        self.started_at = time.perf_counter()
+
+    # --- tables ---
+
+    def add_table(self, bots: int = 3, small_blind: int = 10, human_ids: Tuple[int, ...] = (),
+                  delay: float = 0.0, raise_limit: int = 0) -> int:
+        """
+        Opens a table with 'bots' bots and the given database players
+        (at most two: PVE with one, PVP with two). Returns its id.
+        """
+        if len(human_ids) > 2:
+            raise ValueError("A table seats at most two database players.")
+        if bots >= BOT_ID_STRIDE:
+            raise ValueError(f"A table seats fewer than {BOT_ID_STRIDE} bots.")
+        table_id = next(self._ids)
+        config = {'mode': 'PVE', 'bot_count': bots, 'small_blind': small_blind, 'raise_limit': raise_limit,
+                  'first_bot_id': -table_id * BOT_ID_STRIDE}
+        if len(human_ids) == 2:
+            config.update(mode='PVP', p2_id=human_ids[1])
+        game = PokerGame(self.db, human_ids[0] if human_ids else None, config,
+                         history=self.history, stats=self.stats)
+
+        table = Table(table_id, game, set(human_ids), delay)
+        self.tables[table.table_id] = table
+        self._schedule(table, time.perf_counter())
+        return table.table_id
+
+    def remove_table(self, table_id: int) -> None:
+        table = self.tables.pop(table_id)
+        table.closed = True
+
+    def submit_action(self, table_id: int, action: str, amount: int = 0) -> str:
+        """Plays a move for the person whose turn it is. Returns the engine's answer."""
+        table = self.tables[table_id]
+        if not table.waiting:
+            raise ValueError(f"Table {table_id} is not waiting for a player.")
+        result = table.game.process_action(action, amount)
+        if result in ("OK", "Hand Over"):
+            self._count_action(table)
+            table.waiting = False
+            self._schedule(table, time.perf_counter())
+        return result
+
+    # --- scheduler ---
+
+    def _schedule(self, table: Table, due: float) -> None:
+        heapq.heappush(self._ready, (due, next(self._order), table.table_id))
+
+    def step(self, now: Optional[float] = None) -> bool:
+        """Advances the first due table by one action. False if none is due."""
+        now = time.perf_counter() if now is None else now
+        while self._ready and self._ready[0][0] <= now:
+            _, _, table_id = heapq.heappop(self._ready)
+            table = self.tables.get(table_id)
+            if table is None or table.closed or table.waiting:
+                continue
+            self._advance(table)
+            if not (table.closed or table.waiting):
+                self._schedule(table, now + table.delay)
+            return True
+        return False
+
+    def _advance(self, table: Table) -> None:
+        game = table.game
+        if table.in_hand and hand_over(game):
+            table.hands += 1
+            self._hands += 1
+            table.in_hand = False
+
+        if not table.in_hand:
+            if not table.human_ids:
+                start_hand(game)
+            elif game.start_new_hand() == "GAME_OVER":  # people are not topped up
+                table.closed = True
+                return
+            table.in_hand = True
+            table.hand_actions = 0
+            return
+
+        player = table.active_player
+        if player.id in table.human_ids and not player.is_bot:
+            table.waiting = True
+        else:
+            bot_action(game)
+            self._count_action(table)
+
+    def _count_action(self, table: Table) -> None:
+        table.actions += 1
+        table.hand_actions += 1
+        self._actions += 1
+        if table.hand_actions > MAX_ACTIONS_PER_HAND:
+            raise RuntimeError(f"Table {table.table_id}: hand did not finish after {MAX_ACTIONS_PER_HAND} actions.")
+
+    def run(self, hands: Optional[int] = None, duration: Optional[float] = None) -> SimulationResult:
+        """
+        Steps tables until 'hands' hands are finished in total, 'duration'
+        seconds have passed, or nothing can run without a person.
+        """
+        start = time.perf_counter()
+        deadline = start + duration if duration is not None else None
+        while self._ready:
+            if hands is not None and self.total_hands() >= hands:
+                break
+            now = time.perf_counter()
+            if deadline is not None and now >= deadline:
+                break
+            if not self.step(now) and self._ready:
+                wait = self._ready[0][0] - now
+                if deadline is not None:
+                    wait = min(wait, deadline - now)
+                time.sleep(max(0.0, wait))
+        return self.metrics()
+
+    # --- metrics ---
+
+    def total_hands(self) -> int:
+        """Hands finished on every table so far, removed tables included."""
+        return self._hands
+
+    def table_metrics(self, table_id: int) -> SimulationResult:
+        return self.tables[table_id].metrics()
+
+    def metrics(self) -> SimulationResult:
+        """All tables together over the manager's wall-clock lifetime."""
+        return SimulationResult(self._hands, self._actions, time.perf_counter() - self.started_at)
+
+    def close(self) -> None:
+        if self.history is not None:
+            self.history.flush()
+        if self.stats is not None:
+            self.stats.flush()
+        if self.db is not None:
+            self.db.close()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run many bot tables on one scheduler.")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--bots", type=int, default=4)
+    parser.add_argument("--hands", type=int, default=10000, help="total over all tables")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds before each bot action")
+    args = parser.parse_args(argv)
+
+    manager = TableManager()
+    for _ in range(args.tables):
+        manager.add_table(bots=args.bots, delay=args.delay)
+    result = manager.run(hands=args.hands)
+
+    per_table = [manager.table_metrics(t).hands_per_second for t in manager.tables]
+    print(f"{args.tables} tables: {result.hands} hands ({result.actions} actions) in {result.seconds:.2f}s")
+    print(f"aggregate {result.hands_per_second:.0f} hands/s, "
+          f"per table {min(per_table):.1f}-{max(per_table):.1f} hands/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Streaming bulk export and import of database tables.
+
+Formats:
+    csv     header row, BLOBs base64, NULL as an empty field
+    ndjson  one JSON object per line, BLOBs base64
+    bin     compact tagged binary rows, varint integers (see _write_bin)
+
+Rows are streamed in chunks on both sides, so memory does not grow with
+the table size. Any table in the database can be moved (players,
+game_history, hands, hand_players, ...).
+
+    python -m src.transfer export players players.csv --db poker_game.db
+    python -m src.transfer import players players.csv --db other.db
+"""
+
+import argparse
+import base64
+import csv
+import itertools
+import json
+import os
+import struct
+import time
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .database import DatabaseManager
+
+FORMATS = ("csv", "ndjson", "bin")
+CHUNK_SIZE = 1000
+CONFLICT_MODES = ("abort", "ignore", "replace")
+
+_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".bin": "bin"}
+
+# binary format: header, then one tagged value per column for every row;
+# integers and lengths are zigzag/unsigned LEB128 varints
+_BIN_MAGIC = b"PKBX"
+_BIN_VERSION = 1
+_BIN_HEADER = struct.Struct("<4sHI")  # magic, version, JSON header length
+_FLOAT = struct.Struct("<d")
+_NULL, _INTEGER, _REAL, _TEXT, _BYTES = range(5)
+
+@dataclass(frozen=True)
+class TransferStats:
+    table: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+def format_for_path(path: str) -> str:
+    fmt = _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Cannot tell the format of {path}; pass one of {', '.join(FORMATS)}.")
+    return fmt
+
+def table_columns(db: DatabaseManager, table: str) -> Dict[str, str]:
+    """Column name -> declared type of an existing table, in table order."""
+    with db._get_connection() as conn:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ? AND name NOT LIKE 'sqlite_%'",
+            (table,)
+        ).fetchone()
+        if not exists:
+            raise ValueError(f"Unknown table: {table}")
+        return {row[1]: row[2].upper() for row in conn.execute(f'PRAGMA table_info("{table}")')}
+
+# --- export ---
+
+def export_table(db: DatabaseManager, table: str, fp, fmt: str, chunk_size: int = CHUNK_SIZE) -> TransferStats:
+    """
+    Streams every row of 'table' to 'fp' (text mode for csv/ndjson,
+    binary for bin) and returns the row count and time taken.
+    """
+    columns = list(table_columns(db, table))
+    start = time.perf_counter()
+    with db._get_connection() as conn:
+        cursor = conn.execute(f'SELECT {", ".join(_quote(c) for c in columns)} FROM "{table}"')
+        rows = itertools.chain.from_iterable(iter(lambda: cursor.fetchmany(chunk_size), []))
+        count = _WRITERS[_check_format(fmt)](fp, table, columns, rows)
+    return TransferStats(table, count, time.perf_counter() - start)
+
+def _write_csv(fp, table: str, columns: List[str], rows: Iterable[Sequence[Any]]) -> int:
+    writer = csv.writer(fp)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(["" if v is None else _text(v) for v in row])
+        count += 1
+    return count
+
+def _write_ndjson(fp, table: str, columns: List[str], rows: Iterable[Sequence[Any]]) -> int:
+    count = 0
+    for row in rows:
+        fp.write(json.dumps(dict(zip(columns, (_text(v) if isinstance(v, bytes) else v for v in row)))))
+        fp.write("\n")
+        count += 1
+    return count
+
+def _write_bin(fp: BinaryIO, table: str, columns: List[str], rows: Iterable[Sequence[Any]]) -> int:
+    header = json.dumps({"table": table, "columns": columns}).encode()
+    fp.write(_BIN_HEADER.pack(_BIN_MAGIC, _BIN_VERSION, len(header)))
+    fp.write(header)
+    count = 0
+    out = bytearray()
+    for row in rows:
+        for value in row:
+            if value is None:
+                out.append(_NULL)
+            elif isinstance(value, int):
+                out.append(_INTEGER)
+                _put_varint(out, value << 1 if value >= 0 else (~value << 1) | 1)
+            elif isinstance(value, float):
+                out.append(_REAL)
+                out += _FLOAT.pack(value)
+            else:
+                tag, data = (_BYTES, value) if isinstance(value, bytes) else (_TEXT, value.encode())
+                out.append(tag)
+                _put_varint(out, len(data))
+                out += data
+        count += 1
+        if len(out) >= 1 << 16:
+            fp.write(out)
+            out.clear()
+    fp.write(out)
+    return count
+
+_WRITERS = {"csv": _write_csv, "ndjson": _write_ndjson, "bin": _write_bin}
+
+# --- import ---
+
+def read_rows(fp, fmt: str) -> Tuple[List[str], Iterator[List[Any]]]:
+    """Column names and a lazy row iterator for a file written by export_table."""
+    return _READERS[_check_format(fmt)](fp)
+
+def _read_csv(fp) -> Tuple[List[str], Iterator[List[Any]]]:
+    reader = csv.reader(fp)
+    columns = next(reader, None)
+    if columns is None:
+        raise ValueError("Empty CSV file.")
+    return columns, (list(row) for row in reader)
+
+def _read_ndjson(fp) -> Tuple[List[str], Iterator[List[Any]]]:
+    lines = (line for line in fp if line.strip())
+    first = next(lines, None)
+    if first is None:
+        return [], iter(())
+    columns = list(json.loads(first))
+
+    def rows() -> Iterator[List[Any]]:
+        for line in itertools.chain([first], lines):
+            obj = json.loads(line)
+            yield [obj.get(c) for c in columns]
+    return columns, rows()
+
+def _read_bin(fp: BinaryIO) -> Tuple[List[str], Iterator[List[Any]]]:
+    magic, version, length = _BIN_HEADER.unpack(_read_exact(fp, _BIN_HEADER.size))
+    if magic != _BIN_MAGIC or version != _BIN_VERSION:
+        raise ValueError("Not a table export (or an unsupported version).")
+    columns = json.loads(_read_exact(fp, length))["columns"]
+
+    def rows() -> Iterator[List[Any]]:
+        while True:
+            first = fp.read(1)
+            if not first:
+                return
+            row = []
+            for i in range(len(columns)):
+                tag = first[0] if i == 0 else _read_exact(fp, 1)[0]
+                if tag == _NULL:
+                    row.append(None)
+                elif tag == _INTEGER:
+                    n = _get_varint(fp)
+                    row.append(~(n >> 1) if n & 1 else n >> 1)
+                elif tag == _REAL:
+                    row.append(_FLOAT.unpack(_read_exact(fp, 8))[0])
+                else:
+                    data = _read_exact(fp, _get_varint(fp))
+                    row.append(data if tag == _BYTES else data.decode())
+            yield row
+    return columns, rows()
+
+_READERS = {"csv": _read_csv, "ndjson": _read_ndjson, "bin": _read_bin}
+
+def import_table(db: DatabaseManager, table: str, fp, fmt: str, on_conflict: str = "abort",
+                 chunk_size: int = CHUNK_SIZE) -> TransferStats:
+    """
+    Streams rows from 'fp' into 'table' with chunked executemany in one
+    transaction: a bad row leaves the table untouched. 'on_conflict'
+    (abort, ignore, replace) decides what happens to duplicate keys.
+    """
+    if on_conflict not in CONFLICT_MODES:
+        raise ValueError(f"on_conflict must be one of {', '.join(CONFLICT_MODES)}.")
+    types = table_columns(db, table)
+    columns, rows = read_rows(fp, fmt)
+    unknown = [c for c in columns if c not in types]
+    if unknown:
+        raise ValueError(f"Columns not in {table}: {', '.join(unknown)}")
+    if not columns:
+        return TransferStats(table, 0, 0.0)
+
+    if fmt != "bin":
+        converters = [_converter(types[c], csv_input=fmt == "csv") for c in columns]
+        rows = ([conv(v) for conv, v in zip(converters, row)] for row in rows)
+
+    verb = "INSERT" if on_conflict == "abort" else f"INSERT OR {on_conflict.upper()}"
+    query = (f'{verb} INTO "{table}" ({", ".join(_quote(c) for c in columns)}) '
+             f'VALUES ({", ".join("?" for _ in columns)})')
+    count = 0
+    start = time.perf_counter()
+    with db._get_connection() as conn:
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            conn.executemany(query, chunk)
+            count += len(chunk)
+    return TransferStats(table, count, time.perf_counter() - start)
+
+def _converter(declared: str, csv_input: bool):
+    """Turns a csv/ndjson field back into the value the column stores."""
+    def convert(value):
+        if value is None or (csv_input and value == "" and "CHAR" not in declared and "TEXT" not in declared):
+            return None
+        if "BLOB" in declared:
+            return base64.b64decode(value)
+        if csv_input and "INT" in declared:
+            return int(value)
+        if csv_input and any(t in declared for t in ("REAL", "FLOA", "DOUB")):
+            return float(value)
+        return value
+    return convert
+
+# --- helpers ---
+
+def _text(value: Any) -> Any:
+    return base64.b64encode(value).decode() if isinstance(value, bytes) else value
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def _check_format(fmt: str) -> str:
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt}; expected one of {', '.join(FORMATS)}.")
+    return fmt
+
+def _put_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def _get_varint(fp) -> int:
+    n = shift = 0
+    while True:
+        byte = _read_exact(fp, 1)[0]
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n
+        shift += 7
+
+def _read_exact(fp, size: int) -> bytes:
+    data = fp.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated table export.")
+    return data
+
+def _open(path: str, fmt: str, mode: str):
+    if fmt == "bin":
+        return open(path, mode + "b")
+    return open(path, mode, newline="" if fmt == "csv" else None, encoding="utf-8")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk export/import of poker database tables.")
+    parser.add_argument("direction", choices=("export", "import"))
+    parser.add_argument("table")
+    parser.add_argument("path")
+    parser.add_argument("--db", default="poker_game.db")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="default: from the file extension")
+    parser.add_argument("--on-conflict", choices=CONFLICT_MODES, default="abort")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or format_for_path(args.path)
+    db = DatabaseManager(args.db)
+    try:
+        if args.direction == "export":
+            with _open(args.path, fmt, "w") as fp:
+                stats = export_table(db, args.table, fp, fmt)
+        else:
+            with _open(args.path, fmt, "r") as fp:
+                stats = import_table(db, args.table, fp, fmt, on_conflict=args.on_conflict)
+    finally:
+        db.close()
+    print(f"{args.direction}ed {stats.rows} rows of {stats.table} in {stats.seconds:.2f}s "
+          f"({stats.rows_per_second:.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
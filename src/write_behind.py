@@ -0,0 +1,238 @@
+"""
+Write-behind layer in front of DatabaseManager.
+
+Balance and stats writes are queued and committed by a background thread,
+so game flow never waits on the disk. The writer drains the queue in
+batches (on size, on a time trigger or on an explicit flush), adds up the
+balance changes per player and commits each batch in one transaction.
+
+Reads flush the queue first, so a caller always sees its own writes.
+
+The queue and thread are a BatchWriter, which the hand history and stats
+stores also use for their batches.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from .database import DatabaseManager, SettlementEntry
+
+T = TypeVar("T")
+
+# queued operations
+_DELTA = "delta"
+_SET = "set"
+_SETTLE = "settle"
+
+# BatchWriter queue entries; the markers end the current batch early
+_ITEM = "item"
+_FLUSH = "flush"
+_STOP = "stop"
+
+class BatchWriter(Generic[T]):
+    """
+    A bounded queue drained by one writer thread, which passes the items
+    to write(items) in batches of up to 'batch_size', waiting at most
+    'flush_interval' seconds for a batch to fill.
+
+    put() blocks only when 'max_pending' entries are already waiting. A
+    failed write is raised by the next put, flush or close; after close()
+    put raises RuntimeError.
+    """
+    def __init__(self, write: Callable[[List[T]], None], name: str, max_pending: int = 1024,
+                 batch_size: int = 1, flush_interval: float = 0.0) -> None:
+        if max_pending < 1 or batch_size < 1:
+            raise ValueError("max_pending and batch_size must be positive.")
+        self.write = write
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=max_pending)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        # held while queueing, so nothing can land behind the stop marker
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, item: T) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed.")
+            self._queue.put((_ITEM, item))
+        self._raise_error()
+
+    def flush(self) -> None:
+        """
+        Blocks until every item put before the call is written (not the
+        ones other threads put meanwhile).
+        """
+        done = None
+        with self._lock:
+            if not self._closed:
+                done = threading.Event()
+                self._queue.put((_FLUSH, done))
+        if done is not None:
+            done.wait()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Writes everything still queued and stops the thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put((_STOP, None))
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1][0] == _ITEM:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1][0] == _STOP
+            try:
+                items = [item for kind, item in batch if kind == _ITEM]
+                if items:
+                    self.write(items)
+            except Exception as e:  # kept for the caller's thread
+                self._error = e
+            finally:
+                for kind, done in batch:
+                    if kind == _FLUSH:
+                        done.set()
+
+class WriteBehindDatabase:
+    """
+    Wraps a DatabaseManager with a bounded queue and one writer thread.
+
+    Writes block only when 'max_pending' operations are already waiting
+    (back-pressure). close() (also run at interpreter exit) commits
+    everything still queued before closing the database.
+    """
+    def __init__(self, db: DatabaseManager, max_pending: int = 1024,
+                 batch_size: int = 256, flush_interval: float = 0.05) -> None:
+        self.db = db
+        self._writer: BatchWriter[Tuple[Any, ...]] = BatchWriter(
+            self._commit, "Write-behind queue", max_pending, batch_size, flush_interval
+        )
+        self._closed = False
+        atexit.register(self.close)
+
+    def __enter__(self) -> 'WriteBehindDatabase':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # --- writes (queued) ---
+
+    def update_balance(self, player_id: int, amount: int) -> None:
+        self._put((_DELTA, player_id, amount))
+
+    def set_balance(self, player_id: int, balance: int) -> None:
+        self._put((_SET, player_id, balance))
+
+    def record_hand_stats(self, player_id: int, won: bool, pot_size: int, hand_score: int, actions: dict) -> None:
+        self._put((_SETTLE, [SettlementEntry(
+            player_id, 0, actions=dict(actions), won=won, pot_won=pot_size, hand_score=hand_score
+        )]))
+
+    def settle_hand(self, entries: List[SettlementEntry]) -> None:
+        # copy the action counts: the engine keeps mutating its dicts
+        self._put((_SETTLE, [
+            SettlementEntry(e.player_id, e.balance_delta,
+                            None if e.actions is None else dict(e.actions),
+                            e.won, e.pot_won, e.hand_score)
+            for e in entries
+        ]))
+
+    # --- reads and direct access (flush first) ---
+
+    def get_or_create_player(self, username: str) -> Tuple[int, int]:
+        self.flush()
+        return self.db.get_or_create_player(username)
+
+    def get_player(self, player_id: int) -> Optional[Tuple[str, int]]:
+        self.flush()
+        return self.db.get_player(player_id)
+
+    def get_leaderboard(self, limit: int = 10) -> List[Tuple[Any, ...]]:
+        self.flush()
+        return self.db.get_leaderboard(limit)
+
+    def delete_player(self, player_id: int) -> None:
+        self.flush()
+        self.db.delete_player(player_id)
+
+    def _get_connection(self):
+        self.flush()
+        return self.db._get_connection()
+
+    # --- lifecycle ---
+
+    def flush(self) -> None:
+        """Blocks until every write queued before the call is committed. Re-raises a writer error."""
+        self._writer.flush()
+
+    def close(self) -> None:
+        """Commits the remaining writes, stops the writer and closes the database."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        try:
+            self._writer.close()
+        finally:
+            self.db.close()
+
+    def _put(self, op: Tuple[Any, ...]) -> None:
+        self._writer.put(op)
+
+    # --- writer thread ---
+
+    def _commit(self, batch: List[Tuple[Any, ...]]) -> None:
+        """Coalesces a batch per player and writes it in one transaction."""
+        deltas: Dict[int, int] = {}
+        absolute: Dict[int, int] = {}
+        stats: List[SettlementEntry] = []
+        for op in batch:
+            kind = op[0]
+            if kind == _DELTA:
+                deltas[op[1]] = deltas.get(op[1], 0) + op[2]
+            elif kind == _SET:
+                # an absolute balance replaces every earlier change
+                absolute[op[1]] = op[2]
+                deltas.pop(op[1], None)
+            elif kind == _SETTLE:
+                for e in op[1]:
+                    deltas[e.player_id] = deltas.get(e.player_id, 0) + e.balance_delta
+                    if e.actions is not None:
+                        stats.append(SettlementEntry(
+                            e.player_id, 0, e.actions, e.won, e.pot_won, e.hand_score
+                        ))
+
+        if not (deltas or absolute or stats):
+            return
+        with self.db._get_connection():
+            for player_id, balance in absolute.items():
+                self.db.set_balance(player_id, balance + deltas.pop(player_id, 0))
+            self.db.settle_hand(stats + [SettlementEntry(pid, d) for pid, d in deltas.items()])
@@ -0,0 +1,80 @@
+"""
+Shared pytest setup: opt-in hot-path benchmarks.
+
+    pytest -m bench --bench --bench-json=bench.json
+    pytest -m bench --bench --bench-baseline=bench.json --bench-threshold=0.25
+"""
+import json
+import platform
+import timeit
+
+import pytest
+
+def pytest_addoption(parser):
+    group = parser.getgroup("bench", "hot-path benchmarks")
+    group.addoption("--bench", action="store_true", help="run the benchmarks (skipped otherwise)")
+    group.addoption("--bench-json", metavar="PATH", help="write benchmark results to PATH as JSON")
+    group.addoption("--bench-baseline", metavar="PATH",
+                    help="fail benchmarks that are slower than the results stored in PATH")
+    group.addoption("--bench-threshold", type=float, default=0.25,
+                    help="allowed slowdown against the baseline (0.25 = 25%%)")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "bench: hot-path timing, only runs with --bench")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--bench"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks need --bench")
+    for item in items:
+        if "bench" in item.keywords:
+            item.add_marker(skip)
+
+class BenchRecorder:
+    """Times callables, keeps the results and checks them against a baseline."""
+
+    def __init__(self, baseline: dict, threshold: float):
+        self.baseline = baseline
+        self.threshold = threshold
+        self.results = {}
+
+    def __call__(self, name: str, func, number: int = 1000, repeat: int = 7) -> float:
+        """Returns the best per-call time in microseconds over 'repeat' runs of 'number' calls."""
+        func()  # warm up lazy tables and caches
+        per_op = min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+        self.results[name] = {
+            "per_op_us": per_op,
+            "ops_per_sec": 1e6 / per_op,
+            "number": number,
+            "repeat": repeat,
+        }
+
+        base = self.baseline.get(name)
+        if base:
+            allowed = base["per_op_us"] * (1 + self.threshold)
+            assert per_op <= allowed, (
+                f"{name} regressed: {per_op:.2f}us/op vs baseline {base['per_op_us']:.2f}us/op "
+                f"(threshold {self.threshold:.0%})"
+            )
+        return per_op
+
+@pytest.fixture(scope="session")
+def bench(request):
+    config = request.config
+    baseline = {}
+    baseline_path = config.getoption("--bench-baseline")
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)["results"]
+
+    recorder = BenchRecorder(baseline, config.getoption("--bench-threshold"))
+    yield recorder
+
+    json_path = config.getoption("--bench-json")
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": recorder.results,
+            }, f, indent=2, sort_keys=True)
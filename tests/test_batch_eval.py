@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.game_logic import HandEvaluator
+from src.batch_eval import random_hands, score_batch
+
+@pytest.mark.parametrize("cards", [5, 6, 7])
+def test_batch_matches_scalar_scores(cards):
+    """Test that batch scores equal the per-hand scores row by row."""
+    hands = random_hands(20000, cards, seed=cards)
+    scores = score_batch(hands)
+
+    assert scores.shape == (20000,)
+    assert scores.tolist() == [HandEvaluator.score_codes(row) for row in hands.tolist()]
+
+def test_batch_flush_rows():
+    """Test rows where a flush or straight flush must be picked."""
+    rng = random.Random(1)
+    hands = []
+    for _ in range(2000):
+        suit = rng.randrange(4)
+        suited = [r * 4 + suit for r in rng.sample(range(13), 5)]
+        rest = rng.sample([c for c in range(52) if c not in suited], 2)
+        hands.append(suited + rest)
+    hands.append([12 * 4, 11 * 4, 10 * 4, 9 * 4, 8 * 4, 0, 1])  # royal flush in hearts
+
+    scores = score_batch(np.array(hands))
+
+    assert scores.tolist() == [HandEvaluator.score_codes(h) for h in hands]
+    assert HandEvaluator.category(int(scores[-1])) == HandEvaluator.ROYAL_FLUSH
+
+def test_batch_rejects_bad_shapes():
+    """Test that arrays that are not (N, 5..7) are refused."""
+    with pytest.raises(ValueError):
+        score_batch(np.zeros((3, 4), dtype=np.int64))
+    with pytest.raises(ValueError):
+        score_batch(np.zeros(7, dtype=np.int64))
+
+def test_random_hands_have_distinct_cards():
+    """Test that generated rows never repeat a card."""
+    hands = random_hands(1000, 7, seed=2)
+    assert all(len(set(row)) == 7 for row in hands.tolist())
@@ -0,0 +1,116 @@
+"""
+Hot-path benchmarks. Skipped unless pytest runs with --bench (see conftest.py).
+Every benchmark seeds its inputs so runs are comparable.
+"""
+import itertools
+import random
+
+import pytest
+from src.bot_logic import get_bot_move
+from src.database import DatabaseManager, PROFILES, SettlementEntry
+from src.event_log import EventLog, decode_events
+from src.game_logic import CARDS, Deck, HandEvaluator
+from src.game_state import SearchGame, restore, snapshot
+from src.hand_history import HandHistoryStore
+from src.replay import verify_hand
+from src.simulation import build_game, play_hand
+
+pytestmark = pytest.mark.bench
+
+@pytest.mark.parametrize("count", [5, 6, 7])
+def test_bench_evaluate(bench, count):
+    rng = random.Random(count)
+    hands = itertools.cycle([rng.sample(CARDS, count) for _ in range(1000)])
+    bench(f"evaluate_{count}_cards", lambda: HandEvaluator.evaluate(next(hands)), number=20000)
+
+def test_bench_score_codes(bench):
+    rng = random.Random(7)
+    hands = itertools.cycle([[c.code for c in rng.sample(CARDS, 7)] for _ in range(1000)])
+    bench("score_codes_7_cards", lambda: HandEvaluator.score_codes(next(hands)), number=20000)
+
+def test_bench_deck_shuffle_and_deal(bench):
+    random.seed(1)
+
+    def shuffle_and_deal():
+        deck = Deck()
+        deck.shuffle()
+        deck.deal(17)  # 6 players and a full board
+
+    bench("deck_shuffle_deal", shuffle_and_deal, number=5000)
+
+def test_bench_full_hand_with_bots(bench):
+    random.seed(2)
+    game = build_game(bots=4)
+    bench("poker_game_hand_4_bots", lambda: play_hand(game), number=500)
+
+def test_bench_full_hand_with_history(bench, tmp_path):
+    random.seed(2)
+    history = HandHistoryStore(DatabaseManager(str(tmp_path / "history.db"), profile="fast"))
+    game = build_game(bots=4, history=history)
+    bench("poker_game_hand_4_bots_history", lambda: play_hand(game), number=500)
+
+def test_bench_full_hand_with_event_log(bench):
+    random.seed(2)
+    game = build_game(bots=4, events=EventLog(seed=2))
+    bench("poker_game_hand_4_bots_events", lambda: play_hand(game), number=500)
+
+def test_bench_replay_hand(bench):
+    random.seed(3)
+    log = EventLog(seed=3)
+    game = build_game(bots=4, events=log)
+    for _ in range(500):
+        play_hand(game)
+    hands = itertools.cycle([decode_events(blob) for blob in log.hands])
+    bench("replay_verify_hand_4_bots", lambda: verify_hand(next(hands)), number=500)
+
+def test_bench_snapshot_restore(bench):
+    random.seed(5)
+    game = build_game(bots=4)
+    game.start_new_hand()
+    state = snapshot(game)
+    bench("game_state_snapshot_restore_4_bots", lambda: restore(game, snapshot(game)), number=20000)
+    assert snapshot(game) == state
+
+def test_bench_search_apply_undo(bench):
+    random.seed(5)
+    game = build_game(bots=4)
+    game.start_new_hand()
+    search = SearchGame(game)
+
+    def step():
+        search.apply("call")
+        search.undo()
+    bench("search_apply_undo_call", step, number=20000)
+
+def test_bench_bot_move_preflop(bench):
+    random.seed(3)
+    game = build_game(bots=4)
+    game.start_new_hand()
+    bot = game.players[game.active_player_index]
+    bench("get_bot_move_preflop", lambda: get_bot_move(game, bot), number=20000)
+
+def test_bench_bot_move_flop(bench):
+    random.seed(4)
+    game = build_game(bots=4)
+    game.start_new_hand()
+    game._advance_stage()
+    bot = game.players[game.active_player_index]
+    bench("get_bot_move_flop", lambda: get_bot_move(game, bot), number=20000)
+
+def test_bench_record_hand_stats(bench, tmp_path):
+    db = DatabaseManager(str(tmp_path / "bench.db"))
+    player_id, _ = db.get_or_create_player("bench")
+    actions = {'fold': 0, 'check': 1, 'bet': 1, 'raise': 1}
+    bench("record_hand_stats", lambda: db.record_hand_stats(player_id, True, 100, 5, actions), number=200)
+
+@pytest.mark.parametrize("profile", sorted(PROFILES))
+def test_bench_settle_hand(bench, tmp_path, profile):
+    db = DatabaseManager(str(tmp_path / "bench.db"), profile=profile)
+    winner, _ = db.get_or_create_player("winner")
+    loser, _ = db.get_or_create_player("loser")
+    actions = {'fold': 0, 'check': 1, 'bet': 1, 'raise': 1}
+    entries = [
+        SettlementEntry(winner, 100, actions=actions, won=True, pot_won=100, hand_score=5),
+        SettlementEntry(loser, -100),
+    ]
+    bench(f"settle_hand_{profile}", lambda: db.settle_hand(entries), number=200)
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from src.bot_logic import get_bot_move
+from src.game_logic import Card
 
 class MockCard:
     def __init__(self, value):
@@ -23,10 +24,10 @@ def setup_game():
     return game_state, bot_player
 
 def test_preflop_pocket_pair_facing_bet(setup_game):
-    """Score 1 (Pair) + Cost > 0 -> Call"""
+    """Strong preflop equity (Pair) + Cost > 0 -> Call"""
     game_state, bot = setup_game
     
-    bot.hand = [MockCard(10), MockCard(10)]
+    bot.hand = [Card('10', 'H'), Card('10', 'S')]
     game_state.current_bet = 20
     bot.current_bet = 0
     
@@ -36,10 +37,10 @@ def test_preflop_pocket_pair_facing_bet(setup_game):
     assert amount == 0
 
 def test_preflop_pocket_pair_no_cost_aggressive(setup_game):
-    """Score 1 (Pair) + Cost 0 + Random > 0.5 -> Raise"""
+    """Strong preflop equity (Pair) + Cost 0 + Random > 0.5 -> Raise"""
     game_state, bot = setup_game
     
-    bot.hand = [MockCard(10), MockCard(10)]
+    bot.hand = [Card('10', 'H'), Card('10', 'S')]
     game_state.current_bet = 20
     bot.current_bet = 20 
     
@@ -50,10 +51,10 @@ def test_preflop_pocket_pair_no_cost_aggressive(setup_game):
     assert amount == 40
 
 def test_preflop_pocket_pair_no_cost_passive(setup_game):
-    """Score 1 (Pair) + Cost 0 + Random <= 0.5 -> Check"""
+    """Strong preflop equity (Pair) + Cost 0 + Random <= 0.5 -> Check"""
     game_state, bot = setup_game
     
-    bot.hand = [MockCard(5), MockCard(5)]
+    bot.hand = [Card('J', 'D'), Card('J', 'C')]
     game_state.current_bet = 20
     bot.current_bet = 20
     
@@ -64,10 +65,10 @@ def test_preflop_pocket_pair_no_cost_passive(setup_game):
     assert amount == 0
 
 def test_preflop_high_card_cheap_call(setup_game):
-    """Score 0.5 (High Card) + Cost <= BB -> Call"""
+    """Playable preflop equity (High Card) + Cost <= BB -> Call"""
     game_state, bot = setup_game
 
-    bot.hand = [MockCard(14), MockCard(5)]
+    bot.hand = [Card('A', 'H'), Card('5', 'S')]
 
     game_state.current_bet = 20
     bot.current_bet = 0
@@ -78,10 +79,10 @@ def test_preflop_high_card_cheap_call(setup_game):
     assert action == "call"
 
 def test_preflop_high_card_expensive_fold(setup_game):
-    """Score 0.5 (High Card) + Cost > BB -> Fold"""
+    """Playable preflop equity (High Card) + Cost > BB -> Fold"""
     game_state, bot = setup_game
 
-    bot.hand = [MockCard(13), MockCard(2)]
+    bot.hand = [Card('K', 'H'), Card('9', 'S')]
 
     game_state.current_bet = 100
     bot.current_bet = 0
@@ -92,10 +93,10 @@ def test_preflop_high_card_expensive_fold(setup_game):
     assert action == "fold"
 
 def test_preflop_weak_hand_check(setup_game):
-    """Score 0 (Weak) + Cost 0 -> Check"""
+    """Weak preflop equity + Cost 0 -> Check"""
     game_state, bot = setup_game
 
-    bot.hand = [MockCard(2), MockCard(7)]
+    bot.hand = [Card('2', 'H'), Card('7', 'S')]
 
     game_state.current_bet = 20
     bot.current_bet = 20
@@ -105,10 +106,10 @@ def test_preflop_weak_hand_check(setup_game):
     assert action == "check"
 
 def test_preflop_weak_hand_bluff(setup_game):
-    """Score 0 (Weak) + Cost > 0 + Random < 0.1 -> Raise (Bluff)"""
+    """Weak preflop equity + Cost > 0 + Random < 0.1 -> Raise (Bluff)"""
     game_state, bot = setup_game
     
-    bot.hand = [MockCard(2), MockCard(3)]
+    bot.hand = [Card('2', 'H'), Card('3', 'S')]
     game_state.current_bet = 50
     bot.current_bet = 0
 
@@ -119,10 +120,10 @@ def test_preflop_weak_hand_bluff(setup_game):
     assert amount == 50 + 20 # Current + BB
 
 def test_preflop_weak_hand_fold(setup_game):
-    """Score 0 (Weak) + Cost > 0 + Random >= 0.1 -> Fold"""
+    """Weak preflop equity + Cost > 0 + Random >= 0.1 -> Fold"""
     game_state, bot = setup_game
     
-    bot.hand = [MockCard(2), MockCard(3)]
+    bot.hand = [Card('2', 'H'), Card('3', 'S')]
     game_state.current_bet = 50
     bot.current_bet = 0
 
@@ -139,7 +140,7 @@ def test_postflop_strong_hand_call(setup_game):
     bot.hand = [MockCard(10), MockCard(10)]
     game_state.community_cards = [MockCard(2), MockCard(3), MockCard(4)]
 
-    with patch('src.bot_logic.HandEvaluator.evaluate', return_value=(2, 'Two Pair')):
+    with patch('src.bot_logic.HandEvaluator.category', return_value=2):
         # Facing bet
         game_state.current_bet = 100
         bot.current_bet = 50
@@ -157,7 +158,7 @@ def test_postflop_strong_hand_raise(setup_game):
     game_state.current_bet = 0
     bot.current_bet = 0
     
-    with patch('src.bot_logic.HandEvaluator.evaluate', return_value=(3, 'Trips')):
+    with patch('src.bot_logic.HandEvaluator.category', return_value=3):
         with patch('src.bot_logic.random.random', return_value=0.9):
             action, amount = get_bot_move(game_state, bot)
             
@@ -171,7 +172,7 @@ def test_postflop_weak_hand_check(setup_game):
     game_state.community_cards = [MockCard(8), MockCard(9), MockCard(10)]
     
     # Evaluator returns 0 (High Card)
-    with patch('src.bot_logic.HandEvaluator.evaluate', return_value=(0, 'High Card')):
+    with patch('src.bot_logic.HandEvaluator.category', return_value=0):
         game_state.current_bet = 0
         bot.current_bet = 0
         
@@ -186,11 +187,26 @@ def test_postflop_weak_hand_fold(setup_game):
     bot.hand = [MockCard(2), MockCard(3)]
     game_state.community_cards = [MockCard(8), MockCard(9), MockCard(10)]
     
-    with patch('src.bot_logic.HandEvaluator.evaluate', return_value=(0, 'High Card')):
+    with patch('src.bot_logic.HandEvaluator.category', return_value=0):
         game_state.current_bet = 500
         bot.current_bet = 0
 
         with patch('src.bot_logic.random.random', return_value=0.5):
             action, amount = get_bot_move(game_state, bot)
             
-    assert action == "fold"
\ No newline at end of file
+    assert action == "fold"
+
+def test_preflop_uses_active_player_count(setup_game):
+    """A small pair is playable heads-up but weak against four opponents."""
+    game_state, bot = setup_game
+
+    bot.hand = [Card('2', 'H'), Card('2', 'S')]
+    game_state.current_bet = 20
+    bot.current_bet = 20
+
+    action, _ = get_bot_move(game_state, bot)
+    assert action == "call"
+
+    game_state.players = [MagicMock(is_folded=False) for _ in range(5)]
+    action, _ = get_bot_move(game_state, bot)
+    assert action == "check"
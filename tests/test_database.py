@@ -1,7 +1,8 @@
 import pytest
 import sqlite3
 import os
-from src.database import DatabaseManager
+import threading
+from src.database import DatabaseManager, Migration, MIGRATIONS, SCHEMA_VERSION, SettlementEntry, SqliteProfile
 
 @pytest.fixture
 def db(tmp_path):
@@ -162,3 +163,214 @@ def test_best_hand_update_logic(db):
         score = conn.execute("SELECT best_hand_score FROM players WHERE id=?", (pid,)).fetchone()[0]
     
     assert score == 8
+
+def test_connection_is_reused(db):
+    """Test that consecutive queries borrow the same pooled connection."""
+    with db._get_connection() as first:
+        pass
+    with db._get_connection() as second:
+        pass
+    assert first is second
+
+def test_nested_connections_share_one_transaction(db):
+    """Test that a nested block reuses the outer connection and an error rolls both back."""
+    pid, _ = db.get_or_create_player("nested")
+
+    with pytest.raises(RuntimeError):
+        with db._get_connection() as outer:
+            outer.execute("UPDATE players SET balance = 0 WHERE id = ?", (pid,))
+            with db._get_connection() as inner:
+                assert inner is outer
+            raise RuntimeError("abort settlement")
+
+    _, balance = db.get_or_create_player("nested")
+    assert balance == 1000
+
+def test_shared_manager_across_threads(db):
+    """Test that concurrent tables sharing one manager do not lose updates."""
+    pid, _ = db.get_or_create_player("shared")
+
+    def worker():
+        for _ in range(50):
+            db.update_balance(pid, 1)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    _, balance = db.get_or_create_player("shared")
+    assert balance == 1000 + 200
+    assert len(db._connections) <= db.pool_size
+
+def test_close_and_context_manager(tmp_path):
+    """Test that closing releases connections and blocks further use."""
+    with DatabaseManager(str(tmp_path / "closing.db")) as manager:
+        manager.get_or_create_player("someone")
+
+    assert manager._connections == []
+    with pytest.raises(sqlite3.ProgrammingError):
+        manager.get_or_create_player("someone")
+
+def test_memory_database_keeps_data():
+    """Test that an in-memory database is shared between calls."""
+    manager = DatabaseManager(":memory:")
+    pid, _ = manager.get_or_create_player("ephemeral")
+    manager.update_balance(pid, 5)
+
+    assert manager.get_or_create_player("ephemeral") == (pid, 1005)
+
+def test_settle_hand_applies_whole_hand(db):
+    """Test that one settle_hand call writes balances, stats and history together."""
+    winner, _ = db.get_or_create_player("winner")
+    loser, _ = db.get_or_create_player("loser")
+
+    db.settle_hand([
+        SettlementEntry(winner, 300, actions={'raise': 2}, won=True, pot_won=300, hand_score=7),
+        SettlementEntry(loser, -150),
+    ])
+
+    with db._get_connection() as conn:
+        w = conn.execute("SELECT balance, hands_played, hands_won, raises, biggest_pot_won, best_hand_score "
+                         "FROM players WHERE id=?", (winner,)).fetchone()
+        l = conn.execute("SELECT balance, hands_played FROM players WHERE id=?", (loser,)).fetchone()
+        history = conn.execute("SELECT winner_id, pot_size FROM game_history").fetchall()
+
+    assert w == (1300, 1, 1, 2, 300, 7)
+    assert l == (850, 0)
+    assert history == [(winner, 300)]
+
+def test_settle_hand_is_atomic(db):
+    """Test that a failing write rolls back the balance updates made before it."""
+    pid, _ = db.get_or_create_player("unlucky")
+    with db._get_connection() as conn:
+        conn.execute("CREATE TRIGGER fail_history BEFORE INSERT ON game_history "
+                     "BEGIN SELECT RAISE(ABORT, 'disk full'); END")
+
+    with pytest.raises(sqlite3.DatabaseError):
+        db.settle_hand([SettlementEntry(pid, 500, actions={}, won=True, pot_won=500)])
+
+    with db._get_connection() as conn:
+        row = conn.execute("SELECT balance, hands_played FROM players WHERE id=?", (pid,)).fetchone()
+    assert row == (1000, 0)
+
+def test_profile_pragmas_applied(tmp_path):
+    """Test that a named profile configures every connection."""
+    manager = DatabaseManager(str(tmp_path / "wal.db"), profile="fast")
+    with manager._get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -64000
+
+def test_custom_profile_and_unknown_name(tmp_path):
+    """Test that a SqliteProfile instance is accepted and bad names are rejected."""
+    manager = DatabaseManager(str(tmp_path / "custom.db"), profile=SqliteProfile(synchronous="OFF"))
+    with manager._get_connection() as conn:
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+    with pytest.raises(ValueError):
+        DatabaseManager(str(tmp_path / "bad.db"), profile="turbo")
+
+def test_wal_reader_during_open_write(tmp_path):
+    """Test that in WAL mode the leaderboard can be read while a settlement is uncommitted."""
+    manager = DatabaseManager(str(tmp_path / "concurrent.db"), profile="durable")
+    pid, _ = manager.get_or_create_player("reader")
+    result = []
+
+    with manager._get_connection() as conn:
+        conn.execute("UPDATE players SET balance = 0 WHERE id = ?", (pid,))
+        reader = threading.Thread(target=lambda: result.extend(manager.get_leaderboard()))
+        reader.start()
+        reader.join(timeout=2)
+
+    assert result[0][1] == 1000  # last committed balance
+
+def test_new_database_is_at_schema_version(db):
+    """Test that a fresh database runs every migration."""
+    with db._get_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert [m.version for m in MIGRATIONS] == list(range(1, SCHEMA_VERSION + 1))
+
+def test_current_schema_skips_ddl(tmp_path, monkeypatch):
+    """Test the startup fast path: reopening a current database runs no DDL."""
+    path = str(tmp_path / "fast.db")
+    DatabaseManager(path).close()
+
+    statements = []
+    connect = DatabaseManager._connect
+    def traced(self):
+        conn = connect(self)
+        conn.set_trace_callback(statements.append)
+        return conn
+    monkeypatch.setattr(DatabaseManager, "_connect", traced)
+    DatabaseManager(path).close()
+
+    assert not any("CREATE" in s for s in statements)
+
+def test_legacy_database_is_upgraded(tmp_path):
+    """Test that a database created before versioning keeps its data and gets the new indexes."""
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute(MIGRATIONS[0].statements[0])
+    conn.execute("INSERT INTO players (username, balance) VALUES ('old_timer', 4242)")
+    conn.commit()
+    conn.close()
+
+    manager = DatabaseManager(path)
+    assert manager.get_or_create_player("old_timer")[1] == 4242
+    with manager._get_connection() as conn:
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert "idx_players_balance" in indexes
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+def test_failed_migration_rolls_back(tmp_path, monkeypatch):
+    """Test that a failing step leaves the schema at the last completed version."""
+    broken = MIGRATIONS + (Migration(SCHEMA_VERSION + 1, "broken", (
+        "CREATE TABLE half_done (id INTEGER)",
+        "THIS IS NOT SQL",
+    )),)
+    monkeypatch.setattr("src.database.MIGRATIONS", broken)
+    monkeypatch.setattr("src.database.SCHEMA_VERSION", SCHEMA_VERSION + 1)
+
+    path = str(tmp_path / "broken.db")
+    with pytest.raises(sqlite3.OperationalError):
+        DatabaseManager(path)
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name='half_done'").fetchone() is None
+
+def test_newer_schema_is_rejected(tmp_path):
+    """Test that an older program refuses a database from a newer one."""
+    path = str(tmp_path / "future.db")
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    conn.close()
+
+    with pytest.raises(RuntimeError):
+        DatabaseManager(path)
+
+def test_get_player(db):
+    """Test the engine-facing lookup of name and balance."""
+    pid, _ = db.get_or_create_player("lookup")
+    db.update_balance(pid, 5)
+
+    assert db.get_player(pid) == ("lookup", 1005)
+    assert db.get_player(pid + 100) is None
+
+def test_in_memory_snapshot(tmp_path):
+    """Test that an in-memory database can be saved to a file with its schema and data."""
+    memory = DatabaseManager.in_memory()
+    pid, _ = memory.get_or_create_player("ghost")
+    memory.update_balance(pid, 77)
+
+    path = str(tmp_path / "snapshot.db")
+    memory.snapshot(path)
+
+    saved = DatabaseManager(path)
+    assert saved.get_player(pid) == ("ghost", 1077)
+    with saved._get_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
@@ -1,17 +1,13 @@
 import pytest
 from unittest.mock import MagicMock, patch
+from src.database import DatabaseManager
 from src.game_engine import PokerGame, PREFLOP, FLOP, SHOWDOWN
 
 @pytest.fixture
 def mock_db():
-    """Creates a mock database manager with a working connection context."""
+    """Creates a mock storage that knows one human player."""
     db = MagicMock()
-
-    mock_conn = MagicMock()
-    db._get_connection.return_value.__enter__.return_value = mock_conn
-
-    mock_conn.execute.return_value.fetchone.return_value = ("HumanPlayer", 1000)
-    
+    db.get_player.return_value = ("HumanPlayer", 1000)
     return db
 
 @pytest.fixture
@@ -121,9 +117,7 @@ def test_showdown_winner_determination(game):
     game.stage = SHOWDOWN
     game.pot = 100
 
-    with patch('src.game_engine.HandEvaluator') as mock_evaluator:
-        mock_evaluator.evaluate.side_effect = [(100, "Flush"), (50, "Pair")]
-        
+    with patch.object(game, 'hand_score', side_effect=[100, 50]):
         game._resolve_showdown()
         
         assert game.winner == game.players[0]
@@ -157,11 +151,7 @@ def test_leave_game_saves_balance(game, mock_db):
     
     game.leave_game(p1.id)
 
-    mock_conn = mock_db._get_connection.return_value.__enter__.return_value
-    args, _ = mock_conn.execute.call_args
-    
-    assert "UPDATE players SET balance=?" in args[0]
-    assert args[1][0] == 555
+    mock_db.set_balance.assert_called_once_with(p1.id, 555)
 
 def test_betting_round_not_over_if_action_needed(game):
     """Test that round doesn't end if players haven't acted, even if bets equal."""
@@ -171,4 +161,51 @@ def test_betting_round_not_over_if_action_needed(game):
     game.process_action("call")
 
     is_over = game._is_betting_round_over()
-    assert is_over is False
\ No newline at end of file
+    assert is_over is False
+
+def test_hand_scores_follow_each_street(game):
+    """Test that cached hand scores match a full evaluation after every street."""
+    from src.game_logic import HandEvaluator
+
+    game.start_new_hand()
+    for _ in range(3):
+        game._advance_stage()
+        for p in game.players:
+            assert game.hand_score(p) == HandEvaluator.score(p.hand + game.community_cards)
+        assert game.board_key == HandEvaluator.card_key([c.code for c in game.community_cards])
+
+def test_hand_scores_cleared_on_new_hand(game):
+    """Test that a new hand drops the previous hand's scores and board key."""
+    game.start_new_hand()
+    game._advance_stage()
+    assert game._hand_scores
+
+    game.start_new_hand()
+    assert game._hand_scores == {}
+    assert game.board_key == 0
+
+def test_end_hand_settles_in_one_call(game, mock_db):
+    """Test that a finished hand reaches the database as a single settlement."""
+    game.start_new_hand()
+    game.pot = 100
+
+    game._end_hand(game.players[0])
+
+    mock_db.settle_hand.assert_called_once()
+    (entry,), = mock_db.settle_hand.call_args.args
+    assert (entry.player_id, entry.balance_delta, entry.won, entry.pot_won) == (1, 100, True, 100)
+    mock_db.update_balance.assert_not_called()
+
+def test_engine_runs_on_in_memory_storage():
+    """Test a human seat backed by real in-memory storage instead of a mock."""
+    db = DatabaseManager.in_memory()
+    pid, _ = db.get_or_create_player("HumanPlayer")
+    game = PokerGame(db, human_id=pid, config={'mode': 'PVE', 'bot_count': 1, 'small_blind': 10})
+    game.start_new_hand()
+    human = game.players[0]
+
+    game.active_player_index = 0
+    game.process_action("fold")
+    game.leave_game(pid)
+
+    assert db.get_player(pid) == ("HumanPlayer", human.balance)
@@ -0,0 +1,160 @@
+import random
+from itertools import combinations
+
+import pytest
+from src.game_logic import Card, Deck, HandEvaluator
+from src.equity import EquityResult, exact_equity, monte_carlo_equity
+
+def cards_from_str(card_str: str):
+    """Parses a string like 'Ah Kd 10s' into a list of Card objects."""
+    return [Card(rank=part[:-1], suit=part[-1]) for part in card_str.split()]
+
+def test_pocket_aces_heads_up():
+    """Test that AA against one random hand is close to its known 85% equity."""
+    result = monte_carlo_equity(cards_from_str("Ah As"), samples=20000, rng=random.Random(1))
+
+    assert result.samples == 20000
+    assert abs(result.equity - 0.852) < 4 * result.std_error + 0.005
+    assert result.win + result.tie + result.loss == pytest.approx(1.0)
+
+def test_river_nut_hand_always_wins():
+    """Test that a royal flush on the river wins every sample."""
+    result = monte_carlo_equity(
+        cards_from_str("Ah Kh"), cards_from_str("Qh Jh 10h 2c 3d"),
+        opponents=3, samples=500, rng=random.Random(2)
+    )
+
+    assert result.win == 1.0
+    assert result.std_error == 0.0
+
+def test_board_plays_is_a_tie():
+    """Test that a board straight that nobody can beat splits every pot."""
+    result = monte_carlo_equity(
+        cards_from_str("2c 3c"), cards_from_str("10s Jd Qh Kc Ad"),
+        samples=500, rng=random.Random(3)
+    )
+
+    # only the hero can tie; an opponent holding a flush is impossible here
+    assert result.loss == 0.0
+    assert result.tie == 1.0
+    assert result.equity == pytest.approx(0.5)
+
+def test_early_stop_on_target_error():
+    """Test that sampling stops once the standard error is small enough."""
+    result = monte_carlo_equity(
+        cards_from_str("Kd Qd"), samples=100000, target_error=0.02, rng=random.Random(4)
+    )
+
+    assert result.samples < 100000
+    assert result.std_error <= 0.02
+
+def test_time_limit_stops_sampling():
+    """Test that a zero time budget stops after the first batch."""
+    result = monte_carlo_equity(
+        cards_from_str("7s 2h"), samples=100000, time_limit=0.0, rng=random.Random(5)
+    )
+
+    assert 0 < result.samples < 100000
+
+def test_same_seed_same_result():
+    """Test that runs are reproducible with a seeded RNG."""
+    a = monte_carlo_equity(cards_from_str("Js 10s"), opponents=2, samples=1000, rng=random.Random(6))
+    b = monte_carlo_equity(cards_from_str("Js 10s"), opponents=2, samples=1000, rng=random.Random(6))
+    assert a == b
+
+def test_merge_adds_counts():
+    """Test that merging two results sums their counts."""
+    merged = EquityResult(3, 1, 2, 3.5, 3.25).merge(EquityResult(1, 0, 1, 1.0, 1.0))
+
+    assert (merged.wins, merged.ties, merged.losses) == (4, 1, 3)
+    assert merged.equity == pytest.approx(4.5 / 8)
+
+def test_invalid_inputs():
+    """Test that duplicate cards and bad opponent counts are rejected."""
+    with pytest.raises(ValueError, match="Duplicate"):
+        monte_carlo_equity(cards_from_str("Ah Ah"))
+
+    with pytest.raises(ValueError, match="opponent"):
+        monte_carlo_equity(cards_from_str("Ah Kh"), opponents=0)
+
+    with pytest.raises(ValueError, match="2 hole cards"):
+        monte_carlo_equity(cards_from_str("Ah"))
+
+def _brute_force_equity(hero, board, opponent_hands, dead):
+    """Reference: evaluates every runout with the tuple API, one unknown opponent at most."""
+    known = {c.code for c in hero + board + dead + [c for h in opponent_hands for c in h]}
+    stub = [c for c in Deck().cards if c.code not in known]
+    wins = ties = losses = 0
+    share = 0.0
+    for runout in combinations(stub, 5 - len(board)):
+        full = board + list(runout)
+        rest = [c for c in stub if c not in runout]
+        unknown = list(combinations(rest, 2)) if len(opponent_hands) < 2 else [()]
+        for extra in unknown:
+            hands = list(opponent_hands) + ([list(extra)] if extra else [])
+            mine = HandEvaluator.evaluate(hero + full)
+            theirs = [HandEvaluator.evaluate(h + full) for h in hands]
+            best = max(theirs)
+            if mine > best:
+                wins += 1
+                share += 1
+            elif mine == best:
+                ties += 1
+                share += 1 / (theirs.count(best) + 1)
+            else:
+                losses += 1
+    return wins, ties, losses, share
+
+def test_exact_matches_brute_force_known_hands():
+    """Test exact enumeration on the turn with two known opponent hands."""
+    hero = cards_from_str("Ah Kd")
+    board = cards_from_str("Qh Jh 2c 7d")
+    opponents = [cards_from_str("9s 9c"), cards_from_str("10h 3h")]
+
+    result = exact_equity(hero, board, opponent_hands=opponents)
+    wins, ties, losses, share = _brute_force_equity(hero, board, opponents, [])
+
+    assert (result.wins, result.ties, result.losses) == (wins, ties, losses)
+    assert result.share == pytest.approx(share)
+    assert result.std_error == 0.0
+
+def test_exact_matches_brute_force_unknown_opponent():
+    """Test exact enumeration against one unknown hand with dead cards removed."""
+    hero = cards_from_str("5s 5d")
+    board = cards_from_str("Ks 8h 2d 2c")
+    known = {c.code for c in hero + board}
+    dead = [c for c in Deck().cards[:24] if c.code not in known]
+
+    result = exact_equity(hero, board, opponents=1, dead_cards=dead)
+    wins, ties, losses, share = _brute_force_equity(hero, board, [], dead)
+
+    assert (result.wins, result.ties, result.losses) == (wins, ties, losses)
+    assert result.share == pytest.approx(share)
+
+def test_exact_multiway_unknown_counts_every_deal():
+    """Test that two unknown opponents on the river enumerate every disjoint pair of hands."""
+    hero = cards_from_str("Ah Ad")
+    board = cards_from_str("Ks 8h 2d 2c 9s")
+    known = {c.code for c in hero + board}
+    dead = [c for c in Deck().cards[:36] if c.code not in known]
+
+    result = exact_equity(hero, board, opponents=2, dead_cards=dead)
+    left = 52 - 7 - len(dead)
+
+    # unordered pairs of disjoint 2-card hands from the remaining cards
+    assert result.samples == len(list(combinations(range(left), 2))) * len(list(combinations(range(left - 2), 2))) // 2
+
+def test_exact_agrees_with_monte_carlo():
+    """Test that sampling converges on the exact answer."""
+    hero = cards_from_str("Ah Kd")
+    board = cards_from_str("Qh Jh 2c 7d")
+
+    exact = exact_equity(hero, board, opponents=1)
+    sampled = monte_carlo_equity(hero, board, samples=20000, rng=random.Random(8))
+
+    assert abs(exact.equity - sampled.equity) < 4 * sampled.std_error
+
+def test_exact_needs_an_opponent():
+    """Test that an exact run without opponents is rejected."""
+    with pytest.raises(ValueError, match="opponent"):
+        exact_equity(cards_from_str("Ah Kd"), cards_from_str("Qh Jh 2c 7d"))
@@ -0,0 +1,81 @@
+import io
+import random
+
+import pytest
+
+from src.event_log import (ACTION, BLIND, END, HOLE, PAYOUT, RULES, SEAT, SHOWDOWN, START, STREET, EventLog,
+                           decode_events, encode_events, pack_cards, read_hands, unpack_cards)
+from src.game_engine import PokerGame
+from src.hand_history import ACTION_INDEX
+from src.simulation import play_hand
+
+def _bot_game(events, bots=3):
+    return PokerGame(None, None, {'mode': 'PVE', 'bot_count': bots, 'small_blind': 10}, events=events)
+
+def test_encode_round_trip():
+    events = [(START, 1, 2**31 - 1, 3), (ACTION, 2, 6, -5), (END, 0, 1, 10**12)]
+    blob = encode_events(events)
+    assert len(blob) == 3 * 14
+    assert decode_events(blob) == events
+    assert unpack_cards(pack_cards([51, 0, 13]), 3) == [51, 0, 13]
+
+def test_hand_events_in_order():
+    """Test the events of one hand and that they account for every chip."""
+    log = EventLog(seed=1)
+    game = _bot_game(log)
+    random.seed(1)
+    play_hand(game)
+
+    assert len(log) == 1 and game.hand_events is None
+    events = next(iter(log))
+    kinds = [e[0] for e in events]
+    assert kinds[:2] == [START, RULES] and events[0][3] == 3
+    assert kinds.count(SEAT) == 3 and kinds.count(HOLE) == 3 and kinds.count(BLIND) == 2
+    assert kinds[-1] == END and PAYOUT in kinds
+
+    stacks = {seat: stack for kind, seat, _, stack in events if kind == SEAT}
+    paid = sum(chips for kind, _, _, chips in events if kind == PAYOUT)
+    assert paid == events[-1][3]  # the whole pot
+    assert sum(stacks.values()) == sum(p.balance for p in game.players)
+
+    board = [c for kind, _, packed, count in events if kind == STREET for c in unpack_cards(packed, count)]
+    assert board == [c.code for c in game.community_cards]
+    showdown = [seat for kind, seat, _, _ in events if kind == SHOWDOWN]
+    assert all(not game.players[seat].is_folded for seat in showdown)
+
+def test_rejected_actions_are_logged():
+    """Test that invalid requests are kept: they change the engine's counters too."""
+    log = EventLog(seed=2)
+    game = _bot_game(log, bots=2)
+    game.start_new_hand()
+    seat = game.active_player_index
+    assert game.process_action("raise", 1) == "Raise too small"
+    assert game.hand_events[-1] == (ACTION, seat, ACTION_INDEX["raise"], 1)
+
+def test_same_seed_same_deals():
+    """Test that a log's seed fixes every deal, whatever else uses the RNG."""
+    hands = []
+    for noise in (1, 2):
+        random.seed(noise)
+        game = _bot_game(EventLog(seed=5))
+        game.start_new_hand()
+        hands.append([[c.code for c in p.hand] for p in game.players])
+    assert hands[0] == hands[1]
+
+def test_file_round_trip(tmp_path):
+    log = EventLog(seed=3)
+    game = _bot_game(log)
+    random.seed(3)
+    for _ in range(20):
+        play_hand(game)
+
+    path = str(tmp_path / "hands.pkev")
+    log.save(path)
+    assert EventLog.load(path).hands == log.hands
+
+    with open(path, "rb") as fp:
+        data = fp.read()
+    with pytest.raises(ValueError, match="Truncated"):
+        list(read_hands(io.BytesIO(data[:-3])))
+    with pytest.raises(ValueError, match="Not an event log"):
+        list(read_hands(io.BytesIO(b"nope")))
@@ -1,5 +1,9 @@
+import random
+from collections import Counter
+from itertools import combinations
+
 import pytest
-from src.game_logic import Card, Deck, HandEvaluator
+from src.game_logic import Card, Deck, HandEvaluator, CARDS, cards_to_codes, codes_to_cards
 
 def cards_from_str(card_str: str):
     """
@@ -26,6 +30,23 @@ def test_card_initialization():
     c3 = Card(rank='10', suit='C')
     assert c3.value == 10
 
+def test_card_codes_round_trip():
+    """Test that every card maps to a unique 0-51 code and back to a shared instance."""
+    assert [c.code for c in CARDS] == list(range(52))
+
+    card = Card(rank='K', suit='S')
+    assert card.code == (13 - 2) * 4 + 3
+    assert Card.from_code(card.code) == card
+    assert Card.from_code(card.code) is CARDS[card.code]
+
+    hand = [Card(rank='A', suit='h'), Card(rank='2', suit='C')]
+    assert codes_to_cards(cards_to_codes(hand)) == [Card(rank='A', suit='H'), Card(rank='2', suit='C')]
+
+def test_deck_uses_shared_cards():
+    """Test that a new deck holds the interned card instances."""
+    deck = Deck()
+    assert all(a is b for a, b in zip(deck.cards, CARDS))
+
 def test_deck_integrity():
     """Test that a new deck has 52 unique cards."""
     deck = Deck()
@@ -45,6 +66,23 @@ def test_deck_deal():
     for card in hand:
         assert card not in deck.cards
 
+def test_seeded_shuffle_is_reproducible():
+    """Test that a shuffle seed always gives the same full deck."""
+    first, second, other = Deck(), Deck(), Deck()
+    first.shuffle(7)
+    second.shuffle(7)
+    other.shuffle(8)
+    assert first.cards == second.cards != other.cards
+    assert sorted(c.code for c in first.cards) == list(range(52))
+
+    # every card reaches the top of the deck
+    tops = Counter()
+    for seed in range(5200):
+        deck = Deck()
+        deck.shuffle(seed)
+        tops[deck.cards[-1].code] += 1
+    assert len(tops) == 52 and max(tops.values()) < 200
+
 def test_deck_empty_error():
     """Test dealing from an empty deck raises an error."""
     deck = Deck()
@@ -170,3 +208,89 @@ def test_best_5_of_7():
     score, kickers = HandEvaluator.evaluate(hand)
 
     assert score == HandEvaluator.FLUSH
+
+def _brute_force_evaluate(cards):
+    """Reference evaluator: scores every 5-card combination the slow way."""
+
+    def score_five(hand):
+        hand = sorted(hand, key=lambda c: c.value, reverse=True)
+        values = [c.value for c in hand]
+        is_flush = len(set(c.suit for c in hand)) == 1
+        is_straight = len(set(values)) == 5 and values[0] - values[4] == 4
+        if values == [14, 5, 4, 3, 2]:
+            is_straight = True
+            values = [5, 4, 3, 2, 1]
+        if is_straight and is_flush:
+            if values[0] == 14:
+                return (HandEvaluator.ROYAL_FLUSH, values)
+            return (HandEvaluator.STRAIGHT_FLUSH, values)
+        counts = Counter(values)
+        common = counts.most_common()
+        singles = sorted([k for k, v in counts.items() if v == 1], reverse=True)
+        if common[0][1] == 4:
+            return (HandEvaluator.FOUR_OF_A_KIND, [common[0][0], common[1][0]])
+        if common[0][1] == 3 and common[1][1] == 2:
+            return (HandEvaluator.FULL_HOUSE, [common[0][0], common[1][0]])
+        if is_flush:
+            return (HandEvaluator.FLUSH, values)
+        if is_straight:
+            return (HandEvaluator.STRAIGHT, values)
+        if common[0][1] == 3:
+            return (HandEvaluator.THREE_OF_A_KIND, [common[0][0]] + singles)
+        if common[0][1] == 2 and common[1][1] == 2:
+            pairs = sorted([k for k, v in counts.items() if v == 2], reverse=True)
+            return (HandEvaluator.TWO_PAIR, pairs + singles)
+        if common[0][1] == 2:
+            return (HandEvaluator.PAIR, [common[0][0]] + singles)
+        return (HandEvaluator.HIGH_CARD, values)
+
+    return max(score_five(list(hand)) for hand in combinations(cards, 5))
+
+@pytest.mark.parametrize("count", [5, 6, 7])
+def test_score_matches_brute_force(count):
+    """Test that table lookups agree with scoring every 5-card combination."""
+    rng = random.Random(count)
+    deck = Deck().cards
+
+    for _ in range(2000):
+        hand = rng.sample(deck, count)
+        assert HandEvaluator.evaluate(hand) == _brute_force_evaluate(hand)
+
+def test_score_ordering_matches_tuples():
+    """Test that integer scores order hands exactly like the tuple API."""
+    rng = random.Random(42)
+    deck = Deck().cards
+    hands = [rng.sample(deck, 7) for _ in range(500)]
+
+    scored = sorted((HandEvaluator.score(h), HandEvaluator.evaluate(h)) for h in hands)
+    for (s1, t1), (s2, t2) in zip(scored, scored[1:]):
+        assert (s1 == s2) == (t1 == t2)
+        assert t1 <= t2
+
+def test_score_codes_matches_score():
+    """Test that scoring card codes gives the same result as scoring cards."""
+    rng = random.Random(7)
+    for _ in range(200):
+        hand = rng.sample(CARDS, 7)
+        assert HandEvaluator.score_codes(cards_to_codes(hand)) == HandEvaluator.score(hand)
+
+def test_score_key_is_additive():
+    """Test that summed board and hand keys score the same as the full hand."""
+    rng = random.Random(9)
+    for _ in range(200):
+        codes = cards_to_codes(rng.sample(CARDS, 7))
+        key = HandEvaluator.card_key(codes[:5]) + HandEvaluator.card_key(codes[5:])
+        assert HandEvaluator.score_key(key, codes) == HandEvaluator.score_codes(codes)
+
+def test_score_category():
+    """Test that the category can be read straight off the integer score."""
+    score = HandEvaluator.score(cards_from_str("Ks Kh Kd Qs Qh 2d 3c"))
+    assert HandEvaluator.category(score) == HandEvaluator.FULL_HOUSE
+
+def test_more_than_seven_cards():
+    """Test that more than 7 cards still gives the best 5-card hand, as before the tables."""
+    cards = cards_from_str("2c 7d 9h Ks Kh Kd Qs Qh")
+    best = max(HandEvaluator.score(list(five)) for five in combinations(cards, 5))
+
+    assert HandEvaluator.score(cards) == best
+    assert HandEvaluator.evaluate(cards)[0] == HandEvaluator.FULL_HOUSE
@@ -0,0 +1,95 @@
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.game_engine import FLOP, PREFLOP, PokerGame
+from src.game_state import SearchGame, detach, restore, snapshot
+from src.simulation import bot_action, build_game
+
+@pytest.fixture
+def game():
+    random.seed(5)
+    g = build_game(bots=3)
+    g.start_new_hand()
+    return g
+
+def test_snapshot_restore_round_trip(game):
+    """Test that restoring a snapshot undoes any number of moves."""
+    before = snapshot(game)
+    for _ in range(4):
+        bot_action(game)
+    assert snapshot(game) != before
+
+    restore(game, before)
+    assert snapshot(game) == before
+    assert len(game.deck) + len(game.community_cards) + 2 * len(game.players) == 52
+
+def test_states_are_immutable(game):
+    state = snapshot(game)
+    with pytest.raises(AttributeError):
+        state.pot = 0
+    assert isinstance(state.seats[0].hand, tuple)
+    # later moves do not leak into a taken snapshot
+    taken = repr(state)
+    bot_action(game)
+    assert repr(state) == taken
+
+def test_restore_rejects_other_tables(game):
+    with pytest.raises(ValueError):
+        restore(game, snapshot(build_game(bots=1)))
+
+def test_detached_copy_has_no_storage():
+    """Test that a copy of a database-backed game plays without touching the database."""
+    db = MagicMock()
+    db.get_player.return_value = ("Human", 1000)
+    game = PokerGame(db, 1, {'mode': 'PVE', 'bot_count': 1, 'small_blind': 10})
+    game.start_new_hand()
+
+    copy = detach(game)
+    assert copy.db is None and copy.history is None and copy.events is None
+    assert snapshot(copy) == snapshot(game)
+    copy.process_action("fold")
+
+    db.settle_hand.assert_not_called()
+    assert game.winner is None and copy.winner is not None
+    copy.leave_game(copy.players[0].id)
+    db.set_balance.assert_not_called()
+
+def test_search_walks_the_tree_and_comes_back(game):
+    """Test a depth-first walk with apply/undo over every legal move."""
+    search = SearchGame(game)
+    root = search.state()
+    visited = []
+
+    def walk(depth):
+        visited.append(search.state())
+        if depth == 0 or search.hand_over:
+            return
+        for move in search.legal_actions():
+            assert search.apply(*move) in ("OK", "Hand Over")
+            walk(depth - 1)
+            search.undo()
+            assert search.depth == 3 - depth
+
+    walk(3)
+    assert search.state() == root and search.depth == 0
+    assert len(set(visited)) > 10
+    # the original game is never touched
+    assert snapshot(game) == root
+
+def test_undo_across_a_street(game):
+    search = SearchGame(game)
+    while search.game.stage == PREFLOP:
+        search.apply(*next(m for m in search.legal_actions() if m[0] in ("check", "call")))
+    assert search.game.stage == FLOP and len(search.game.community_cards) == 3
+
+    search.reset()
+    assert search.game.stage == PREFLOP and search.game.community_cards == []
+    assert search.state() == snapshot(game)
+
+def test_refused_move_changes_nothing(game):
+    search = SearchGame(game)
+    before = search.state()
+    assert search.apply("raise", 1) == "Raise too small"
+    assert search.state() == before and search.depth == 0
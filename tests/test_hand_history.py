@@ -0,0 +1,98 @@
+import random
+import sqlite3
+
+import pytest
+
+from src.database import DatabaseManager
+from src.hand_history import HandHistoryStore, HandRecord, decode_record, encode_record
+from src.simulation import build_game, play_hand
+
+@pytest.fixture
+def store(tmp_path):
+    return HandHistoryStore(DatabaseManager(str(tmp_path / "history.db")), batch_size=4)
+
+def _record(seats, pot=100, played_at=1.0):
+    record = HandRecord(seats, [1000] * len(seats), [[2 * i, 2 * i + 1] for i in range(len(seats))],
+                        board=[40, 41, 42], pot=pot, played_at=played_at)
+    record.add_action(0, "PREFLOP", "small_blind", 10)
+    record.add_action(1, "FLOP", "raise", 90)
+    record.winners = [1]
+    return record
+
+def test_encode_decode_roundtrip():
+    """Test that a record survives the compact encoding unchanged."""
+    record = _record([7, 9000])
+    record.hole_cards[1] = []  # seat not dealt in
+    decoded = decode_record((5,) + encode_record(record))
+
+    assert decoded.hand_id == 5
+    assert (decoded.seats, decoded.stacks, decoded.hole_cards) == ([7, 9000], [1000, 1000], [[0, 1], []])
+    assert decoded.board == [40, 41, 42]
+    assert decoded.action_names() == [(0, "PREFLOP", "small_blind", 10), (1, "FLOP", "raise", 90)]
+    assert (decoded.winners, decoded.pot) == ([1], 100)
+
+def test_append_buffers_until_batch_size(store):
+    """Test that appends are written in batches."""
+    for _ in range(3):
+        store.append(_record([1, 2]))
+    assert len(store._pending) == 3
+
+    store.append(_record([1, 2]))
+    assert store._pending == []
+
+def test_close_writes_buffered_hands(store):
+    """Test that closing writes hands short of a batch, and refuses hands after it."""
+    store.append(_record([1, 2]))
+    store.close()
+
+    assert store.count() == 1
+    with pytest.raises(RuntimeError):
+        store.append(_record([1, 2]))
+
+def test_last_hands_newest_first(store):
+    """Test that a player's last N hands come back newest first and only include that player."""
+    for i in range(10):
+        store.append(_record([1, 2] if i % 2 else [1, 3], pot=i))
+
+    hands = store.last_hands(2, limit=3)
+    assert [h.pot for h in hands] == [9, 7, 5]
+    assert store.count() == 10
+    assert len(store.last_hands(1, limit=100)) == 10
+
+def test_hands_between(store):
+    """Test the timestamp range query."""
+    for t in (10.0, 20.0, 30.0):
+        store.append(_record([1, 2], played_at=t))
+
+    assert [h.played_at for h in store.hands_between(15.0, 31.0)] == [20.0, 30.0]
+
+def test_history_is_append_only(store):
+    """Test that stored hands cannot be changed or removed."""
+    store.append(_record([1, 2]))
+    store.flush()
+
+    with pytest.raises(sqlite3.DatabaseError):
+        with store.db._get_connection() as conn:
+            conn.execute("UPDATE hands SET pot = 0")
+    with pytest.raises(sqlite3.DatabaseError):
+        with store.db._get_connection() as conn:
+            conn.execute("DELETE FROM hands")
+
+def test_engine_records_every_hand(store):
+    """Test that PokerGame hands a full record to the store for every hand."""
+    random.seed(3)
+    game = build_game(bots=3, history=store)
+    for _ in range(20):
+        play_hand(game)
+    store.flush()
+
+    hands = store.last_hands(9000, limit=100)
+    assert len(hands) == 20
+    for hand in hands:
+        actions = hand.action_names()
+        assert [a[2] for a in actions[:2]] == ["small_blind", "big_blind"]
+        # every chip in the pot is accounted for by an action
+        assert sum(a[3] for a in actions) == hand.pot
+        assert hand.winners
+        assert len(hand.board) in (0, 3, 4, 5)
+        assert all(len(cards) == 2 for cards in hand.hole_cards)
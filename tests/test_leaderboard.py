@@ -0,0 +1,70 @@
+import pytest
+
+from src.database import DatabaseManager
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "leaderboard.db"))
+    for name, balance in [("ann", 500), ("ben", 3000), ("cat", 1500), ("dan", 1500), ("eve", 100)]:
+        pid, _ = manager.get_or_create_player(name)
+        manager.set_balance(pid, balance)
+    return manager
+
+def test_paging(db):
+    """Test that pages follow balance order, ties in creation order."""
+    first = db.leaderboard.page(0, 2)
+    second = db.leaderboard.page(1, 2)
+    last = db.leaderboard.page(2, 2)
+
+    assert [r[0] for r in first + second + last] == ["ben", "cat", "dan", "ann", "eve"]
+    assert db.leaderboard.page(3, 2) == []
+
+def test_rank_shares_ties(db):
+    """Test a player's own rank, equal balances sharing a rank."""
+    ids = {row[0]: row[3] for row in db.leaderboard.page(0, 10)}
+
+    assert db.leaderboard.rank(ids["ben"]) == 1
+    assert db.leaderboard.rank(ids["cat"]) == db.leaderboard.rank(ids["dan"]) == 2
+    assert db.leaderboard.rank(ids["eve"]) == 5
+    assert db.leaderboard.rank(12345) is None
+
+def test_sort_by_other_columns(db):
+    """Test sorting by stat columns and rejecting unknown ones."""
+    ids = {row[0]: row[3] for row in db.leaderboard.page(0, 10)}
+    db.record_hand_stats(ids["eve"], True, 900, 1, {})
+    db.record_hand_stats(ids["ann"], True, 50, 1, {})
+
+    assert [r[0] for r in db.leaderboard.page(0, 2, sort_by="biggest_pot_won")] == ["eve", "ann"]
+    assert db.leaderboard.rank(ids["ann"], sort_by="hands_won") == 1
+
+    with pytest.raises(ValueError):
+        db.leaderboard.page(sort_by="username; DROP TABLE players")
+
+def test_cache_hit_and_invalidation(db):
+    """Test that repeated reads are cached and any committed write refreshes them."""
+    top = db.get_leaderboard(1)
+    with db._get_connection() as conn:
+        conn.execute("SELECT 1")  # reads do not invalidate
+    assert db.get_leaderboard(1) is top
+
+    db.update_balance(db.leaderboard.page(0, 10)[-1][3], 10000)
+    assert db.get_leaderboard(1)[0][0] == "eve"
+
+def test_writes_from_another_manager_refresh(db):
+    """Test that a write committed through another connection to the file refreshes the cache."""
+    top = db.get_leaderboard(1)
+    other = DatabaseManager(db.db_name)
+    eve = other.get_or_create_player("eve")[0]
+    other.update_balance(eve, 10000)
+    other.close()
+
+    assert db.get_leaderboard(1)[0][0] == "eve"
+    assert db.get_leaderboard(1) is db.get_leaderboard(1)
+    assert top[0][0] == "ben"
+
+def test_delete_player_refreshes(db):
+    """Test that deleting a player drops them from the cached board."""
+    top = db.get_leaderboard()
+    db.delete_player(top[0][3])
+
+    assert [r[0] for r in db.get_leaderboard()] == ["cat", "dan", "ann", "eve"]
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from src.game_logic import Card
+from src.loadtest import LoadReport, LoadTest, TableView, choose_action, compare, percentile, run_load_test
+
+def _state(current_bet=20, my_bet=10):
+    return {
+        "current_bet": current_bet,
+        "board": [],
+        "seats": [
+            {"name": "a", "balance": 990, "bet": my_bet, "folded": False},
+            {"name": "b", "balance": 980, "bet": 20, "folded": False},
+        ],
+    }
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 11)]
+    assert percentile(values, 0.5) == 5.0
+    assert percentile(values, 0.9) == 9.0
+    assert percentile(values, 0.99) == 10.0
+    assert percentile([], 0.5) == 0.0
+
+def test_report_and_compare():
+    """Test the report's fixed keys and the relative change against a baseline."""
+    report = LoadReport(seats=4, policy="call", seconds=2.0, actions=100, hands=10,
+                        latencies=[0.001, 0.002, 0.003, 0.004]).to_dict()
+    assert report["actions_per_second"] == 50.0
+    assert report["latency_p50_ms"] == 2.0
+    assert report["latency_max_ms"] == 4.0
+
+    baseline = dict(report, actions_per_second=100.0, errors=0)
+    changes = compare(report, baseline)
+    assert changes["actions_per_second"] == -0.5
+    assert "errors" not in changes  # nothing to compare with
+
+def test_call_policy_and_table_view():
+    """Test the client-side view that feeds get_bot_move."""
+    hole = [Card("A", "S"), Card("A", "H")]
+    view = TableView(_state(), hole, seat=0, big_blind=20)
+    assert view.me.hand == hole and view.me.current_bet == 10
+    assert choose_action("call", view) == ("call", 0)
+    assert choose_action("call", TableView(_state(my_bet=20), hole, 0, 20)) == ("check", 0)
+    # pocket aces never fold
+    assert choose_action("bot", view)[0] in ("call", "raise")
+
+def test_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        LoadTest("127.0.0.1", 1, seats=4, duration=1, policy="random")
+    with pytest.raises(ValueError):
+        LoadTest("127.0.0.1", 1, seats=1, duration=1)
+
+def test_short_run_against_in_process_server():
+    """Test a short local run: seats pair up, play hands and measure every action."""
+    report = asyncio.run(run_load_test(seats=4, duration=1.0, policy="bot"))
+    assert report.errors == 0
+    assert report.hands > 0 and report.actions > 0
+    # actions still in flight at the deadline have no latency
+    assert 0 < len(report.latencies) <= report.actions
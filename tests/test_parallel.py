@@ -0,0 +1,57 @@
+import pytest
+from src.game_logic import Card
+from src.equity import monte_carlo_equity
+from src.parallel import (
+    MIN_CHUNK, parallel_equity, run_sharded, shard_seeds, split_budget
+)
+
+def _square(x):
+    return x * x
+
+def test_split_budget():
+    """Test that shards cover the whole budget."""
+    assert split_budget(10, 4) == [4, 4, 2]
+    assert split_budget(8, 4) == [4, 4]
+    assert split_budget(0, 4) == []
+
+def test_shard_seeds_are_reproducible():
+    """Test that the same base seed gives the same distinct shard seeds."""
+    seeds = shard_seeds(1, 5)
+    assert seeds == shard_seeds(1, 5)
+    assert len(set(seeds)) == 5
+    assert seeds != shard_seeds(2, 5)
+
+def test_run_sharded_keeps_order():
+    """Test that results come back in shard order from a process pool."""
+    assert run_sharded(_square, [3, 1, 2], workers=2) == [9, 1, 4]
+    assert run_sharded(_square, [3, 1, 2], workers=1) == [9, 1, 4]
+
+def test_parallel_equity_independent_of_worker_count():
+    """Test that sharded results do not depend on how many processes ran them."""
+    hand = [Card('Q', 'S'), Card('J', 'S')]
+
+    single = parallel_equity(hand, samples=4000, workers=1, seed=3, chunk_size=1000)
+    pooled = parallel_equity(hand, samples=4000, workers=2, seed=3, chunk_size=1000)
+
+    assert single == pooled
+    assert single.samples == 4000
+
+def test_default_chunking_independent_of_worker_count():
+    """Test the default shard size: the same seed gives the same result on any pool."""
+    hand = [Card('A', 'H'), Card('K', 'H')]
+    samples = 4 * MIN_CHUNK
+
+    single = parallel_equity(hand, samples=samples, workers=1, seed=7)
+    pooled = parallel_equity(hand, samples=samples, workers=2, seed=7)
+
+    assert single == pooled
+    assert single.samples == samples
+
+def test_parallel_equity_matches_serial_estimate():
+    """Test that the merged estimate agrees with a single serial run."""
+    hand = [Card('A', 'H'), Card('A', 'S')]
+
+    merged = parallel_equity(hand, samples=8000, workers=2, chunk_size=2000)
+    serial = monte_carlo_equity(hand, samples=8000)
+
+    assert merged.equity == pytest.approx(serial.equity, abs=4 * (merged.std_error + serial.std_error))
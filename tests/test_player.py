@@ -113,3 +113,12 @@ def test_last_action_text_default():
     """Test default empty action text."""
     p = Player(id=1, name="Player", balance=1000)
     assert p.last_action_text == ""
+
+def test_actions_reset_each_hand():
+    """Test that action counts only cover the current hand."""
+    p = Player(id=1, name="Test", balance=100)
+    p.actions['raise'] = 3
+
+    p.reset_for_new_round()
+
+    assert p.actions == {'fold': 0, 'check': 0, 'bet': 0, 'raise': 0}
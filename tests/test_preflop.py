@@ -0,0 +1,65 @@
+from collections import Counter
+from itertools import combinations
+
+import pytest
+from src import preflop
+from src.game_logic import CARDS, Card
+from src.preflop import (
+    NUM_CLASSES, hand_class_index, hand_class_name, preflop_equity,
+    representative_cards, write_table
+)
+
+def test_every_starting_hand_maps_to_169_classes():
+    """Test that the 1326 starting hands fall into 169 classes with the right multiplicities."""
+    counts = Counter(hand_class_index(list(pair)) for pair in combinations(CARDS, 2))
+
+    assert len(counts) == NUM_CLASSES
+    assert sorted(Counter(counts.values()).items()) == [(4, 78), (6, 13), (12, 78)]
+
+def test_class_names():
+    """Test labels for pairs, suited and offsuit hands."""
+    assert hand_class_name(hand_class_index([Card('A', 'H'), Card('A', 'S')])) == "AA"
+    assert hand_class_name(hand_class_index([Card('K', 'D'), Card('A', 'D')])) == "AKs"
+    assert hand_class_name(hand_class_index([Card('10', 'C'), Card('9', 'H')])) == "T9o"
+
+def test_representative_cards_round_trip():
+    """Test that each class's representative hand maps back to it."""
+    for index in range(NUM_CLASSES):
+        assert hand_class_index(representative_cards(index)) == index
+
+def test_table_orders_known_hands():
+    """Test that the shipped table ranks well-known hands sensibly."""
+    aces = [Card('A', 'H'), Card('A', 'S')]
+    kings = [Card('K', 'H'), Card('K', 'S')]
+    trash = [Card('7', 'H'), Card('2', 'S')]
+
+    assert preflop_equity(aces) == pytest.approx(0.85, abs=0.01)
+    assert preflop_equity(aces) > preflop_equity(kings) > preflop_equity(trash)
+
+    for players in range(2, 5):
+        assert preflop_equity(aces, players) > preflop_equity(aces, players + 1)
+
+def test_invalid_player_count():
+    """Test that player counts outside the table are rejected."""
+    with pytest.raises(ValueError, match="Players"):
+        preflop_equity([Card('A', 'H'), Card('A', 'S')], players=6)
+
+def test_write_and_load_round_trip(tmp_path):
+    """Test that a written table loads back with the same values."""
+    rows = [[i / 1000, 0.5, 0.25, 0.125] for i in range(NUM_CLASSES)]
+    path = str(tmp_path / "table.bin")
+    write_table(rows, path)
+
+    table = preflop._load_table(path)
+    assert table[4 * 7] == pytest.approx(7 / 1000)
+    assert table[4 * 7 + 3] == pytest.approx(0.125)
+
+def test_load_rejects_other_versions(tmp_path, monkeypatch):
+    """Test that a table written by another version is refused."""
+    path = str(tmp_path / "table.bin")
+    monkeypatch.setattr(preflop, "TABLE_VERSION", 0)
+    write_table([[0.5] * 4] * NUM_CLASSES, path)
+    monkeypatch.undo()
+
+    with pytest.raises(ValueError, match="regenerate"):
+        preflop._load_table(path)
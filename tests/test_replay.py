@@ -0,0 +1,56 @@
+import random
+
+from src.bot_logic import get_bot_move
+from src.event_log import ACTION, END, EventLog, decode_events, encode_events
+from src.game_engine import PokerGame
+from src.replay import main, replay_hand, replay_log, replayed_events, verify_hand
+from src.simulation import play_hand
+
+def _log(hands, bots=3, seed=1):
+    log = EventLog(seed=seed)
+    game = PokerGame(None, None, {'mode': 'PVE', 'bot_count': bots, 'small_blind': 5}, events=log)
+    random.seed(seed)
+    for _ in range(hands):
+        play_hand(game)
+    return log, game
+
+def test_every_hand_replays_exactly():
+    """Test that replaying each hand emits the same events as the original game."""
+    log, game = _log(300)
+    report = replay_log(log.hands)
+    assert report.hands == 300 and report.mismatches == []
+
+    last = replay_hand(decode_events(log.hands[-1]))
+    assert [p.balance for p in last.players] == [p.balance for p in game.players]
+    assert last.community_cards == game.community_cards
+
+def test_replay_stops_before_a_decision():
+    """Test rebuilding the state a bot decided in, to re-run get_bot_move on it."""
+    log, _ = _log(50, seed=4)
+    events = max(log, key=lambda hand: sum(e[0] == ACTION for e in hand))
+    seen = []
+    game = replay_hand(events, actions=3,
+                       on_action=lambda g, seat, action, amount: seen.append((seat, action)))
+    assert len(seen) == 3
+    assert game.stage and game.winner is None
+    assert replayed_events(game)[-1][0] == ACTION
+    player = game.players[game.active_player_index]
+    assert get_bot_move(game, player)[0] in ("fold", "check", "call", "raise")
+
+def test_tampered_hand_is_detected():
+    log, _ = _log(5, seed=2)
+    events = decode_events(log.hands[0])
+    kind, seat, pots, pot = events[-1]
+    assert kind == END
+    events[-1] = (kind, seat, pots, pot + 1)
+    assert not verify_hand(events)
+
+    log.hands[1] = encode_events(events)
+    assert replay_log(log.hands).mismatches == [1]
+
+def test_cli(tmp_path, capsys):
+    log, _ = _log(10)
+    path = str(tmp_path / "hands.pkev")
+    log.save(path)
+    main([path])
+    assert "Replayed 10 hands" in capsys.readouterr().out
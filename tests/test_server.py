@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from src.database import DatabaseManager
+from src.server import (GameClient, GameServer, MAX_MESSAGE, ProtocolError, check_local_host,
+                        encode_message, read_message)
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 20))
+
+async def _reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+def test_message_framing():
+    """Test length-prefixed JSON round trips and rejects bad frames."""
+    async def scenario():
+        reader = await _reader(encode_message({"type": "join"}) + encode_message({"type": "leave", "n": 1}))
+        assert await read_message(reader) == {"type": "join"}
+        assert await read_message(reader) == {"type": "leave", "n": 1}
+        assert await read_message(reader) is None
+
+        with pytest.raises(ProtocolError):
+            await read_message(await _reader((MAX_MESSAGE + 1).to_bytes(4, "big")))
+        with pytest.raises(ProtocolError):
+            await read_message(await _reader(encode_message({"type": "x"})[:4] + b"{not json}"[:6]))
+    run(scenario())
+
+def test_only_local_addresses():
+    for host in ("127.0.0.1", "localhost", "192.168.1.20", "10.0.0.5", "::1"):
+        check_local_host(host)
+    for host in ("8.8.8.8", "0.0.0.0", "example.com"):
+        with pytest.raises(ValueError):
+            check_local_host(host)
+
+async def _table(tmp_path, **options):
+    options.setdefault("hand_pause", 0.01)
+    server = GameServer(DatabaseManager(str(tmp_path / "server.db")), port=0, **options)
+    await server.start()
+    clients = []
+    for name in ("alice", "bob"):
+        client = await GameClient.connect(port=server.port)
+        await client.send(type="login", username=name)
+        assert (await client.recv_until("welcome"))["balance"] == 1000
+        await client.send(type="join")
+        assert (await client.recv_until("joined"))["big_blind"] == 20
+        clients.append(client)
+    for client in clients:
+        assert len((await client.recv_until("hand"))["cards"]) == 2
+        await client.recv_until("state")
+    return server, clients
+
+def test_remote_hand_with_state_deltas(tmp_path):
+    """Test two remote players: moves are relayed as deltas and the hand settles."""
+    async def scenario():
+        server, (alice, bob) = await _table(tmp_path, hand_pause=60)
+        assert alice.state == bob.state
+        active = (alice, bob)[alice.state["active_seat"]]
+        waiting = bob if active is alice else alice
+
+        await waiting.send(type="action", action="call")
+        assert (await waiting.recv_until("error"))["message"] == "Not your turn."
+
+        await active.send(type="action", action="call")
+        delta = await waiting.recv_until("state")
+        assert "board" not in delta and "stage" not in delta  # only what changed
+
+        await waiting.send(type="action", action="fold")
+        result = await alice.recv_until("result")
+        assert result["winner"] == ("alice" if active is alice else "bob")
+        assert result["hands"] == {}  # won on a fold: no cards are shown
+        await bob.recv_until("result")
+
+        for client in (alice, bob):
+            await client.close()
+        await asyncio.sleep(0.05)
+        await server.close()
+
+        db = DatabaseManager(str(tmp_path / "server.db"))
+        balances = [row[1] for row in db.get_leaderboard()]
+        assert sum(balances) == 2000 and balances != [1000, 1000]
+    run(scenario())
+
+def test_disconnect_mid_hand_folds(tmp_path):
+    """Test that leaving mid-hand folds, so the opponent is paid the pot."""
+    async def scenario():
+        server, (alice, bob) = await _table(tmp_path, hand_pause=60)
+        active = (alice, bob)[alice.state["active_seat"]]
+        waiting = bob if active is alice else alice
+
+        await active.send(type="action", action="call")
+        await waiting.recv_until("state")
+        await active.close()  # out of turn, with chips in the pot
+        await waiting.recv_until("opponent_left")
+        await waiting.close()
+        await server.close()
+
+        db = DatabaseManager(str(tmp_path / "server.db"))
+        balances = {row[0]: row[1] for row in db.get_leaderboard()}
+        assert sum(balances.values()) == 2000
+        assert balances[("alice" if waiting is alice else "bob")] == 1020
+    run(scenario())
+
+def test_action_timeout(tmp_path):
+    """Test that an idle player is checked or folded automatically."""
+    async def scenario():
+        server, (alice, bob) = await _table(tmp_path, action_timeout=0.05)
+        active = (alice, bob)[alice.state["active_seat"]]
+
+        notice = await active.recv_until("timeout")
+        assert notice["action"] == "fold"  # small blind facing the big blind
+        await alice.recv_until("result")
+
+        await alice.close()
+        await bob.close()
+        await server.close()
+    run(scenario())
+
+def test_login_required_and_disconnect(tmp_path):
+    """Test errors before login and the opponent being told about a disconnect."""
+    async def scenario():
+        server, (alice, bob) = await _table(tmp_path)
+        stranger = await GameClient.connect(port=server.port)
+        await stranger.send(type="join")
+        assert (await stranger.recv_until("error"))["message"] == "Log in first."
+        await stranger.close()
+
+        await alice.close()
+        await bob.recv_until("opponent_left")
+        assert server.tables == {}
+
+        await bob.close()
+        await server.close()
+    run(scenario())
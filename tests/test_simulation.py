@@ -0,0 +1,85 @@
+import random
+import subprocess
+import sys
+
+import pytest
+
+from src.database import DatabaseManager
+from src.event_log import EventLog
+from src.simulation import SIM_PLAYER_NAME, build_game, main, play_hand, simulate, simulate_parallel
+
+def test_simulation_does_not_import_pygame():
+    """Test that the headless mode stays free of the UI."""
+    code = "import sys, src.simulation; sys.exit('pygame' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+def test_bot_only_table():
+    """Test that a table without a human seats only bots."""
+    game = build_game(bots=3)
+    assert len(game.players) == 3
+    assert all(p.is_bot for p in game.players)
+
+def test_play_hand_finishes():
+    """Test that one hand runs to completion."""
+    game = build_game(bots=2)
+    actions = play_hand(game)
+
+    assert actions >= 1
+    assert game.winner is not None or game.stage == "SHOWDOWN"
+
+def test_simulate_is_reproducible():
+    """Test that a seeded run plays the same hands."""
+    a = simulate(200, bots=3, seed=5)
+    b = simulate(200, bots=3, seed=5)
+
+    assert a.hands == b.hands == 200
+    assert a.actions == b.actions
+
+def test_simulate_leaves_the_global_rng_alone():
+    """Test that a seeded run uses its own RNG instead of reseeding the random module."""
+    random.seed(1)
+    expected = random.random()
+    random.seed(1)
+    simulate(20, bots=2, seed=5)
+
+    assert random.random() == expected
+
+def test_workers_reject_single_table_options(tmp_path):
+    """Test that --workers refuses options only a single in-process table supports."""
+    with pytest.raises(SystemExit):
+        main(["--hands", "10", "--workers", "2", "--events", str(tmp_path / "hands.pkev")])
+
+def test_simulate_parallel_independent_of_workers():
+    """Test that sharded runs give the same totals for any pool size."""
+    single = simulate_parallel(300, bots=2, workers=1, seed=4, chunk_size=100)
+    pooled = simulate_parallel(300, bots=2, workers=2, seed=4, chunk_size=100)
+
+    assert single.hands == pooled.hands == 300
+    assert single.actions == pooled.actions
+
+def test_simulate_with_database_seat(tmp_path):
+    """Test that a database-backed seat is created and settled."""
+    db = DatabaseManager(str(tmp_path / "sim.db"))
+    result = simulate(50, bots=1, db=db, seed=6)
+
+    assert result.hands == 50
+    player_id, _ = db.get_or_create_player(SIM_PLAYER_NAME)
+    with db._get_connection() as conn:
+        hands_won = conn.execute("SELECT hands_won FROM players WHERE id=?", (player_id,)).fetchone()[0]
+    assert hands_won > 0
+
+def test_in_memory_run_with_snapshot(tmp_path, capsys):
+    """Test a database seat on in-memory storage, saved to disk only at the end."""
+    path = tmp_path / "snapshot.db"
+    main(["--hands", "30", "--seed", "4", "--db", ":memory:", "--history", "--snapshot", str(path)])
+
+    saved = DatabaseManager(str(path))
+    assert saved.get_or_create_player(SIM_PLAYER_NAME)[0] == 1
+    with saved._get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM hands").fetchone()[0] == 30
+
+def test_event_log_option(tmp_path, capsys):
+    """Test that --events saves one replayable hand per simulated hand."""
+    path = tmp_path / "hands.pkev"
+    main(["--hands", "25", "--seed", "2", "--events", str(path)])
+    assert len(EventLog.load(str(path))) == 25
@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from src.database import DatabaseManager
+from src.hand_history import HandRecord
+from src.simulation import build_game, play_hand
+from src.stats import PlayerStats, StatsEngine
+
+def _hand():
+    """Seat 0 raises preflop and bets the flop, seat 1 calls twice, seat 2 folds."""
+    record = HandRecord([10, 20, 30], [1000] * 3, [[0, 1], [2, 3], [4, 5]], board=[6, 7, 8, 9, 10])
+    for seat, stage, action, amount in [
+        (0, "PREFLOP", "small_blind", 10), (1, "PREFLOP", "big_blind", 20),
+        (2, "PREFLOP", "fold", 0), (0, "PREFLOP", "raise", 50), (1, "PREFLOP", "call", 40),
+        (0, "FLOP", "bet", 40), (1, "FLOP", "call", 40),
+        (0, "TURN", "check", 0), (1, "TURN", "check", 0),
+    ]:
+        record.add_action(seat, stage, action, amount)
+    record.winners = [1]
+    record.pot = 200
+    return record
+
+def test_counters_from_one_hand():
+    """Test every counter after one played-out hand."""
+    engine = StatsEngine()
+    engine.record_hand(_hand(), big_blind=20)
+
+    raiser, caller, folder = engine.get(10), engine.get(20), engine.get(30)
+    assert (raiser.vpip, raiser.pfr, raiser.aggression_factor) == (1.0, 1.0, 1.0)
+    assert (caller.vpip, caller.pfr, caller.aggression_factor) == (1.0, 0.0, 0.0)
+    assert (folder.vpip, folder.hands, folder.showdowns) == (0.0, 1, 0)
+    assert (raiser.showdowns, raiser.showdown_win_rate) == (1, 0.0)
+    assert caller.showdown_win_rate == 1.0
+    assert raiser.bb_per_100 == pytest.approx(-100 / 20 * 100)
+    assert caller.bb_per_100 == pytest.approx(100 / 20 * 100)
+
+def test_uncontested_pot_is_not_a_showdown():
+    """Test that a fold-win is no showdown and blinds are not VPIP."""
+    record = HandRecord([1, 2], [100, 100], [[0, 1], [2, 3]])
+    record.add_action(0, "PREFLOP", "small_blind", 10)
+    record.add_action(1, "PREFLOP", "big_blind", 20)
+    record.add_action(0, "PREFLOP", "fold", 0)
+    record.winners, record.pot = [1], 30
+
+    engine = StatsEngine()
+    engine.record_hand(record, big_blind=20)
+
+    assert engine.get(2).showdowns == 0
+    assert engine.get(2).net_big_blinds == pytest.approx(0.5)
+    assert engine.get(1).vpip_hands == 0  # blinds are not voluntary
+
+def test_free_call_is_not_voluntary():
+    """Test that the big blind's 0-chip "call" with nothing owed does not count as VPIP or a call."""
+    record = HandRecord([1, 2], [100, 100], [[0, 1], [2, 3]], board=[4, 5, 6])
+    for seat, stage, action, amount in [
+        (0, "PREFLOP", "small_blind", 10), (1, "PREFLOP", "big_blind", 20),
+        (0, "PREFLOP", "call", 10), (1, "PREFLOP", "call", 0),
+        (0, "FLOP", "bet", 20), (1, "FLOP", "call", 20),
+    ]:
+        record.add_action(seat, stage, action, amount)
+    record.winners, record.pot = [0], 80
+
+    engine = StatsEngine()
+    engine.record_hand(record, big_blind=20)
+
+    assert (engine.get(1).vpip_hands, engine.get(2).vpip_hands) == (1, 0)
+    assert engine.get(2).postflop_calls == 1
+
+def test_empty_stats_are_zero():
+    """Test that ratios of a player without hands are zero."""
+    stats = PlayerStats()
+    assert (stats.vpip, stats.pfr, stats.aggression_factor, stats.showdown_win_rate, stats.bb_per_100) == (0, 0, 0, 0, 0)
+
+def test_engine_feeds_stats_every_hand():
+    """Test that PokerGame updates the totals of every seat after each hand."""
+    random.seed(5)
+    engine = StatsEngine()
+    game = build_game(bots=3, stats=engine)
+    for _ in range(50):
+        play_hand(game)
+
+    totals = [engine.get(p.id) for p in game.players]
+    assert all(s.hands == 50 for s in totals)
+    # chips only move between seats (split pot remainders are lost)
+    assert sum(s.net_big_blinds for s in totals) <= 1e-9
+    assert sum(s.showdown_wins for s in totals) >= 1
+
+def test_totals_persist_for_real_players(tmp_path):
+    """Test that real players' totals survive a new StatsEngine."""
+    db = DatabaseManager(str(tmp_path / "stats.db"))
+    random.seed(6)
+    engine = StatsEngine(db, batch_size=8)
+    game = build_game(bots=2, db=db, stats=engine)
+    human = game.players[0].id
+    for _ in range(20):
+        play_hand(game)
+    engine.flush()
+
+    reloaded = StatsEngine(db).get(human)
+    assert reloaded == engine.get(human)
+    assert reloaded.hands == 20
+    with db._get_connection() as conn:
+        # bots are not written: their ids are not player accounts
+        assert conn.execute("SELECT COUNT(*) FROM player_stats").fetchone()[0] == 1
+
+def test_close_writes_changed_totals(tmp_path):
+    """Test that closing writes totals still short of a batch, and later hands are refused."""
+    db = DatabaseManager(str(tmp_path / "stats.db"))
+    engine = StatsEngine(db, batch_size=64)
+    engine.record_hand(_hand(), big_blind=20, persist=[10])
+    engine.close()
+
+    assert StatsEngine(db).get(10).hands == 1
+    with pytest.raises(RuntimeError):
+        engine.record_hand(_hand(), big_blind=20, persist=[10])
@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from src.database import DatabaseManager
+from src.hand_history import HandHistoryStore
+from src.stats import StatsEngine
+from src.table_manager import BOT_ID_STRIDE, TableManager
+from src.write_behind import WriteBehindDatabase
+
+def test_many_tables_share_the_scheduler():
+    """Test that hundreds of tables all make progress and metrics add up."""
+    random.seed(1)
+    manager = TableManager()
+    ids = [manager.add_table(bots=3) for _ in range(200)]
+
+    result = manager.run(hands=1000)
+
+    assert result.hands >= 1000
+    assert sum(manager.table_metrics(t).hands for t in ids) == result.hands
+    assert all(manager.table_metrics(t).hands >= 1 for t in ids)
+    assert result.hands_per_second > 0
+
+def test_delay_paces_a_table():
+    """Test that a table with a delay only acts when its next action is due."""
+    manager = TableManager()
+    slow = manager.add_table(bots=2, delay=10.0)
+    fast = manager.add_table(bots=2)
+
+    now = manager.started_at + 1
+    for _ in range(50):
+        manager.step(now)
+
+    assert manager.tables[slow].actions == 0  # dealt, then waits 10s
+    assert manager.tables[fast].actions > 0
+
+def test_human_seat_waits_for_submit(tmp_path):
+    """Test that a person's seat parks the table while the others keep running."""
+    random.seed(2)
+    db = DatabaseManager(str(tmp_path / "tables.db"))
+    pid, _ = db.get_or_create_player("alice")
+    manager = TableManager(db)
+    assert isinstance(manager.db, WriteBehindDatabase)
+
+    human_table = manager.add_table(bots=1, human_ids=(pid,))
+    bot_table = manager.add_table(bots=2)
+    manager.run(hands=20)
+
+    table = manager.tables[human_table]
+    assert table.waiting and table.active_player.id == pid
+    with pytest.raises(ValueError):
+        manager.submit_action(bot_table, "fold")
+
+    assert manager.submit_action(human_table, "fold") in ("OK", "Hand Over")
+    assert not table.waiting
+    manager.run(hands=manager.total_hands() + 1)
+    assert table.hands >= 1
+
+    balance = table.game.players[0].balance
+    table.game.leave_game(pid)
+    manager.close()
+    assert DatabaseManager(str(tmp_path / "tables.db")).get_player(pid) == ("alice", balance)
+
+def test_bots_of_different_tables_stay_apart(tmp_path):
+    """Test that bots get ids unique to their table, so shared history and stats keep them apart."""
+    random.seed(4)
+    db = DatabaseManager(str(tmp_path / "tables.db"))
+    history = HandHistoryStore(db)
+    stats = StatsEngine()
+    manager = TableManager(db, history=history, stats=stats)
+    first, second = manager.add_table(bots=2), manager.add_table(bots=2)
+    manager.run(hands=20)
+
+    ids = {t: [p.id for p in manager.tables[t].game.players] for t in (first, second)}
+    assert all(pid < 0 for pid in ids[first] + ids[second])
+    assert not set(ids[first]) & set(ids[second])
+    bot = ids[first][0]
+    assert len(history.last_hands(bot, limit=100)) == manager.tables[first].hands
+    assert stats.get(bot).hands == manager.tables[first].hands
+    with pytest.raises(ValueError):
+        manager.add_table(bots=BOT_ID_STRIDE)
+    manager.close()
+
+def test_remove_table():
+    """Test that a removed table is no longer advanced."""
+    manager = TableManager()
+    gone = manager.add_table(bots=2)
+    kept = manager.add_table(bots=2)
+    manager.remove_table(gone)
+
+    manager.run(hands=5)
+
+    assert gone not in manager.tables
+    assert manager.tables[kept].hands >= 5
@@ -0,0 +1,108 @@
+import io
+import sqlite3
+
+import pytest
+
+from src.database import DatabaseManager, SettlementEntry
+from src.hand_history import HandHistoryStore, HandRecord
+from src.transfer import FORMATS, export_table, format_for_path, import_table, main, read_rows
+
+def _dump(db, table):
+    with db._get_connection() as conn:
+        return conn.execute(f"SELECT * FROM {table}").fetchall()
+
+@pytest.fixture
+def source(tmp_path):
+    db = DatabaseManager(str(tmp_path / "source.db"))
+    for name in ("ann", "ben", "cat, \"the\" shark"):
+        pid, _ = db.get_or_create_player(name)
+        db.settle_hand([SettlementEntry(pid, 50, actions={'bet': 1}, won=True, pot_won=50, hand_score=3)])
+    history = HandHistoryStore(db)
+    record = HandRecord([1, 2], [1000, 900], [[0, 1], [50, 51]], board=[10, 11, 12],
+                        winners=[0], pot=30, played_at=1234.5)
+    record.add_action(0, "PREFLOP", "small_blind", 10)
+    history.append_many([record])
+    return db
+
+def _stream(fmt):
+    return io.BytesIO() if fmt == "bin" else io.StringIO()
+
+@pytest.mark.parametrize("fmt", FORMATS)
+@pytest.mark.parametrize("table", ["players", "game_history", "hands", "hand_players"])
+def test_roundtrip(source, tmp_path, fmt, table):
+    """Test that export then import reproduces every table exactly, in every format."""
+    fp = _stream(fmt)
+    exported = export_table(source, table, fp, fmt, chunk_size=2)
+    fp.seek(0)
+
+    target = DatabaseManager(str(tmp_path / "target.db"))
+    imported = import_table(target, table, fp, fmt, chunk_size=2)
+
+    assert exported.rows == imported.rows == len(_dump(source, table))
+    assert _dump(target, table) == _dump(source, table)
+
+def test_conflict_modes(source, tmp_path):
+    """Test abort (atomic), ignore and replace on duplicate keys."""
+    fp = io.StringIO()
+    export_table(source, "players", fp, "ndjson")
+
+    target = DatabaseManager(str(tmp_path / "target.db"))
+    target.get_or_create_player("ann")
+    target.get_or_create_player("zed")
+
+    fp.seek(0)
+    with pytest.raises(sqlite3.IntegrityError):
+        import_table(target, "players", fp, "ndjson", chunk_size=1)
+    assert len(_dump(target, "players")) == 2  # nothing from the failed import
+
+    fp.seek(0)
+    assert import_table(target, "players", fp, "ndjson", on_conflict="replace").rows == 3
+    assert [r[1] for r in _dump(target, "players")] == ["ann", "ben", "cat, \"the\" shark"]
+
+def test_readers_are_lazy():
+    """Test that rows are only read when the iterator is consumed."""
+    fp = io.StringIO('{"id": 1}\n{"id": 2}\nnot json\n')
+    columns, rows = read_rows(fp, "ndjson")
+
+    assert columns == ["id"]
+    assert next(rows) == [1]
+    with pytest.raises(ValueError):
+        list(rows)
+
+def test_bad_input_is_rejected(source):
+    """Test unknown tables, columns, formats and truncated binary files."""
+    with pytest.raises(ValueError):
+        export_table(source, "sqlite_master", io.StringIO(), "csv")
+    with pytest.raises(ValueError):
+        import_table(source, "players", io.StringIO("id,nickname\n1,x\n"), "csv")
+    with pytest.raises(ValueError):
+        format_for_path("players.xlsx")
+
+    fp = io.BytesIO()
+    export_table(source, "players", fp, "bin")
+    with pytest.raises(ValueError):
+        import_table(source, "players", io.BytesIO(fp.getvalue()[:-3]), "bin", on_conflict="ignore")
+
+def test_cli_reports_rows_per_second(source, tmp_path, capsys):
+    path = str(tmp_path / "players.bin")
+    main(["export", "players", path, "--db", source.db_name])
+    main(["import", "players", path, "--db", str(tmp_path / "copy.db")])
+
+    out = capsys.readouterr().out.splitlines()
+    assert out[0].startswith("exported 3 rows of players")
+    assert out[1].startswith("imported 3 rows of players")
+    assert "rows/s" in out[1]
+
+def test_binary_integer_range(tmp_path):
+    """Test that the varint encoding keeps negative and 64-bit values."""
+    db = DatabaseManager(str(tmp_path / "ints.db"))
+    for i, balance in enumerate((0, -1, 127, -(2 ** 63), 2 ** 63 - 1)):
+        pid, _ = db.get_or_create_player(f"p{i}")
+        db.set_balance(pid, balance)
+    fp = io.BytesIO()
+    export_table(db, "players", fp, "bin")
+    fp.seek(0)
+
+    columns, rows = read_rows(fp, "bin")
+    balances = [row[columns.index("balance")] for row in rows]
+    assert balances == [0, -1, 127, -(2 ** 63), 2 ** 63 - 1]
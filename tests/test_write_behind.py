@@ -0,0 +1,147 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.database import DatabaseManager, SettlementEntry
+from src.write_behind import BatchWriter, WriteBehindDatabase
+
+@pytest.fixture
+def wb(tmp_path):
+    manager = WriteBehindDatabase(DatabaseManager(str(tmp_path / "wb.db")), flush_interval=0.01)
+    yield manager
+    manager.close()
+
+def _row(db, pid):
+    with db._get_connection() as conn:
+        return conn.execute("SELECT balance, hands_played, hands_won FROM players WHERE id=?", (pid,)).fetchone()
+
+def test_reads_see_queued_writes(wb):
+    """Test read-your-writes: reads flush the queue first."""
+    pid, _ = wb.get_or_create_player("alice")
+    wb.update_balance(pid, 250)
+
+    assert wb.get_or_create_player("alice") == (pid, 1250)
+    assert wb.get_leaderboard()[0][:2] == ("alice", 1250)
+
+def test_updates_are_coalesced_in_order(wb):
+    """Test that deltas and absolute balances combine in queue order."""
+    pid, _ = wb.get_or_create_player("bob")
+    wb.update_balance(pid, 100)
+    wb.set_balance(pid, 500)
+    wb.update_balance(pid, -50)
+    wb.settle_hand([SettlementEntry(pid, 20, actions={'bet': 1}, won=True, pot_won=20)])
+    wb.flush()
+
+    assert _row(wb, pid) == (470, 1, 1)
+
+def test_batch_commits_in_one_transaction(wb):
+    """Test that a batch with many writes reaches the database as one commit."""
+    pid, _ = wb.get_or_create_player("carol")
+    commits = []
+    original = wb.db._checkin
+    def checkin(failed):
+        if wb.db._local.depth == 1:  # outermost block: the actual commit
+            commits.append(failed)
+        original(failed)
+    wb.db._checkin = checkin
+
+    wb._writer.flush_interval = 1.0
+    for _ in range(50):
+        wb.update_balance(pid, 1)
+    wb.flush()
+
+    assert commits == [False]
+    assert _row(wb, pid)[0] == 1050
+
+def test_close_flushes_pending_writes(tmp_path):
+    """Test that closing commits everything still queued."""
+    path = str(tmp_path / "close.db")
+    manager = WriteBehindDatabase(DatabaseManager(path), flush_interval=10)
+    pid, _ = manager.get_or_create_player("dave")
+    manager.record_hand_stats(pid, True, 300, 4, {'raise': 1})
+    manager.close()
+
+    with pytest.raises(RuntimeError):
+        manager.update_balance(pid, 1)
+    assert DatabaseManager(path).get_leaderboard()[0][2] == 1
+
+def test_back_pressure_blocks_writers(tmp_path):
+    """Test that a full queue makes writers wait instead of growing."""
+    manager = WriteBehindDatabase(DatabaseManager(str(tmp_path / "bp.db")), max_pending=2, batch_size=1)
+    pid, _ = manager.get_or_create_player("erin")
+
+    release = threading.Event()
+    settle = manager.db.settle_hand
+    manager.db.settle_hand = lambda entries: (release.wait(), settle(entries))[1]
+
+    done = threading.Event()
+    def writer():
+        for _ in range(10):
+            manager.update_balance(pid, 1)
+        done.set()
+    t = threading.Thread(target=writer)
+    t.start()
+    assert not done.wait(0.2)  # stuck behind the blocked writer thread
+    release.set()
+    t.join()
+    manager.close()
+    assert DatabaseManager(str(tmp_path / "bp.db")).get_or_create_player("erin") == (pid, 1010)
+
+def test_writer_error_is_raised_on_flush(wb):
+    """Test that a failed batch is reported to the caller."""
+    pid, _ = wb.get_or_create_player("frank")
+    with wb._get_connection() as conn:
+        conn.execute("CREATE TRIGGER fail_history BEFORE INSERT ON game_history "
+                     "BEGIN SELECT RAISE(ABORT, 'disk full'); END")
+    wb.record_hand_stats(pid, True, 10, 1, {})
+
+    with pytest.raises(sqlite3.DatabaseError):
+        wb.flush()
+    wb.flush()  # reported once
+
+def test_flush_ignores_later_writes():
+    """Test that flush returns once earlier items are written, while later ones are still pending."""
+    gates = [threading.Event(), threading.Event()]
+    written = []
+    def write(items):
+        gates[min(len(written), 1)].wait()
+        written.extend(items)
+    writer = BatchWriter(write, "test writer")
+
+    writer.put(1)
+    while writer._queue.qsize():  # the thread holds it, blocked on the first gate
+        time.sleep(0.001)
+    flushed = threading.Event()
+    t = threading.Thread(target=lambda: (writer.flush(), flushed.set()))
+    t.start()
+    while writer._queue.qsize() < 1:  # the flush marker waits behind the first item
+        time.sleep(0.001)
+    writer.put(2)  # queued after the marker, its write stays blocked
+    gates[0].set()
+
+    assert flushed.wait(2)
+    assert written == [1]
+    gates[1].set()
+    t.join()
+    writer.close()
+    assert written == [1, 2]
+
+def test_writes_run_on_the_writer_thread():
+    """Test that put returns while a write is still running, and close waits for it."""
+    release = threading.Event()
+    threads = []
+    def write(items):
+        threads.append(threading.current_thread().name)
+        release.wait()
+    writer = BatchWriter(write, "test writer")
+
+    writer.put("hand")
+    writer.put("hand")
+    release.set()
+    writer.close()
+
+    assert threads == ["test writer", "test writer"]
+    with pytest.raises(RuntimeError):
+        writer.put("hand")